@@ -0,0 +1,59 @@
+# accounts/management/commands/purge_auth_records.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.models import EmailCooldown, EmailVerificationToken, PasswordResetAttempt, PasswordResetToken
+from venture_manager.housekeeping import delete_in_batches
+
+# Cooldowns last seconds; anything older than this can no longer block a send
+COOLDOWN_RETENTION = timedelta(days=1)
+
+
+def purgeable(now, attempt_days):
+    """(table, queryset) pairs, disjoint per table; each is served by one of the model's indexes"""
+    return [
+        ('email verification tokens', EmailVerificationToken.objects.filter(expires_at__lt=now)),
+        ('email verification tokens', EmailVerificationToken.objects.filter(used=True, expires_at__gte=now)),
+        ('password reset tokens', PasswordResetToken.objects.filter(expires_at__lt=now)),
+        ('password reset tokens', PasswordResetToken.objects.filter(used=True, expires_at__gte=now)),
+        ('password reset attempts', PasswordResetAttempt.objects.filter(
+            timestamp__lt=now - timedelta(days=attempt_days))),
+        ('email cooldowns', EmailCooldown.objects.filter(last_sent__lt=now - COOLDOWN_RETENTION)),
+    ]
+
+
+class Command(BaseCommand):
+    help = ("Delete expired and used verification/reset tokens, old password reset attempts "
+            "and stale email cooldowns in bounded batches")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Rows deleted per statement (default 1000)")
+        parser.add_argument('--pause', type=float, default=0,
+                            help="Seconds to sleep between batches, to let other writers in")
+        parser.add_argument('--attempt-days', type=int, default=settings.PASSWORD_RESET_ATTEMPT_RETENTION_DAYS,
+                            help="Keep password reset attempts this many days")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Report how many rows would be deleted without deleting them")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        if options['attempt_days'] < 0:
+            raise CommandError("--attempt-days cannot be negative")
+
+        totals = {}
+        for table, queryset in purgeable(timezone.now(), options['attempt_days']):
+            if options['dry_run']:
+                count = queryset.count()
+            else:
+                count = delete_in_batches(queryset, options['batch_size'], options['pause'])
+            totals[table] = totals.get(table, 0) + count
+
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        for table, count in totals.items():
+            self.stdout.write(f"{verb} {count} {table}")
+        self.stdout.write(self.style.SUCCESS(f"{verb} {sum(totals.values())} row(s) in total."))
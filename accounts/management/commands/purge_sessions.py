@@ -0,0 +1,18 @@
+# accounts/management/commands/purge_sessions.py
+from django.core.management.base import BaseCommand, CommandError
+
+from venture_manager.sessions import SessionStore
+
+
+class Command(BaseCommand):
+    help = "Delete expired rows from django_session in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Rows deleted per statement (default 1000)")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1")
+        deleted = SessionStore.clear_expired(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired session(s)."))
@@ -5,6 +5,8 @@ from django.utils import timezone
 from django.conf import settings
 from datetime import timedelta
 
+from .ratelimit import RateLimit
+
 
 class CustomUser(AbstractUser):
     ROLE_CHOICES = [
@@ -41,44 +43,21 @@ class CustomUser(AbstractUser):
         return f"{self.get_full_name() or self.username} ({self.get_role_display()})"
 
     # --- Email verification rate limiting ---
+    # Cache-backed (RATE_LIMITS['verification_resend']): 3 sends an hour, at
+    # least a minute apart, then an hour's cooldown. last_verification_sent,
+    # verification_request_count and verification_rate_limit_expiry are no
+    # longer written.
     def can_resend_verification(self) -> bool:
-        now = timezone.now()
-
-        # Hard cooldown
-        if self.verification_rate_limit_expiry and now < self.verification_rate_limit_expiry:
-            return False
-
-        # Allow if fewer than 3 attempts in this window
-        if self.verification_request_count < 3:
-            # Enforce at least 1 minute between requests
-            if self.last_verification_sent and (now - self.last_verification_sent).total_seconds() < 60:
-                return False
-            return True
-
-        # If 3 attempts already used, enter cooldown
-        return False
+        return RateLimit.for_action('verification_resend').check(self.pk).allowed
 
     def mark_verification_sent(self):
-        now = timezone.now()
-
-        # Reset tracking if cooldown expired
-        if self.verification_rate_limit_expiry and now >= self.verification_rate_limit_expiry:
-            self.verification_request_count = 0
-            self.verification_rate_limit_expiry = None
-
-        self.last_verification_sent = now
-        self.verification_request_count += 1
+        RateLimit.for_action('verification_resend').hit(self.pk)
 
-        # Enforce cooldown after 3rd request
-        if self.verification_request_count >= 3:
-            self.verification_rate_limit_expiry = now + timedelta(hours=1)
-            self.verification_request_count = 0
-
-        self.save(update_fields=[
-            "last_verification_sent",
-            "verification_request_count",
-            "verification_rate_limit_expiry",
-        ])
+    @property
+    def verification_cooldown_until(self):
+        """When another verification email may be sent, or None if it may be now"""
+        result = RateLimit.for_action('verification_resend').check(self.pk)
+        return None if result.allowed else result.retry_at
 
     # --- Email verification alias (backward-compatible) ---
     @property
@@ -103,6 +82,13 @@ class EmailVerificationToken(models.Model):
     expires_at = models.DateTimeField()
     used = models.BooleanField(default=False)
 
+    class Meta:
+        # Support purge_auth_records: expired rows, and used rows via a partial index
+        indexes = [
+            models.Index(fields=['expires_at'], name='emailtoken_expires_idx'),
+            models.Index(fields=['expires_at'], condition=models.Q(used=True), name='emailtoken_used_idx'),
+        ]
+
     def __str__(self):
         return f"Token for {self.user.email} (Used: {self.used})"
 
@@ -120,6 +106,12 @@ class PasswordResetToken(models.Model):
     expires_at = models.DateTimeField()
     used = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='pwtoken_expires_idx'),
+            models.Index(fields=['expires_at'], condition=models.Q(used=True), name='pwtoken_used_idx'),
+        ]
+
     def is_expired(self):
         """Check if this token has expired based on current time or marked as used."""
         return self.used or timezone.now() > self.expires_at
@@ -138,6 +130,14 @@ class PasswordResetAttempt(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     successful = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # recent_attempts(): one user's attempts since a cutoff
+            models.Index(fields=['user', 'timestamp'], name='pwattempt_user_ts_idx'),
+            # purge_auth_records: everyone's attempts before a cutoff
+            models.Index(fields=['timestamp'], name='pwattempt_ts_idx'),
+        ]
+
     def __str__(self):
         status = "Successful" if self.successful else "Attempted"
         return f"{status} reset by {self.user.email} at {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}"
@@ -148,8 +148,9 @@ class PasswordResetAttempt(models.Model):
         return cls.objects.filter(user=user, timestamp__gte=cutoff)
 
     @classmethod
-    def too_many_attempts(cls, user, limit=3, minutes=10):
-        return cls.recent_attempts(user, minutes=minutes).count() >= limit
+    def too_many_attempts(cls, user):
+        """Rate limited via the cache (RATE_LIMITS['password_reset']); these rows are an audit trail"""
+        return not RateLimit.for_action('password_reset').check(user.pk)
 
 
 # ---------------------------
@@ -159,6 +160,9 @@ class EmailCooldown(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='email_cooldown')
     last_sent = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['last_sent'], name='emailcooldown_sent_idx')]
+
     def can_send(self, cooldown_seconds=60):
         """Check if user can send another verification email"""
         if not self.last_sent:
@@ -0,0 +1,141 @@
+# accounts/ratelimit.py
+"""
+Cache-backed rate limits for login, verification resend and password reset.
+
+Each action in settings.RATE_LIMITS allows `limit` hits per sliding `window`
+(seconds), keyed by whatever the caller passes - a user id, an email or a
+client IP. Counters are atomic cache increments; no database rows are read or
+written. The sliding window is estimated from the current and previous
+fixed-window counters, weighted by how far into the current window we are.
+
+Optional settings per action:
+- lockout: once the limit is reached, block for this many seconds.
+- interval: minimum seconds between two hits.
+
+Counters must live in a cache shared by every process for the limits to hold
+across workers: settings.CACHE_BACKEND defaults to the database cache outside
+DEBUG, and check --deploy (check_shared_cache) rejects local memory.
+"""
+import hashlib
+import math
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+
+class RateLimitResult:
+    def __init__(self, allowed, retry_after=0, remaining=0):
+        self.allowed = allowed
+        self.retry_after = retry_after
+        self.remaining = remaining
+
+    def __bool__(self):
+        return self.allowed
+
+    @property
+    def retry_at(self):
+        return timezone.now() + timedelta(seconds=self.retry_after)
+
+
+class RateLimit:
+    def __init__(self, action, limit, window, lockout=0, interval=0):
+        self.action = action
+        self.limit = limit
+        self.window = window
+        self.lockout = lockout
+        self.interval = interval
+
+    @classmethod
+    def for_action(cls, action):
+        return cls(action, **settings.RATE_LIMITS[action])
+
+    def _key(self, key, suffix):
+        digest = hashlib.sha256(str(key).lower().encode()).hexdigest()[:32]
+        return f'ratelimit:{self.action}:{digest}:{suffix}'
+
+    def _estimate(self, key, now, current=None):
+        """Hits in the sliding window ending now"""
+        bucket = int(now // self.window)
+        keys = [self._key(key, bucket - 1)]
+        if current is None:
+            keys.append(self._key(key, bucket))
+        counts = cache.get_many(keys)
+        if current is None:
+            current = counts.get(keys[1], 0)
+        previous_weight = 1 - (now % self.window) / self.window
+        return counts.get(keys[0], 0) * previous_weight + current
+
+    def _blocked_for(self, key, now):
+        """Seconds left on a lockout or interval wait, or 0"""
+        waits = cache.get_many([self._key(key, 'lock'), self._key(key, 'interval')])
+        until = max(waits.values(), default=0)
+        return max(0, math.ceil(until - now))
+
+    def _window_retry(self, now):
+        return math.ceil(self.window - now % self.window)
+
+    def check(self, key):
+        """Would a hit for `key` be allowed now? Records nothing."""
+        now = time.time()
+        blocked_for = self._blocked_for(key, now)
+        if blocked_for:
+            return RateLimitResult(False, retry_after=blocked_for)
+        estimate = self._estimate(key, now)
+        if estimate >= self.limit:
+            return RateLimitResult(False, retry_after=self._window_retry(now))
+        return RateLimitResult(True, remaining=math.floor(self.limit - estimate))
+
+    def hit(self, key):
+        """
+        Record one hit for `key`. The result says whether this hit was within
+        the limit; the hit that reaches the limit starts the lockout.
+        """
+        now = time.time()
+        blocked_for = self._blocked_for(key, now)
+        if blocked_for:
+            return RateLimitResult(False, retry_after=blocked_for)
+
+        if self.interval:
+            cache.set(self._key(key, 'interval'), now + self.interval, self.interval)
+
+        bucket_key = self._key(key, int(now // self.window))
+        cache.add(bucket_key, 0, timeout=self.window * 2)
+        try:
+            current = cache.incr(bucket_key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(bucket_key, 1, timeout=self.window * 2)
+            current = 1
+        estimate = self._estimate(key, now, current=current)
+
+        if estimate >= self.limit and self.lockout:
+            cache.set(self._key(key, 'lock'), now + self.lockout, self.lockout)
+        if estimate > self.limit:
+            retry_after = self.lockout or self._window_retry(now)
+            return RateLimitResult(False, retry_after=retry_after)
+        return RateLimitResult(True, remaining=math.floor(self.limit - estimate))
+
+    def reset(self, key):
+        bucket = int(time.time() // self.window)
+        cache.delete_many([
+            self._key(key, bucket), self._key(key, bucket - 1),
+            self._key(key, 'lock'), self._key(key, 'interval'),
+        ])
+
+
+def first_blocked(*results):
+    """The blocked result with the longest wait, or None if all are allowed"""
+    blocked = [result for result in results if not result]
+    return max(blocked, key=lambda result: result.retry_after) if blocked else None
+
+
+def client_ip(request):
+    """REMOTE_ADDR, or the first X-Forwarded-For address behind a trusted proxy"""
+    if settings.RATE_LIMIT_TRUST_X_FORWARDED_FOR:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR')
@@ -1,7 +1,28 @@
-from django.test import TestCase
+import smtplib
+import socketserver
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.sessions.models import Session
+from django.core import mail as outbox
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.core.mail.backends.smtp import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from portfolio.models import Startup
+from .models import EmailCooldown, EmailVerificationToken, PasswordResetAttempt, PasswordResetToken
+from .ratelimit import RateLimit
+from .utils import send_password_reset_email
+from venture_manager.mail import MailDispatcher, DEFAULTS as MAIL_DEFAULTS
+from venture_manager.sessions import SessionStore
 
 User = get_user_model()
 
@@ -25,3 +46,316 @@ class RoleBasedAccessTests(TestCase):
         self.client.login(username="investor", password="testpass")
         response = self.client.get(reverse("startup_create"))
         self.assertNotEqual(response.status_code, 200)  # blocked
+
+
+class SessionWriteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="investor", email="investor@example.com", password="testpass", role="investor"
+        )
+        self.client.force_login(self.user)
+
+    def session_writes(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [
+            query['sql'] for query in queries
+            if 'django_session' in query['sql'] and not query['sql'].startswith('SELECT')
+        ]
+
+    def test_unchanged_session_is_not_rewritten_within_grace(self):
+        url = reverse('notification_count_api')
+        self.session_writes(url)
+        self.assertEqual(self.session_writes(url), [])
+
+    @override_settings(SESSION_WRITE_GRACE_SECONDS=0)
+    def test_expiry_is_refreshed_after_grace(self):
+        self.assertEqual(len(self.session_writes(reverse('notification_count_api'))), 1)
+
+    def test_changed_data_is_written(self):
+        store = SessionStore(self.client.session.session_key)
+        store['selected_role'] = 'investor'
+        store.save()
+        self.assertEqual(SessionStore(store.session_key).load()['selected_role'], 'investor')
+        cache.clear()
+        self.assertEqual(SessionStore(store.session_key).load()['selected_role'], 'investor')
+
+    def test_purge_sessions_deletes_only_expired_rows(self):
+        live = self.client.session.session_key
+        for i in range(5):
+            Session.objects.create(
+                session_key=f'expired{i}', session_data='', expire_date=timezone.now() - timedelta(days=1)
+            )
+        out = StringIO()
+        call_command('purge_sessions', '--batch-size', '2', stdout=out)
+        self.assertIn('Purged 5 expired session(s)', out.getvalue())
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), [live])
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="investor", email="investor@example.com", password="testpass", role="investor",
+            email_verified=True,
+        )
+
+    def writes(self, queries):
+        return [query['sql'] for query in queries if not query['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE'))]
+
+    def test_limit_lockout_and_reset(self):
+        limit = RateLimit('test', limit=3, window=60, lockout=120)
+        self.assertTrue(limit.hit('key'))
+        self.assertTrue(limit.hit('key'))
+        third = limit.hit('key')
+        self.assertTrue(third)
+        self.assertEqual(third.remaining, 0)
+
+        blocked = limit.check('key')
+        self.assertFalse(blocked)
+        self.assertGreater(blocked.retry_after, 60)
+        self.assertTrue(limit.check('other'))
+
+        limit.reset('key')
+        self.assertTrue(limit.check('key'))
+
+    def test_interval_between_hits(self):
+        limit = RateLimit('test', limit=10, window=60, interval=30)
+        self.assertTrue(limit.hit('key'))
+        self.assertFalse(limit.check('key'))
+        self.assertFalse(limit.hit('key'))
+
+    def test_failed_logins_lock_the_account_without_database_writes(self):
+        url = reverse('login')
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(5):
+                self.client.post(url, {'username': 'investor@example.com', 'password': 'wrong'})
+        self.assertEqual(self.writes(queries), [])
+
+        response = self.client.post(url, {'username': 'investor@example.com', 'password': 'testpass'})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Too many failed login attempts')
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+        # Another account from the same address is still allowed
+        User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder",
+            email_verified=True,
+        )
+        response = self.client.post(url, {'username': 'founder@example.com', 'password': 'testpass'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_password_reset_is_limited_per_account(self):
+        url = reverse('password_reset_request')
+        for _ in range(3):
+            self.client.post(url, {'email': 'investor@example.com'})
+        response = self.client.post(url, {'email': 'investor@example.com'}, follow=True)
+        self.assertContains(response, 'Maximum 3 reset attempts')
+        self.assertEqual(PasswordResetAttempt.objects.filter(user=self.user).count(), 3)
+        self.assertTrue(PasswordResetAttempt.too_many_attempts(self.user))
+
+    def test_verification_resend_cooldown(self):
+        self.assertTrue(self.user.can_resend_verification())
+        self.assertIsNone(self.user.verification_cooldown_until)
+        self.user.mark_verification_sent()
+        # One minute between sends
+        self.assertFalse(self.user.can_resend_verification())
+        self.assertLessEqual(
+            (self.user.verification_cooldown_until - timezone.now()).total_seconds(), 60
+        )
+
+
+class PurgeAuthRecordsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="investor", email="investor@example.com", password="testpass", role="investor"
+        )
+        now = timezone.now()
+        for i, (expires_at, used) in enumerate([
+            (now - timedelta(hours=1), False), (now + timedelta(hours=1), True), (now + timedelta(hours=1), False),
+        ]):
+            EmailVerificationToken.objects.create(user=self.user, token=f'email{i}', expires_at=expires_at, used=used)
+            PasswordResetToken.objects.create(user=self.user, token=f'reset{i}', expires_at=expires_at, used=used)
+        old = PasswordResetAttempt.objects.create(user=self.user)
+        PasswordResetAttempt.objects.filter(pk=old.pk).update(timestamp=now - timedelta(days=100))
+        PasswordResetAttempt.objects.create(user=self.user)
+        EmailCooldown.objects.create(user=self.user)
+        EmailCooldown.objects.update(last_sent=now - timedelta(days=2))
+
+    def test_deletes_expired_used_and_stale_rows_in_batches(self):
+        out = StringIO()
+        call_command('purge_auth_records', '--dry-run', stdout=out)
+        self.assertIn('Would delete 6 row(s) in total', out.getvalue())
+        self.assertEqual(EmailVerificationToken.objects.count(), 3)
+
+        out = StringIO()
+        call_command('purge_auth_records', '--batch-size', '1', stdout=out)
+        self.assertIn('Deleted 2 email verification tokens', out.getvalue())
+        self.assertIn('Deleted 2 password reset tokens', out.getvalue())
+        self.assertIn('Deleted 6 row(s) in total', out.getvalue())
+
+        self.assertEqual(list(EmailVerificationToken.objects.values_list('token', flat=True)), ['email2'])
+        self.assertEqual(list(PasswordResetToken.objects.values_list('token', flat=True)), ['reset2'])
+        self.assertEqual(PasswordResetAttempt.objects.count(), 1)
+        self.assertFalse(EmailCooldown.objects.exists())
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite-specific')
+    def test_recent_attempts_uses_user_timestamp_index(self):
+        plan = PasswordResetAttempt.recent_attempts(self.user, minutes=30).explain()
+        self.assertIn('USING INDEX pwattempt_user_ts_idx', plan)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: replies 250 to everything and records DATA"""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply('220 stand-in ready')
+        for raw in self.rfile:
+            command = raw.decode().strip().upper()
+            if command.startswith('MAIL FROM') and server.failures:
+                self.reply(server.failures.pop(0))
+            elif command == 'DATA':
+                self.reply('354 end with .')
+                lines = []
+                for data in self.rfile:
+                    if data == b'.\r\n':
+                        break
+                    lines.append(data)
+                server.messages.append(b''.join(lines))
+                self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.connections = 0
+        self.messages = []
+        # Replies to the next MAIL FROM commands, e.g. '451 try later'
+        self.failures = []
+
+
+class MailDispatchTests(TestCase):
+    def setUp(self):
+        self.server = SMTPStandIn()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def dispatcher(self, **config):
+        return MailDispatcher(
+            'django.core.mail.backends.smtp.EmailBackend',
+            config={**MAIL_DEFAULTS, 'RETRY_DELAY': 0, **config},
+            host='127.0.0.1', port=self.server.server_address[1], use_tls=False, username='', password='',
+        )
+
+    def messages(self, count):
+        return [EmailMessage(f'Hello {i}', 'Body', 'noreply@example.com', [f'user{i}@example.com']) for i in range(count)]
+
+    def test_messages_share_one_connection(self):
+        dispatcher = self.dispatcher()
+        self.assertEqual(dispatcher.send(self.messages(5)), 5)
+        self.assertEqual(dispatcher.send(self.messages(2)), 2)
+        dispatcher.close()
+        self.assertEqual(len(self.server.messages), 7)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_connection_recycled_after_batch(self):
+        dispatcher = self.dispatcher(BATCH_SIZE=2)
+        dispatcher.send(self.messages(5))
+        dispatcher.close()
+        self.assertEqual(self.server.connections, 3)
+
+    def test_transient_failure_is_retried_once_per_message(self):
+        self.server.failures = ['451 try again later']
+        dispatcher = self.dispatcher()
+        with self.assertLogs('venture_manager.mail', 'WARNING'):
+            self.assertEqual(dispatcher.send(self.messages(3)), 3)
+        dispatcher.close()
+        self.assertEqual(len(self.server.messages), 3)
+        self.assertEqual(self.server.connections, 2)
+
+    def test_permanent_failure_is_not_retried(self):
+        self.server.failures = ['550 no such sender']
+        dispatcher = self.dispatcher()
+        with self.assertRaises(smtplib.SMTPSenderRefused):
+            dispatcher.send(self.messages(1))
+        self.assertEqual(dispatcher.send(self.messages(1)), 1)
+        self.assertEqual(self.server.connections, 2)
+
+    def test_connection_failure_is_retried(self):
+        dispatcher = self.dispatcher()
+        open_connection = EmailBackend.open
+        failures = [ConnectionRefusedError()]
+
+        def flaky_open(backend):
+            if failures:
+                raise failures.pop()
+            return open_connection(backend)
+
+        with mock.patch.object(EmailBackend, 'open', flaky_open):
+            with self.assertLogs('venture_manager.mail', 'WARNING'):
+                self.assertEqual(dispatcher.send(self.messages(2)), 2)
+        dispatcher.close()
+        self.assertEqual(len(self.server.messages), 2)
+        self.assertEqual(dispatcher.connections_opened, 2)
+
+    def test_unreachable_server_keeps_messages_queued(self):
+        dispatcher = self.dispatcher(MAX_RETRIES=1)
+        dispatcher.queue(self.messages(2))
+        with mock.patch.object(EmailBackend, 'open', side_effect=ConnectionRefusedError):
+            with self.assertLogs('venture_manager.mail', 'WARNING'):
+                self.assertEqual(dispatcher.flush(fail_silently=True), 0)
+        self.assertEqual(len(dispatcher._queue), 2)
+        self.assertEqual(dispatcher.flush(), 2)
+        self.assertEqual(len(self.server.messages), 2)
+
+    def test_queued_messages_go_out_in_batches(self):
+        dispatcher = self.dispatcher(BATCH_SIZE=2)
+        dispatcher.queue(self.messages(5))
+        # Full batches leave at once, the remainder on flush()
+        self.assertEqual(len(self.server.messages), 4)
+        self.assertEqual(dispatcher.flush(), 1)
+        dispatcher.close()
+        self.assertEqual(len(self.server.messages), 5)
+        self.assertEqual(self.server.connections, 3)
+
+    def test_retry_backoff_does_not_hold_the_lock(self):
+        self.server.failures = ['451 try again later']
+        dispatcher = self.dispatcher(RETRY_DELAY=1)
+
+        def sleep(delay):
+            self.assertFalse(dispatcher._lock.locked())
+
+        with mock.patch('venture_manager.mail.time.sleep', side_effect=sleep) as slept:
+            with self.assertLogs('venture_manager.mail', 'WARNING'):
+                self.assertEqual(dispatcher.send(self.messages(2)), 2)
+        dispatcher.close()
+        slept.assert_called_once_with(1)
+        self.assertEqual(len(self.server.messages), 2)
+
+    def test_password_reset_email_renders_template(self):
+        user = User.objects.create_user(
+            username="investor", email="investor@example.com", password="testpass", role="investor",
+        )
+        send_password_reset_email(user, 'abc123')
+        self.assertEqual(len(outbox.outbox), 1)
+        self.assertIn('/abc123/', outbox.outbox[0].body)
+        self.assertEqual(outbox.outbox[0].to, ['investor@example.com'])
+
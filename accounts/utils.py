@@ -2,11 +2,13 @@ import secrets
 import random
 from datetime import timedelta, datetime
 from django.utils import timezone
-from django.core.mail import send_mail, BadHeaderError
+from django.core.mail import BadHeaderError
 from django.urls import reverse
 from django.conf import settings
 from django.contrib.auth import get_user_model
 
+from venture_manager import mail
+
 User = get_user_model()
 
 # ================================
@@ -37,7 +39,7 @@ def send_verification_email(user: User, request, method: str = None) -> str | No
 
     # ✅ Check rate-limiting rule
     if not user.can_resend_verification():
-        print(f"⏳ User {user.email} is rate limited until {user.verification_rate_limit_expiry}")
+        print(f"⏳ User {user.email} is rate limited until {user.verification_cooldown_until}")
         return None
 
     # ✅ Preserve method if previously used
@@ -58,47 +60,15 @@ def send_verification_email(user: User, request, method: str = None) -> str | No
     user.save(update_fields=["email_verification_token", "email_verification_expiry"])
 
     subject = "✅ Verify Your Email - VentureNest"
-
+    context = {"user": user, "token": token}
     if method == "link":
-        verification_url = request.build_absolute_uri(
+        context["verification_url"] = request.build_absolute_uri(
             reverse("verify_email") + f"?token={token}&email={user.email}"
         )
-        message = f"""
-Hi {user.get_full_name() or user.email},
-
-Please verify your email address by clicking the link below:
-
-{verification_url}
-
-This link will expire in 24 hours.
-
-If you did not sign up for an account, please ignore this email.
-
-Thanks,
-VentureNest Team
-"""
-    else:  # token method
-        message = f"""
-Hi {user.get_full_name() or user.email},
-
-Use the following token to verify your email: {token}
-
-This token will expire in 24 hours.
-
-If you did not sign up for an account, please ignore this email.
-
-Thanks,
-VentureNest Team
-"""
 
     try:
-        sent_count = send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
+        message = mail.render_message(f"verify_email_{method}", context, subject, [user.email])
+        sent_count = mail.send([message])
         if sent_count == 1:
             request.session["email_verification_method"] = method
             user.mark_verification_sent()
@@ -190,28 +160,10 @@ def send_password_reset_email(user, token, request=None):
             reset_url = f"{domain}{reverse('password_reset_confirm', args=[token])}"
 
         subject = "🔑 Reset Your Password - VentureNest"
-        message = f"""
-Hi {user.get_full_name() or user.email},
-
-You requested to reset your password. Click the link below to set a new password:
-
-{reset_url}
-
-This link will expire in 24 hours.
-
-If you did not request this, you can ignore this email.
-
-Thanks,  
-VentureNest Team
-"""
-
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
+        message = mail.render_message(
+            "password_reset", {"user": user, "reset_url": reset_url}, subject, [user.email]
         )
+        mail.send([message])
     except Exception as e:
         print(f"⚠️ Error in send_password_reset_email: {str(e)}")
 
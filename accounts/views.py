@@ -1,3 +1,5 @@
+import logging
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login as auth_login, authenticate, logout
 from django.contrib.auth.decorators import login_required
@@ -13,12 +15,15 @@ from .forms import (
     RoleSelectionForm, CustomUserCreationForm, CustomAuthenticationForm,
     PasswordResetRequestForm, PasswordResetForm, ProfileEditForm
 )
+from .ratelimit import RateLimit, client_ip, first_blocked
 from .utils import (
     send_verification_email, verify_email_token,
     generate_password_reset_token, send_password_reset_email
 )
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 # ----------------------------
 # 🧩 Role Selection
 # ----------------------------
@@ -92,11 +97,10 @@ def verify_email_notice(request):
         messages.success(request, "✅ Your email is already verified.")
         return redirect('dashboard_redirect')
 
-    # ✅ Check cooldown period
-    if user.verification_rate_limit_expiry and user.verification_rate_limit_expiry > timezone.now():
-        remaining = (user.verification_rate_limit_expiry - timezone.now()).total_seconds()
-        if remaining > 60:
-            return render(request, "auth/verification_cooldown.html", {"user": user})
+    # ✅ Check cooldown period (the one-minute gap between sends is not a cooldown)
+    cooldown_until = user.verification_cooldown_until
+    if cooldown_until and (cooldown_until - timezone.now()).total_seconds() > 60:
+        return render(request, "auth/verification_cooldown.html", {"user": user, "cooldown_until": cooldown_until})
 
     # ✅ Determine current verification method
     method = request.session.get("email_verification_method")
@@ -113,7 +117,9 @@ def verify_email_notice(request):
     # ✅ Handle resend request
     if request.method == "POST" and "resend" in request.POST:
         if not user.can_resend_verification():
-            return render(request, "auth/verification_cooldown.html", {"user": user})
+            return render(request, "auth/verification_cooldown.html", {
+                "user": user, "cooldown_until": user.verification_cooldown_until,
+            })
         sent_method = send_verification_email(user, request, method=method)
         if sent_method:
             messages.success(request, f"📧 A new verification {sent_method} has been sent to your email.")
@@ -145,6 +151,7 @@ def verify_email_notice(request):
         "token_for_display": token_for_display if method == "token" else None,
         "verification_link": verification_link if method == "link" else None,
         "show_resend": True,
+        "cooldown_until": user.verification_cooldown_until,
     })
 
 
@@ -172,21 +179,24 @@ def verify_email(request):
 # ----------------------------
 # 🔄 Password Reset
 # ----------------------------
-RESET_LIMIT = 3
-RESET_WINDOW_MINUTES = 30
-
 def password_reset_request(request):
     """
     Handle password reset requests:
     - Protect against enumeration by returning the same success message whether the email exists or not.
-    - Rate-limit requests per user using PasswordResetAttempt.recent_attempts.
+    - Rate-limit requests per client IP and per account with cache counters (RATE_LIMITS).
     - Create a PasswordResetToken with an expires_at timestamp.
-    - Log the attempt (with client IP) in PasswordResetAttempt.
+    - Log accepted requests (with client IP) in PasswordResetAttempt.
     """
     if request.method == "POST":
         form = PasswordResetRequestForm(request.POST)
         if form.is_valid():
             email = form.cleaned_data["email"].lower()
+            ip = client_ip(request)
+
+            # Counted for every address, known or not, before touching the database
+            if not RateLimit.for_action("password_reset_ip").hit(ip):
+                messages.error(request, "⚠️ Too many password reset requests. Please try again later.")
+                return redirect("password_reset_request")
 
             # Look up user but do NOT leak whether they exist
             user = CustomUser.objects.filter(email=email).first()
@@ -199,30 +209,16 @@ def password_reset_request(request):
                 )
                 return redirect("login")
 
-            # Determine number of recent attempts (recent_attempts may return an int or a QuerySet)
-            attempts_raw = PasswordResetAttempt.recent_attempts(user, minutes=RESET_WINDOW_MINUTES)
-            if hasattr(attempts_raw, "count"):
-                attempts_count = attempts_raw.count()
-            else:
-                try:
-                    attempts_count = int(attempts_raw)
-                except Exception:
-                    # Fallback if it's an iterable
-                    attempts_count = len(attempts_raw) if hasattr(attempts_raw, "__len__") else 0
-
-            if attempts_count >= RESET_LIMIT:
+            account_limit = RateLimit.for_action("password_reset")
+            if not account_limit.hit(user.pk):
                 messages.error(
                     request,
-                    f"⚠️ Maximum {RESET_LIMIT} reset attempts allowed in {RESET_WINDOW_MINUTES} minutes. Try later."
+                    f"⚠️ Maximum {account_limit.limit} reset attempts allowed in "
+                    f"{account_limit.window // 60} minutes. Try later."
                 )
                 return redirect("password_reset_request")
 
-            # Log the password reset attempt (include IP when available)
-            x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
-            if x_forwarded_for:
-                ip = x_forwarded_for.split(",")[0].strip()
-            else:
-                ip = request.META.get("REMOTE_ADDR")
+            # Audit trail of accepted requests; rejected ones write nothing
             PasswordResetAttempt.objects.create(user=user, ip_address=ip, successful=False)
 
             # Generate token and expiry, save it
@@ -236,7 +232,7 @@ def password_reset_request(request):
                 send_password_reset_email(user, token, request=request)
             except Exception as e:
                 # Keep this non-fatal — log for debugging
-                print(f"⚠️ Could not send password reset email to {user.email}: {e}")
+                logger.warning("Could not send password reset email to user %s: %s", user.pk, e)
 
             messages.success(
                 request,
@@ -277,86 +273,57 @@ def custom_login(request):
     """
     Safe login view:
     - Avoids AttributeError when authentication fails (user is None)
-    - Simple session-based throttle (max attempts -> temporary lockout)
+    - Failed attempts are counted per account and per client IP in the cache
+      (RATE_LIMITS['login'] / ['login_ip']); reaching either limit locks it out
     - Allows unverified users to log in so they can reach verify_email_notice
     """
-    from django.utils import timezone
-
     if request.user.is_authenticated:
         return redirect('dashboard_redirect')
 
-    # Simple session-based throttling
-    ATTEMPS_KEY = "login_attempts"
-    LOCKOUT_KEY = "login_lockout_until"
-    MAX_ATTEMPTS = 5
-    LOCKOUT_SECONDS = 300  # 5 minutes
-
-    # Check lockout
-    lockout_until_ts = request.session.get(LOCKOUT_KEY)
-    if lockout_until_ts:
-        try:
-            now_ts = timezone.now().timestamp()
-            if now_ts < float(lockout_until_ts):
-                remaining = int(float(lockout_until_ts) - now_ts)
-                messages.error(request, f"Too many failed login attempts. Try again in {remaining} second(s).")
-                return render(request, 'auth/login.html', {'form': CustomAuthenticationForm()})
-            else:
-                # expired -> clear
-                request.session.pop(LOCKOUT_KEY, None)
-                request.session.pop(ATTEMPS_KEY, None)
-        except Exception:
-            # if something odd in session, clear it
-            request.session.pop(LOCKOUT_KEY, None)
-            request.session.pop(ATTEMPS_KEY, None)
-
     if request.method == 'POST':
+        account = request.POST.get('username', '').strip().lower()
+        ip = client_ip(request)
+        account_limit = RateLimit.for_action('login')
+        ip_limit = RateLimit.for_action('login_ip')
+
+        # Locked out: refuse before authenticating, so no password hashing either
+        blocked = first_blocked(account_limit.check(account), ip_limit.check(ip))
+        if blocked is not None:
+            messages.error(
+                request, f"Too many failed login attempts. Try again in {blocked.retry_after} second(s)."
+            )
+            return render(request, 'auth/login.html', {'form': CustomAuthenticationForm()})
+
         form = CustomAuthenticationForm(request, data=request.POST)
-        if form.is_valid():
-            user = form.get_user()
-
-            # Defensive: form should provide a user, but guard anyway
-            if user is None:
-                # increment attempts and show generic error
-                attempts = request.session.get(ATTEMPS_KEY, 0) + 1
-                request.session[ATTEMPS_KEY] = attempts
-                if attempts >= MAX_ATTEMPTS:
-                    request.session[LOCKOUT_KEY] = timezone.now().timestamp() + LOCKOUT_SECONDS
-                    messages.error(request, "Too many failed login attempts. Try again later.")
-                else:
-                    messages.error(request, "Invalid credentials. Please try again.")
-                return render(request, 'auth/login.html', {'form': form})
-
-            # Successful authentication -> clear attempts
-            request.session.pop(ATTEMPS_KEY, None)
-            request.session.pop(LOCKOUT_KEY, None)
-
-            # If email not verified: allow login (so user can see verification notice)
-            if not getattr(user, 'is_email_verified', False):
-                # make sure auth_login is available (import at top of file: `from django.contrib.auth import login as auth_login`)
-                auth_login(request, user)
-                messages.warning(request, "⚠️ Your email is not verified. Please check your inbox.")
-                return redirect("verify_email_notice")
-
-            # Normal verified-user login
-            auth_login(request, user)
-            messages.success(request, f'Welcome back, {user.first_name or user.username}!')
-            next_url = request.GET.get('next')
-            if next_url:
-                return redirect(next_url)
-            return redirect('dashboard_redirect')
+        user = form.get_user() if form.is_valid() else None
 
-        else:
-            # Invalid form -> increment attempts (don't leak whether user exists)
-            attempts = request.session.get(ATTEMPS_KEY, 0) + 1
-            request.session[ATTEMPS_KEY] = attempts
-            if attempts >= MAX_ATTEMPTS:
-                request.session[LOCKOUT_KEY] = timezone.now().timestamp() + LOCKOUT_SECONDS
-                messages.error(request, "Too many failed login attempts. Try again in 5 minutes.")
+        if user is None:
+            # Don't leak whether the account exists
+            results = (account_limit.hit(account), ip_limit.hit(ip))
+            if first_blocked(*results) is not None or min(result.remaining for result in results) == 0:
+                messages.error(request, "Too many failed login attempts. Try again later.")
             else:
                 messages.error(request, 'Invalid username/email or password.')
-    else:
-        form = CustomAuthenticationForm()
+            return render(request, 'auth/login.html', {'form': form})
+
+        # Successful authentication -> clear the account's failures
+        account_limit.reset(account)
+
+        # If email not verified: allow login (so user can see verification notice)
+        if not getattr(user, 'is_email_verified', False):
+            auth_login(request, user)
+            messages.warning(request, "⚠️ Your email is not verified. Please check your inbox.")
+            return redirect("verify_email_notice")
+
+        # Normal verified-user login
+        auth_login(request, user)
+        messages.success(request, f'Welcome back, {user.first_name or user.username}!')
+        next_url = request.GET.get('next')
+        if next_url:
+            return redirect(next_url)
+        return redirect('dashboard_redirect')
 
+    form = CustomAuthenticationForm()
     return render(request, 'auth/login.html', {'form': form})
 
 
@@ -376,8 +343,6 @@ def custom_logout(request):
 @login_required
 def profile_view(request):
     user = request.user
-    print(f"DEBUG: User: {user}")  # Check if user is available
-    print(f"DEBUG: User authenticated: {user.is_authenticated}")
     
     # Handle form submission
     if request.method == 'POST':
@@ -388,10 +353,9 @@ def profile_view(request):
             return redirect('profile')
         else:
             messages.error(request, 'Please correct the errors below.')
-            print(f"DEBUG: Form errors: {form.errors}")  # Check form errors
+            logger.debug("Profile form errors for user %s: %s", user.pk, form.errors.as_json())
     else:
         form = ProfileEditForm(instance=user)
-        print(f"DEBUG: Form created with instance: {user}")
     
     context = {
         'user': user,
@@ -1,5 +1,6 @@
 # communications/admin.py
 from django.contrib import admin
+from .exports import NOTIFICATIONS
 from .models import Notification, Message, Conversation, ConversationMember, MessageRecipient
 
 class ConversationMemberInline(admin.TabularInline):
@@ -29,6 +30,8 @@ class NotificationAdmin(admin.ModelAdmin):
         })
     )
     
+    actions = [NOTIFICATIONS.admin_action(), NOTIFICATIONS.admin_action('ndjson')]
+    
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('user')
 
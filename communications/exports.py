@@ -0,0 +1,14 @@
+# communications/exports.py
+from venture_manager.exporting import Export
+
+NOTIFICATIONS = Export('notifications', [
+    ('id', 'id'),
+    ('user', 'user__email'),
+    ('type', 'notification_type'),
+    ('title', 'title'),
+    ('message', 'message'),
+    ('is_read', 'is_read'),
+    ('action_url', 'action_url'),
+    ('created_at', 'created_at'),
+    ('read_at', 'read_at'),
+])
@@ -1,5 +1,6 @@
 # communications/models.py
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -70,6 +71,9 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'created_at'], name='message_conv_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.sender} in {self.conversation}: {self.content[:50]}"
@@ -82,6 +86,10 @@ class MessageRecipient(models.Model):
     
     class Meta:
         unique_together = ['message', 'user']
+        indexes = [
+            # Unread badges only ever look at unread rows
+            models.Index(fields=['user', 'message'], condition=Q(is_read=False), name='msgrecipient_unread_idx'),
+        ]
 
 # Keep your existing Notification model
 class Notification(models.Model):
@@ -107,6 +115,10 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='notif_user_created_idx'),
+            models.Index(fields=['user', 'created_at'], condition=Q(is_read=False), name='notif_user_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.title}"
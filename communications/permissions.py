@@ -1,6 +1,8 @@
 # communications/permissions.py
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 from investments.models import Investment
+from tasks.models import Task
 
 
 CustomUser = get_user_model()
@@ -8,10 +10,13 @@ CustomUser = get_user_model()
 class MessagePermissions:
     
     @staticmethod
-    def can_message_user(sender, recipient):
-        """Check if a user can message another user"""
+    def _relationship(sender, recipient):
+        """
+        True or False when the roles decide it, otherwise a queryset that is
+        non-empty when the two users are related
+        """
         # Users can't message themselves
-        if sender == recipient:
+        if sender.pk == recipient.pk:
             return False
         
         # Based on roles and relationships
@@ -19,33 +24,86 @@ class MessagePermissions:
             # Investors can message founders they've invested in
             return Investment.objects.filter(
                 startup__founder=recipient,
-                investors=sender
-            ).exists()
+                investor=sender
+            )
         
         elif sender.role == 'founder' and recipient.role == 'investor':
             # Founders can message their investors
             return Investment.objects.filter(
                 startup__founder=sender,
-                investors=recipient
-            ).exists()
+                investor=recipient
+            )
         
         elif sender.role == 'founder' and recipient.role == 'team_member':
             # Founders can message their team members
-            return recipient.teams.filter(startup__founder=sender).exists()
+            return Task.objects.filter(assigned_to=recipient, project__startup__founder=sender)
         
         elif sender.role == 'team_member' and recipient.role == 'founder':
             # Team members can message their founder
-            return sender.teams.filter(startup__founder=recipient).exists()
+            return Task.objects.filter(assigned_to=sender, project__startup__founder=recipient)
         
         elif sender.role == 'team_member' and recipient.role == 'team_member':
             # Team members can message colleagues in same startup
-            sender_startups = set(sender.teams.values_list('startup_id', flat=True))
-            recipient_startups = set(recipient.teams.values_list('startup_id', flat=True))
-            return bool(sender_startups.intersection(recipient_startups))
+            sender_startups = Task.objects.filter(assigned_to=sender).values('project__startup_id')
+            return Task.objects.filter(
+                assigned_to=recipient, project__startup_id__in=sender_startups
+            )
         
         # Venture managers have broader messaging privileges
         elif sender.role == 'manager':
             return True
         
         # Default deny
-        return False
\ No newline at end of file
+        return False
+    
+    @staticmethod
+    def can_message_user(sender, recipient):
+        """Check if a user can message another user"""
+        related = MessagePermissions._relationship(sender, recipient)
+        return related if isinstance(related, bool) else related.exists()
+    
+    @staticmethod
+    async def acan_message_user(sender, recipient):
+        """Async can_message_user()"""
+        related = MessagePermissions._relationship(sender, recipient)
+        return related if isinstance(related, bool) else await related.aexists()
+
+    @staticmethod
+    def messageable_users(sender):
+        """
+        Queryset of the users can_message_user() allows sender to message,
+        with the relationships checked as subqueries instead of per user
+        """
+        users = CustomUser.objects.exclude(pk=sender.pk)
+        
+        if sender.role == 'manager':
+            return users
+        
+        if sender.role == 'investor':
+            return users.filter(
+                role='founder',
+                pk__in=Investment.objects.filter(investor=sender).values('startup__founder'),
+            )
+        
+        if sender.role == 'founder':
+            return users.filter(
+                Q(role='investor', pk__in=Investment.objects.filter(
+                    startup__founder=sender
+                ).values('investor'))
+                | Q(role='team_member', pk__in=Task.objects.filter(
+                    project__startup__founder=sender
+                ).values('assigned_to'))
+            )
+        
+        if sender.role == 'team_member':
+            sender_startups = Task.objects.filter(assigned_to=sender).values('project__startup_id')
+            return users.filter(
+                Q(role='founder', pk__in=Task.objects.filter(
+                    assigned_to=sender
+                ).values('project__startup__founder'))
+                | Q(role='team_member', pk__in=Task.objects.filter(
+                    project__startup_id__in=sender_startups
+                ).values('assigned_to'))
+            )
+        
+        return users.none()
@@ -1,8 +1,11 @@
 # communications/services.py
+from asgiref.sync import sync_to_async
 from django.utils import timezone
 from django.db import transaction
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, prefetch_related_objects
+
+from venture_manager.caching import invalidate
 
 from .models import Notification, Conversation, ConversationMember, Message, MessageRecipient
 from startups.models import Startup
@@ -39,6 +42,7 @@ class NotificationService:
             ) for user in users
         ]
         Notification.objects.bulk_create(notifications)
+        invalidate(Notification)
         return notifications
     
     @staticmethod
@@ -48,6 +52,7 @@ class NotificationService:
             is_read=True, 
             read_at=timezone.now()
         )
+        invalidate(Notification)
     
     @staticmethod
     def get_unread_count(user):
@@ -58,22 +63,36 @@ class NotificationService:
     def get_recent_notifications(user, limit=10):
         """Get recent notifications for a user"""
         return Notification.objects.filter(user=user).order_by('-created_at')[:limit]
+    
+    @staticmethod
+    async def aget_unread_count(user):
+        """Async get_unread_count()"""
+        return await Notification.objects.filter(user=user, is_read=False).acount()
+    
+    @staticmethod
+    async def aget_recent_notifications(user, limit=10):
+        """Async get_recent_notifications(), as a list"""
+        return [n async for n in NotificationService.get_recent_notifications(user, limit)]
 
 
 class ConversationService:
     
+    @staticmethod
+    def _direct_conversations(user1, user2):
+        return Conversation.objects.filter(
+            conversation_type='direct'
+        ).filter(
+            members=user1
+        ).filter(
+            members=user2
+        ).distinct()
+    
     @staticmethod
     def get_or_create_direct_conversation(user1, user2):
         """Get or create a direct message conversation between two users"""
         with transaction.atomic():
             # First, check if there's already a direct conversation between these users
-            existing_conversations = Conversation.objects.filter(
-                conversation_type='direct'
-            ).filter(
-                members__user=user1
-            ).filter(
-                members__user=user2
-            ).distinct()
+            existing_conversations = ConversationService._direct_conversations(user1, user2)
             
             if existing_conversations.exists():
                 return existing_conversations.first(), False
@@ -93,6 +112,18 @@ class ConversationService:
             
             return conversation, True
     
+    @staticmethod
+    async def aget_or_create_direct_conversation(user1, user2):
+        """
+        Async get_or_create_direct_conversation(). The lookup uses the async
+        ORM; creating a conversation needs a transaction, which only the sync
+        ORM supports, so that part runs in a thread.
+        """
+        conversation = await ConversationService._direct_conversations(user1, user2).afirst()
+        if conversation is not None:
+            return conversation, False
+        return await sync_to_async(ConversationService.get_or_create_direct_conversation)(user1, user2)
+    
     @staticmethod
     def create_startup_team_conversation(startup):
         """Create conversation for startup team members"""
@@ -156,26 +187,68 @@ class ConversationService:
     
     @staticmethod
     def get_user_conversations(user):
-        """Get all conversations a user is part of"""
+        """Get all conversations a user is part of, most recently active first"""
         # Get conversation IDs where user is a member
         conversation_ids = ConversationMember.objects.filter(
             user=user
         ).values_list('conversation_id', flat=True)
         
-        # Get conversations with prefetching
+        # One row per conversation; ordering on messages__created_at directly
+        # would return a conversation once per message
         conversations = Conversation.objects.filter(
             id__in=conversation_ids,
             is_active=True
-        ).prefetch_related(
-            'conversationmember_set__user',  # Prefetch members
-            'messages',  # Prefetch messages
-            'messages__sender',  # Prefetch message senders
-            'startup',  # Prefetch startup if exists
-            'investment'  # Prefetch investment if exists
-        ).distinct().order_by('-messages__created_at')  # Order by latest message
+        ).select_related(
+            'startup', 'investment'
+        ).annotate(
+            last_message_at=Max('messages__created_at')
+        ).order_by(F('last_message_at').desc(nulls_last=True), '-created_at')
         
         return conversations
     
+    @staticmethod
+    def prefetch_inbox(conversations, user):
+        """
+        Load what the conversation list shows for a page of conversations in a
+        fixed number of queries, however many conversations there are:
+
+        - conversation.members: every member, one query (the get_other_user
+          and exclude_user filters read this cache)
+        - conversation.last_message: latest message with its sender, one query
+        - conversation.unread_count: messages `user` has not read, one query
+
+        Returns the conversations as a list.
+        """
+        conversations = list(conversations)
+        if not conversations:
+            return conversations
+        prefetch_related_objects(conversations, 'members')
+
+        conversation_ids = [conversation.pk for conversation in conversations]
+        latest = Message.objects.filter(
+            conversation_id=OuterRef('conversation_id')
+        ).order_by('-created_at', '-pk').values('pk')[:1]
+        last_messages = {
+            message.conversation_id: message
+            for message in Message.objects.filter(
+                conversation_id__in=conversation_ids, pk=Subquery(latest)
+            ).select_related('sender')
+        }
+        unread_counts = dict(
+            MessageRecipient.objects.filter(
+                user=user,
+                is_read=False,
+                message__conversation_id__in=conversation_ids,
+            ).exclude(
+                message__sender=user
+            ).values_list('message__conversation_id').annotate(count=Count('pk'))
+        )
+
+        for conversation in conversations:
+            conversation.last_message = last_messages.get(conversation.pk)
+            conversation.unread_count = unread_counts.get(conversation.pk, 0)
+        return conversations
+    
     @staticmethod
     def get_conversation_members(conversation):
         """Get all members of a conversation"""
@@ -189,11 +262,10 @@ class ConversationService:
         if conversation.conversation_type != 'direct':
             return None
         
-        other_member = conversation.conversationmember_set.exclude(
-            user=current_user
-        ).select_related('user').first()
-        
-        return other_member.user if other_member else None
+        for member in conversation.members.all():
+            if member.pk != current_user.pk:
+                return member
+        return None
     
     @staticmethod
     def get_unread_message_count(conversation, user):
@@ -5,22 +5,32 @@ from django.contrib.auth import get_user_model
 register = template.Library()
 CustomUser = get_user_model()
 
+
+def _rows(value):
+    """
+    Rows of a manager or queryset. .all() on a related manager returns the
+    prefetch cache when there is one, so this only queries when nothing was
+    prefetched.
+    """
+    return value.all() if hasattr(value, 'all') else value
+
+
 @register.filter
 def exclude_user(queryset, user):
-    """Exclude a specific user from a queryset"""
-    if hasattr(queryset, 'exclude'):
-        return queryset.exclude(id=user.id)
-    elif hasattr(queryset, 'filter'):
-        # Handle case where it might be a manager
-        return queryset.filter(id__ne=user.id)
-    return queryset
+    """Exclude a specific user from a queryset, manager or list of users"""
+    return [member for member in _rows(queryset) if member.pk != user.pk]
+
 
 @register.filter
 def get_other_user(conversation, current_user):
-    """Get the other user in a direct conversation"""
-    if conversation.conversation_type != 'direct':
+    """
+    Get the other user in a direct conversation. Uses the members loaded by
+    ConversationService.prefetch_inbox(); one query otherwise.
+    """
+    if conversation is None or conversation.conversation_type != 'direct':
         return None
-    
-    # Get the other member (excluding current user)
-    other_members = conversation.members.exclude(id=current_user.id)
-    return other_members.first() if other_members.exists() else None
\ No newline at end of file
+
+    for member in conversation.members.all():
+        if member.pk != current_user.pk:
+            return member
+    return None
@@ -1,3 +1,231 @@
+from datetime import date
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from investments.models import Investment
+from projects.models import Project
+from startups.models import Startup
+from tasks.models import Task
+from venture_manager.instrumentation import detect_n_plus_one
+
+from . import views
+from .models import Conversation, ConversationMember, Message, MessageRecipient, Notification
+from .permissions import MessagePermissions
+from .services import ConversationService
+from .templatetags.communication_filters import exclude_user, get_other_user
+
+User = get_user_model()
+
+
+class InboxTestMixin:
+    def setUp(self):
+        self.investor = User.objects.create_user(
+            username="investor", email="investor@example.com", password="testpass", role="investor"
+        )
+        self.founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        self.manager = User.objects.create_user(
+            username="manager", email="manager@example.com", password="testpass", role="manager"
+        )
+
+    def converse(self, *members, conversation_type='direct', messages=3):
+        conversation = Conversation.objects.create(
+            title="Chat", conversation_type=conversation_type, created_by=members[0]
+        )
+        for member in members:
+            ConversationMember.objects.create(conversation=conversation, user=member)
+        for i in range(messages):
+            sender = members[i % len(members)]
+            message = Message.objects.create(conversation=conversation, sender=sender, content=f"Hi {i}")
+            for member in members:
+                if member != sender:
+                    MessageRecipient.objects.create(message=message, user=member)
+        return conversation
+
+
+class InboxPrefetchTests(InboxTestMixin, TestCase):
+    def test_prefetch_inbox_attaches_last_message_and_unread_count(self):
+        direct = self.converse(self.investor, self.founder, messages=3)
+        group = self.converse(self.investor, self.founder, self.manager, conversation_type='venture', messages=0)
+
+        conversations = ConversationService.prefetch_inbox(
+            ConversationService.get_user_conversations(self.investor), self.investor
+        )
+        self.assertEqual([conversation.pk for conversation in conversations], [direct.pk, group.pk])
+
+        direct, group = conversations
+        self.assertEqual(direct.last_message.content, "Hi 2")
+        # Messages 1 came from the founder; 0 and 2 from the investor
+        self.assertEqual(direct.unread_count, 1)
+        self.assertIsNone(group.last_message)
+        self.assertEqual(group.unread_count, 0)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_other_user(direct, self.investor), self.founder)
+            self.assertIsNone(get_other_user(group, self.investor))
+            self.assertEqual(
+                {user.pk for user in exclude_user(group.members, self.investor)},
+                {self.founder.pk, self.manager.pk},
+            )
+            self.assertEqual(direct.last_message.sender, self.investor)
+
+    def test_filters_without_prefetch_query_once(self):
+        conversation = self.converse(self.investor, self.founder, messages=0)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_other_user(conversation, self.founder), self.investor)
+
+    def test_messages_view_queries_do_not_grow_with_conversations(self):
+        self.client.force_login(self.investor)
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('messages'))
+            self.assertEqual(response.status_code, 200)
+            return len(queries), response
+
+        self.converse(self.investor, self.founder)
+        self.converse(self.investor, self.founder, self.manager, conversation_type='venture')
+        few, _ = count_queries()
+
+        for _ in range(5):
+            self.converse(self.investor, self.founder)
+            self.converse(self.investor, self.manager, self.founder, conversation_type='venture')
+        many, response = count_queries()
+
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.context['conversations']), 12)
+        self.assertContains(response, self.founder.get_full_name() or self.founder.username)
+
+    def test_conversation_detail_has_no_n_plus_one(self):
+        conversation = self.converse(
+            self.investor, self.founder, self.manager, conversation_type='venture', messages=10
+        )
+        self.client.force_login(self.investor)
+        with detect_n_plus_one(threshold=3):
+            response = self.client.get(reverse('conversation_detail', args=[conversation.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Hi 9")
+        self.assertFalse(
+            MessageRecipient.objects.filter(message__conversation=conversation, user=self.investor, is_read=False).exists()
+        )
+
+
+class MessageableUsersTests(InboxTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_founder = User.objects.create_user(
+            username="other", email="other@example.com", password="testpass", role="founder"
+        )
+        self.members = [
+            User.objects.create_user(
+                username=f"member{i}", email=f"member{i}@example.com", password="testpass", role="team_member"
+            )
+            for i in range(3)
+        ]
+        mine = self.make_startup("Mine", self.founder)
+        theirs = self.make_startup("Theirs", self.other_founder)
+        Investment.objects.create(
+            investor=self.investor, startup=theirs, amount=1000, equity=1, valuation=100000,
+            round='seed', investment_date=date(2024, 1, 1),
+        )
+        for member, startup in zip(self.members, (mine, mine, theirs)):
+            project = Project.objects.create(name=f"{startup.name} P", description="-", startup=startup)
+            Task.objects.create(title="T", description="-", project=project, assigned_to=member)
+
+    def make_startup(self, name, founder):
+        return Startup.objects.create(
+            name=name, description="-", industry="tech", stage="seed", founding_date=date(2020, 1, 1),
+            location="Lagos", market="B2B", founder=founder,
+        )
+
+    def test_matches_can_message_user(self):
+        users = list(User.objects.all())
+        for sender in users:
+            expected = {user.pk for user in users if MessagePermissions.can_message_user(sender, user)}
+            with self.assertNumQueries(1):
+                messageable = {user.pk for user in MessagePermissions.messageable_users(sender)}
+            self.assertEqual(messageable, expected, sender.username)
+
+        self.assertEqual(
+            set(MessagePermissions.messageable_users(self.members[0])),
+            {self.founder, self.members[1]},
+        )
+
+    def test_messages_view_queries_do_not_grow_with_users(self):
+        self.client.force_login(self.manager)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('messages'))
+        self.assertEqual(len(response.context['available_users']), User.objects.count() - 1)
+
+        for i in range(5):
+            User.objects.create_user(
+                username=f"extra{i}", email=f"extra{i}@example.com", password="testpass", role="investor"
+            )
+        with self.assertNumQueries(len(queries)):
+            self.client.get(reverse('messages'))
+
+
+class AsyncEndpointTests(InboxTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        startup = Startup.objects.create(
+            name="Acme", description="-", industry="tech", stage="seed", founding_date=date(2020, 1, 1),
+            location="Lagos", market="B2B", founder=self.founder,
+        )
+        Investment.objects.create(
+            investor=self.investor, startup=startup, amount=1000, equity=1, valuation=100000,
+            round='seed', investment_date=date(2024, 1, 1),
+        )
+        Notification.objects.filter(user=self.investor).delete()
+        for i in range(3):
+            Notification.objects.create(user=self.investor, title=f"N{i}", message="-", is_read=i == 0)
+        self.async_client.force_login(self.investor)
+
+    def test_polled_views_are_coroutines(self):
+        for view in (views.notification_count_api, views.recent_notifications_api,
+                     views.send_message, views.start_direct_message):
+            self.assertTrue(iscoroutinefunction(view), view)
+
+    async def test_notification_apis(self):
+        response = await self.async_client.get(reverse('notification_count_api'))
+        self.assertEqual(response.json(), {'unread_count': 2})
+        # The user and the count, run by the async ORM in a worker thread,
+        # are still attributed to the request
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+
+        data = (await self.async_client.get(reverse('recent_notifications_api'))).json()
+        self.assertEqual([n['title'] for n in data['notifications']], ['N2', 'N1', 'N0'])
+
+    async def test_start_direct_message_reuses_the_conversation(self):
+        url = reverse('start_direct_message', args=[self.founder.pk])
+        first = (await self.async_client.get(url)).json()
+        second = (await self.async_client.get(url)).json()
+        self.assertTrue(first['created'])
+        self.assertFalse(second['created'])
+        self.assertEqual(first['conversation_id'], second['conversation_id'])
+
+        response = await self.async_client.get(reverse('start_direct_message', args=[self.manager.pk]))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_send_message_records_recipients(self):
+        conversation = await sync_to_async(self.converse)(self.investor, self.founder, self.manager, messages=0)
+        response = await self.async_client.post(
+            reverse('send_message', args=[conversation.pk]), {'content': 'Hello'},
+            headers={'X-Requested-With': 'XMLHttpRequest'},
+        )
+        self.assertEqual(response.json()['content'], 'Hello')
+        recipients = MessageRecipient.objects.filter(message_id=response.json()['message_id'])
+        self.assertEqual(
+            {user_id async for user_id in recipients.values_list('user_id', flat=True)},
+            {self.founder.pk, self.manager.pk},
+        )
 
-# Create your tests here.
+        other = await sync_to_async(self.converse)(self.founder, self.manager, messages=0)
+        response = await self.async_client.post(reverse('send_message', args=[other.pk]), {'content': 'Hi'})
+        self.assertEqual(response.status_code, 403)
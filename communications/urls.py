@@ -7,6 +7,7 @@ urlpatterns = [
     path('notifications/', views.notifications_view, name='notifications'),
     path('notifications/<int:pk>/read/', views.mark_notification_read, name='mark_notification_read'),
     path('notifications/mark-all-read/', views.mark_all_notifications_read, name='mark_all_notifications_read'),
+    path('notifications/export/', views.notification_export, name='notification_export'),
     path('api/notifications/count/', views.notification_count_api, name='notification_count_api'),
     path('api/notifications/recent/', views.recent_notifications_api, name='recent_notifications_api'),
     
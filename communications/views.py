@@ -1,29 +1,57 @@
 # communications/views.py
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, get_object_or_404, aget_object_or_404, redirect
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
+from django.db.models import Prefetch
 from .models import Notification, Message
+from .exports import NOTIFICATIONS
 from .services import NotificationService
 
 from .models import Conversation, Message, ConversationMember, MessageRecipient
 from .services import ConversationService
 from .permissions import MessagePermissions
 from django.contrib.auth import get_user_model
+from venture_manager.listing import ListQuery, ListFilter, boolean_filter
 
 CustomUser = get_user_model()
 
 
+def _notification_json(notification):
+    return {
+        'id': notification.id,
+        'title': notification.title,
+        'message': notification.message,
+        'type': notification.notification_type,
+        'is_read': notification.is_read,
+        'action_url': notification.action_url,
+        'created_at': notification.created_at.isoformat(),
+    }
+
 @login_required
 def notifications_view(request):
     """Display all notifications for the user"""
-    notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
+    listing = ListQuery(
+        request,
+        Notification.objects.filter(user=request.user),
+        sort_keys={'created': 'created_at'},
+        default_sort='-created',
+        filters={
+            'read': boolean_filter('is_read'),
+            'type': ListFilter('notification_type', Notification.NOTIFICATION_TYPES),
+        },
+    )
+    notifications = listing.page()
     unread_count = NotificationService.get_unread_count(request.user)
     
+    if listing.wants_json():
+        return listing.json_response(notifications, _notification_json, unread_count=unread_count)
+    
     return render(request, 'communications/notifications.html', {
         'notifications': notifications,
         'unread_count': unread_count,
+        **listing.context(),
     })
 
 @login_required
@@ -50,15 +78,25 @@ def mark_all_notifications_read(request):
     return redirect('notifications')
 
 @login_required
-def notification_count_api(request):
+def notification_export(request):
+    """Stream the user's notifications (?format=ndjson)"""
+    notifications = Notification.objects.filter(user=request.user).order_by('created_at', 'pk')
+    return NOTIFICATIONS.response(notifications, request.GET.get('format'))
+
+# The polled JSON endpoints below are async: under ASGI a request waiting on
+# the database does not hold a worker thread. Use request.auser(), never
+# request.user, inside them.
+
+@login_required
+async def notification_count_api(request):
     """API endpoint to get unread notification count"""
-    count = NotificationService.get_unread_count(request.user)
+    count = await NotificationService.aget_unread_count(await request.auser())
     return JsonResponse({'unread_count': count})
 
 @login_required
-def recent_notifications_api(request):
+async def recent_notifications_api(request):
     """API endpoint to get recent notifications"""
-    notifications = NotificationService.get_recent_notifications(request.user, limit=5)
+    notifications = await NotificationService.aget_recent_notifications(await request.auser(), limit=5)
     data = [
         {
             'id': n.id,
@@ -104,9 +142,7 @@ def messages_view(request, conversation_id=None):
         ).update(is_read=True)
     
     # Get available users for new messages (based on permissions)
-    available_users = CustomUser.objects.exclude(id=request.user.id)
-    available_users = [user for user in available_users 
-                      if MessagePermissions.can_message_user(request.user, user)]
+    available_users = MessagePermissions.messageable_users(request.user)
     
     return render(request, 'communications/messages.html', {
         'conversations': conversations,
@@ -125,28 +161,9 @@ def conversation_list(request):
 @login_required
 def messages_view(request, conversation_id=None):
     try:
-        conversations = ConversationService.get_user_conversations(request.user)
-        
-        # Add last message and unread count to each conversation
-        for conversation in conversations:
-            # Get the last message
-            conversation.last_message = conversation.messages.last()
-            
-            # Get unread count for this user in this conversation
-            conversation.unread_count = Message.objects.filter(
-                conversation=conversation
-            ).exclude(
-                sender=request.user
-            ).filter(
-                recipients__user=request.user,
-                recipients__is_read=False
-            ).count()
-            
-            # For direct conversations, get the other user
-            if conversation.conversation_type == 'direct':
-                conversation.other_user = ConversationService.get_other_user_in_direct_conversation(
-                    conversation, request.user
-                )
+        conversations = ConversationService.prefetch_inbox(
+            ConversationService.get_user_conversations(request.user), request.user
+        )
         
         active_conversation = None
         if conversation_id:
@@ -157,7 +174,13 @@ def messages_view(request, conversation_id=None):
             ).exists():
                 return JsonResponse({'error': 'Access denied'}, status=403)
                 
-            active_conversation = get_object_or_404(Conversation, id=conversation_id)
+            active_conversation = get_object_or_404(
+                Conversation.objects.prefetch_related(
+                    'members',
+                    Prefetch('messages', queryset=Message.objects.select_related('sender')),
+                ),
+                id=conversation_id,
+            )
             
             # Mark messages as read for this user in this conversation
             MessageRecipient.objects.filter(
@@ -167,9 +190,7 @@ def messages_view(request, conversation_id=None):
             ).update(is_read=True)
         
         # Get available users for new messages (based on permissions)
-        available_users = CustomUser.objects.exclude(id=request.user.id)
-        available_users = [user for user in available_users 
-                          if MessagePermissions.can_message_user(request.user, user)]
+        available_users = MessagePermissions.messageable_users(request.user)
         
         return render(request, 'communications/messages.html', {
             'conversations': conversations,
@@ -192,9 +213,7 @@ def messages_view(request, conversation_id=None):
 @login_required
 def new_message(request):
     """New page for starting conversations"""
-    available_users = CustomUser.objects.exclude(id=request.user.id)
-    available_users = [user for user in available_users 
-                      if MessagePermissions.can_message_user(request.user, user)]
+    available_users = MessagePermissions.messageable_users(request.user)
     
     if request.method == 'POST':
         conversation_type = request.POST.get('conversation_type')
@@ -284,25 +303,26 @@ def start_conversation(request):
 
 @login_required
 @require_http_methods(["POST"])
-def send_message(request, conversation_id):
+async def send_message(request, conversation_id):
     """Send a message in a conversation"""
+    user = await request.auser()
     try:
-        conversation = get_object_or_404(Conversation, id=conversation_id)
+        conversation = await aget_object_or_404(Conversation, id=conversation_id)
         
         # Check if user is member
-        if not ConversationMember.objects.filter(
+        if not await ConversationMember.objects.filter(
             conversation=conversation, 
-            user=request.user
-        ).exists():
+            user=user
+        ).aexists():
             return JsonResponse({'error': 'Not a member of this conversation'}, status=403)
         
         content = request.POST.get('content')
         if not content:
             return JsonResponse({'error': 'Message content is required'}, status=400)
         
-        message = Message.objects.create(
+        message = Message(
             conversation=conversation,
-            sender=request.user,
+            sender=user,
             content=content,
             message_type='text'
         )
@@ -311,15 +331,17 @@ def send_message(request, conversation_id):
         if 'attachment' in request.FILES:
             message.attachment = request.FILES['attachment']
             message.attachment_name = request.FILES['attachment'].name
-            message.save()
+        await message.asave()
         
         # Create recipient records for unread tracking for all other members
         other_members = ConversationMember.objects.filter(
             conversation=conversation
-        ).exclude(user=request.user)
+        ).exclude(user=user).values_list('user_id', flat=True)
         
-        for member in other_members:
-            MessageRecipient.objects.get_or_create(message=message, user=member.user)
+        await MessageRecipient.objects.abulk_create([
+            MessageRecipient(message=message, user_id=user_id)
+            async for user_id in other_members
+        ])
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return JsonResponse({
@@ -362,15 +384,16 @@ def leave_conversation(request, conversation_id):
         return JsonResponse({'error': str(e)}, status=400)
 
 @login_required
-def start_direct_message(request, user_id):
+async def start_direct_message(request, user_id):
     """Start a direct message with another user (API endpoint)"""
-    recipient = get_object_or_404(CustomUser, id=user_id)
+    user = await request.auser()
+    recipient = await aget_object_or_404(CustomUser, id=user_id)
     
-    if not MessagePermissions.can_message_user(request.user, recipient):
+    if not await MessagePermissions.acan_message_user(user, recipient):
         return JsonResponse({'error': 'Cannot message this user'}, status=403)
     
-    conversation, created = ConversationService.get_or_create_direct_conversation(
-        request.user, recipient
+    conversation, created = await ConversationService.aget_or_create_direct_conversation(
+        user, recipient
     )
     
     return JsonResponse({
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+
+    def ready(self):
+        # Dashboard installs last, so every versioned model is registered by now
+        from venture_manager.caching import connect_invalidation
+        from venture_manager.renditions import connect_renditions
+        connect_invalidation()
+        connect_renditions()
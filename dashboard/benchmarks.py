@@ -0,0 +1,194 @@
+# dashboard/benchmarks.py
+"""
+Query-count, wall-time and peak-memory benchmarks for the role dashboards and reports.
+
+Each scenario logs in as a seeded user of the right role and drives one view
+through the test client. Results are compared against a stored baseline
+(benchmark_baseline.json, one entry per seeder scale); a scenario regresses
+when it runs more queries than the baseline allows, or exceeds its time or
+memory ratio budget.
+"""
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from reports.models import Report
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'benchmark_baseline.json'
+
+# Scale used by run_benchmarks; the test suite checks query counts at scale 1
+DEFAULT_SCALE = 50
+
+METRICS = ('queries', 'time_ms', 'peak_kb')
+
+# queries: extra queries allowed over the baseline.
+# time_ms / peak_kb: allowed ratio over the baseline.
+DEFAULT_BUDGET = {
+    'queries': 0,
+    'time_ms': 2.0,
+    'peak_kb': 1.5,
+}
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class Scenario:
+    def __init__(self, name, role, url_name, method='get', data=None):
+        self.name = name
+        self.role = role
+        self.url_name = url_name
+        self.method = method
+        self.data = data or {}
+
+    def request(self, client):
+        return getattr(client, self.method)(reverse(self.url_name), self.data)
+
+
+REPORT_TYPES = [value for value, _ in Report.REPORT_TYPE_CHOICES]
+
+SCENARIOS = [
+    Scenario('manager_dashboard', 'manager', 'manager_dashboard'),
+    Scenario('founder_dashboard', 'founder', 'founder_dashboard'),
+    Scenario('team_dashboard', 'team_member', 'team_dashboard'),
+    Scenario('investor_dashboard', 'investor', 'investor_dashboard'),
+    Scenario('investments_investor_dashboard', 'investor', 'investments:investor_dashboard'),
+    Scenario('messages_view', 'investor', 'messages'),
+    Scenario('investor_reports', 'investor', 'investments:investor_reports'),
+] + [
+    Scenario(
+        f'manager_report_{report_type}', 'manager', 'reports:generate_manager_report',
+        method='post', data={'report_type': report_type, 'date_range': 'all_time'},
+    )
+    for report_type in REPORT_TYPES
+] + [
+    Scenario(
+        f'investor_report_{report_type}', 'investor', 'reports:generate_investor_report',
+        method='post', data={'report_type': report_type, 'date_range': 'all_time'},
+    )
+    for report_type in REPORT_TYPES
+]
+
+
+def get_budget():
+    budget = dict(DEFAULT_BUDGET)
+    budget.update(getattr(settings, 'BENCHMARK_BUDGET', {}))
+    return budget
+
+
+class BenchmarkRunner:
+    """
+    Runs scenarios against whatever data is in the database.
+    Pass metrics=('queries',) to skip the slower timing and tracemalloc passes.
+    """
+
+    def __init__(self, users_by_role, repeat=5, metrics=METRICS):
+        self.users_by_role = users_by_role
+        self.repeat = repeat
+        self.metrics = metrics
+        self.clients = {}
+
+    def client_for(self, role):
+        if role not in self.clients:
+            client = Client()
+            client.force_login(self.users_by_role[role])
+            self.clients[role] = client
+        return self.clients[role]
+
+    def _call(self, scenario, client):
+        response = scenario.request(client)
+        if response.status_code >= 400:
+            raise BenchmarkError(f'{scenario.name} returned HTTP {response.status_code}')
+        return response
+
+    def measure(self, scenario):
+        client = self.client_for(scenario.role)
+        # Warm-up: template compilation, URL resolver and content type caches
+        self._call(scenario, client)
+
+        with CaptureQueriesContext(connection) as queries:
+            self._call(scenario, client)
+        result = {'queries': len(queries)}
+
+        if 'time_ms' in self.metrics:
+            timings = []
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                self._call(scenario, client)
+                timings.append((time.perf_counter() - started) * 1000)
+            result['time_ms'] = round(statistics.median(timings), 2)
+
+        if 'peak_kb' in self.metrics:
+            gc.collect()
+            tracemalloc.start()
+            try:
+                self._call(scenario, client)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            result['peak_kb'] = round(peak / 1024, 1)
+        return result
+
+    def run(self, scenarios=SCENARIOS):
+        # N+1 origin capture walks the stack per query; keep it out of the numbers
+        with override_settings(NPLUSONE_DETECTION={'ENABLED': False}):
+            return {scenario.name: self.measure(scenario) for scenario in scenarios}
+
+
+def load_baseline(scale, path=BASELINE_PATH):
+    """Baseline results recorded at `scale`, or None"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open() as handle:
+        return json.load(handle).get(str(scale))
+
+
+def save_baseline(results, scale, path=BASELINE_PATH):
+    path = Path(path)
+    baselines = {}
+    if path.exists():
+        with path.open() as handle:
+            baselines = json.load(handle)
+    baselines[str(scale)] = results
+    with path.open('w') as handle:
+        json.dump(baselines, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def compare(results, baseline_results, budget=None):
+    """Return a list of human-readable regressions (empty when within budget)"""
+    budget = budget or get_budget()
+    regressions = []
+    for name, measured in results.items():
+        expected = baseline_results.get(name)
+        if expected is None:
+            continue
+        if 'queries' in measured and measured['queries'] > expected['queries'] + budget['queries']:
+            regressions.append(
+                f"{name}: {measured['queries']} queries (baseline {expected['queries']})"
+            )
+        for metric in ('time_ms', 'peak_kb'):
+            if metric not in measured or metric not in expected:
+                continue
+            allowed = expected[metric] * budget[metric]
+            if measured[metric] > allowed:
+                regressions.append(
+                    f'{name}: {metric} {measured[metric]} over budget '
+                    f'{allowed:.1f} (baseline {expected[metric]})'
+                )
+    return regressions
+
+
+def users_by_role(seeder):
+    return {role: users[0] for role, users in seeder.users.items()}
@@ -0,0 +1,32 @@
+# dashboard/management/commands/generate_renditions.py
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from venture_manager.renditions import RENDITION_FIELDS, generate, get_config, rendition_name
+
+
+class Command(BaseCommand):
+    help = "Generate the avatar and logo renditions that are missing, e.g. for images uploaded before they existed"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate renditions that already exist")
+
+    def handle(self, *args, **options):
+        last_size = list(get_config()['SIZES'])[-1]
+        generated = failed = 0
+        for label, field_name, crop in RENDITION_FIELDS:
+            model = apps.get_model(label)
+            storage = model._meta.get_field(field_name).storage
+            names = model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            for name in names.values_list(field_name, flat=True).distinct().iterator():
+                if not options['force'] and storage.exists(rendition_name(name, last_size, 'jpg')):
+                    continue
+                try:
+                    generate(name, crop, storage)
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"{name}: {exc}")
+                else:
+                    generated += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Generated renditions for {generated} image(s); {failed} failed."))
@@ -0,0 +1,74 @@
+# dashboard/management/commands/run_benchmarks.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from dashboard.benchmarks import (
+    SCENARIOS, BASELINE_PATH, DEFAULT_SCALE, BenchmarkRunner, compare, get_budget,
+    load_baseline, save_baseline, users_by_role,
+)
+from dashboard.seeding import PortfolioSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and benchmark every role dashboard and report "
+        "(query count, wall time, peak memory) against the stored baseline"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=DEFAULT_SCALE,
+                            help="Seeder scale; each scale has its own baseline")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per scenario")
+        parser.add_argument('--baseline', default=str(BASELINE_PATH))
+        parser.add_argument('--update-baseline', action='store_true',
+                            help="Record the results as the new baseline instead of comparing")
+        parser.add_argument('--only', nargs='*', help="Scenario names to run")
+        parser.add_argument('--query-budget', type=int, help="Extra queries allowed per scenario")
+        parser.add_argument('--time-budget', type=float, help="Allowed wall-time ratio over baseline")
+        parser.add_argument('--memory-budget', type=float, help="Allowed peak-memory ratio over baseline")
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        baseline = load_baseline(scale, options['baseline'])
+
+        scenarios = SCENARIOS
+        if options['only']:
+            scenarios = [scenario for scenario in SCENARIOS if scenario.name in options['only']]
+
+        budget = get_budget()
+        for option, metric in (('query_budget', 'queries'), ('time_budget', 'time_ms'),
+                               ('memory_budget', 'peak_kb')):
+            if options[option] is not None:
+                budget[metric] = options[option]
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seeder = PortfolioSeeder(scale=scale)
+            counts = seeder.run()
+            self.stdout.write(f"Seeded scale {scale}: " + ", ".join(
+                f"{total} {label}" for label, total in counts.items()
+            ))
+            results = BenchmarkRunner(users_by_role(seeder), repeat=options['repeat']).run(scenarios)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'scenario':40} {'queries':>8} {'time ms':>10} {'peak KB':>10}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:40} {result['queries']:>8} {result['time_ms']:>10} {result['peak_kb']:>10}"
+            )
+
+        if options['update_baseline'] or baseline is None:
+            save_baseline(results, scale, options['baseline'])
+            self.stdout.write(self.style.SUCCESS(f"Scale {scale} baseline written to {options['baseline']}"))
+            return
+
+        regressions = compare(results, baseline, budget)
+        if regressions:
+            for regression in regressions:
+                self.stderr.write(regression)
+            raise CommandError(f"{len(regressions)} benchmark regression(s)")
+        self.stdout.write(self.style.SUCCESS("All scenarios within budget."))
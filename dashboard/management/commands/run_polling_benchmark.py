@@ -0,0 +1,51 @@
+# dashboard/management/commands/run_polling_benchmark.py
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from dashboard.benchmarks import users_by_role
+from dashboard.polling import PollingBenchmark
+from dashboard.seeding import PortfolioSeeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and compare the throughput of the polled "
+        "notification endpoints on the WSGI (thread pool) and ASGI (event loop) paths"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, default=1, help="Seeder scale")
+        parser.add_argument('--clients', type=int, default=100, help="Concurrent polling clients")
+        parser.add_argument('--rounds', type=int, default=5, help="Polls per client and URL")
+        parser.add_argument('--workers', type=int, default=4,
+                            help="Threads serving the WSGI path, as in one sync worker process")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seeder = PortfolioSeeder(scale=options['scale'])
+            seeder.run()
+            benchmark = PollingBenchmark(
+                users_by_role(seeder)['investor'], clients=options['clients'],
+                rounds=options['rounds'], workers=options['workers'],
+            )
+            # Per-request log lines would dominate the output
+            with override_settings(REQUEST_INSTRUMENTATION={'ENABLED': False}):
+                results = benchmark.run()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f"{options['clients']} clients x {options['rounds']} rounds x {len(benchmark.urls)} URLs, "
+            f"WSGI on {options['workers']} threads"
+        )
+        self.stdout.write(f"{'path':6} {'requests':>9} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+        for path, result in results.items():
+            self.stdout.write(
+                f"{path:6} {result['requests']:>9} {result['req_per_s']:>9} {result['p50_ms']:>9} "
+                f"{result['p95_ms']:>9} {result['max_ms']:>9}"
+            )
+        self.stdout.write(self.style.SUCCESS("Polling benchmark complete."))
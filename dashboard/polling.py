@@ -0,0 +1,103 @@
+"""
+Throughput of the polled JSON endpoints on the WSGI and ASGI request paths.
+
+`clients` browsers poll together for `rounds` rounds; in each round every
+client sends one request to each of `url_names` at the same moment.
+
+- wsgi: Django's sync handler on a pool of `workers` threads - the most
+  requests a sync worker process serves at a time; the rest queue.
+- asgi: Django's async handler, every request a task on one event loop.
+
+Latency is measured from the moment a request is sent, so it includes time
+spent queueing for a worker. Requests go through the test clients' handlers,
+which run the full middleware stack in process without a server or sockets,
+so the numbers compare the two request paths, not two servers.
+"""
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from .benchmarks import BenchmarkError
+
+POLLED_URLS = ('notification_count_api', 'recent_notifications_api')
+
+
+def _summary(latencies, elapsed):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'req_per_s': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+        'max_ms': round(latencies[-1] * 1000, 2),
+    }
+
+
+def _check(response, url):
+    if response.status_code != 200:
+        raise BenchmarkError(f'{url} returned HTTP {response.status_code}')
+
+
+class PollingBenchmark:
+    def __init__(self, user, clients=100, rounds=5, workers=4, url_names=POLLED_URLS):
+        self.user = user
+        self.clients = clients
+        self.rounds = rounds
+        self.workers = workers
+        self.urls = [reverse(name) for name in url_names]
+        login = Client()
+        login.force_login(user)
+        self.cookies = login.cookies
+
+    def _requests(self):
+        return [url for _ in range(self.clients) for url in self.urls]
+
+    def run_wsgi(self):
+        def poll(url, sent):
+            client = Client()
+            client.cookies = self.cookies
+            _check(client.get(url), url)
+            return time.perf_counter() - sent
+
+        def close_connections():
+            connections.close_all()
+
+        latencies = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for _ in range(self.rounds):
+                sent = time.perf_counter()
+                latencies += pool.map(lambda url: poll(url, sent), self._requests())
+            # Worker threads each opened their own database connection
+            list(pool.map(lambda _: close_connections(), range(self.workers)))
+        return _summary(latencies, time.perf_counter() - started)
+
+    def run_asgi(self):
+        async def poll(url, sent):
+            client = AsyncClient()
+            client.cookies = self.cookies
+            _check(await client.get(url), url)
+            return time.perf_counter() - sent
+
+        async def main():
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(self.rounds):
+                sent = time.perf_counter()
+                latencies += await asyncio.gather(*(poll(url, sent) for url in self._requests()))
+            return _summary(latencies, time.perf_counter() - started)
+
+        return asyncio.run(main())
+
+    def run(self):
+        # Warm up both handlers: middleware chains, URL resolver, templates
+        for url in self.urls:
+            client = Client()
+            client.cookies = self.cookies
+            _check(client.get(url), url)
+        return {'wsgi': self.run_wsgi(), 'asgi': self.run_asgi()}
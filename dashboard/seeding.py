@@ -0,0 +1,357 @@
+# dashboard/seeding.py
+"""
+Synthetic portfolio data for benchmarks and local load testing.
+
+PortfolioSeeder builds a referentially consistent portfolio - users in every
+role, startups, projects, tasks, investments, funding applications,
+conversations with messages, and notifications. Rows are generated lazily and
+written with bulk_create one batch at a time, keeping only the parent ids that
+later tables need, so a million-row dataset fits in memory and loads in minutes.
+Data is deterministic for a given seed, so query counts are repeatable.
+"""
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import signals
+from django.utils import timezone
+
+from communications.models import (
+    Conversation, ConversationMember, Message, MessageRecipient, Notification,
+)
+from funding.models import FundingApplication
+from funding.services import FundingRollupService
+from investments.models import Investment
+from projects.models import Project
+from startups.models import Startup
+from tasks.models import Task
+from venture_manager.caching import VERSIONED_MODELS, invalidate
+
+CustomUser = get_user_model()
+
+SEED_PASSWORD = 'benchmark-pass'
+
+MODEL_SIGNALS = [
+    signals.pre_save, signals.post_save, signals.pre_delete, signals.post_delete, signals.m2m_changed,
+]
+
+
+@contextmanager
+def muted_signals():
+    """
+    Disconnect every model signal receiver for the duration of the block.
+    Notifications and funding rollups are derived data; the seeder writes or
+    rebuilds them itself instead of firing a receiver per row.
+    """
+    saved = [(signal, signal.receivers) for signal in MODEL_SIGNALS]
+    try:
+        for signal in MODEL_SIGNALS:
+            signal.receivers = []
+            signal.sender_receivers_cache.clear()
+        yield
+    finally:
+        for signal, receivers in saved:
+            signal.receivers = receivers
+            signal.sender_receivers_cache.clear()
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create write created_at/updated_at values instead of now()"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    try:
+        for field in fields:
+            field.auto_now = field.auto_now_add = False
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _choice_values(choices):
+    return [value for value, _ in choices]
+
+
+class PortfolioSeeder:
+    """
+    Row counts are per unit of `scale`; scale=1 is a small but complete portfolio
+    (about 1,400 rows); scale=1000 is about 1.4 million rows.
+    """
+    PER_SCALE = {
+        'managers': 1,
+        'founders': 10,
+        'team_members': 20,
+        'investors': 10,
+        'startups': 20,
+        'investments': 60,
+        'funding_applications': 30,
+        'conversations': 20,
+        'notifications': 100,
+    }
+    PROJECTS_PER_STARTUP = 3
+    TASKS_PER_PROJECT = 5
+    MESSAGES_PER_CONVERSATION = 10
+    HISTORY_DAYS = 730
+
+    def __init__(self, scale=1, seed=42, batch_size=2000, prefix='seed'):
+        self.scale = scale
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self.now = timezone.now()
+        self.today = timezone.localdate(self.now)
+        self.counts = {}
+
+    def count(self, key):
+        return self.PER_SCALE[key] * self.scale
+
+    def _bulk(self, model, rows, keep=False):
+        """bulk_create `rows` (any iterable) batch by batch; return the created objects if `keep`"""
+        rows = iter(rows)
+        created = []
+        label = model._meta.verbose_name_plural
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            model.objects.bulk_create(batch)
+            self.counts[label] = self.counts.get(label, 0) + len(batch)
+            if keep:
+                created.extend(batch)
+        return created
+
+    def _past_date(self, max_days):
+        return self.today - timedelta(days=self.random.randint(0, max_days))
+
+    def _past_datetime(self, max_days=None):
+        seconds = self.random.randint(0, (max_days or self.HISTORY_DAYS) * 86400)
+        return self.now - timedelta(seconds=seconds)
+
+    def _money(self, low, high):
+        return Decimal(self.random.randint(low, high))
+
+    def _stamped(self, obj, created_at=None):
+        obj.created_at = created_at or self._past_datetime()
+        if hasattr(obj, 'updated_at'):
+            obj.updated_at = obj.created_at
+        return obj
+
+    def run(self):
+        timestamped = [
+            Startup, Project, Task, Investment, FundingApplication, Conversation,
+            ConversationMember, Message, Notification,
+        ]
+        with muted_signals(), explicit_timestamps(*timestamped), transaction.atomic():
+            self.users = self.create_users()
+            self.startups = self.create_startups()
+            self.project_ids = self.create_projects()
+            self.create_tasks()
+            self.create_investments()
+            self.create_funding_applications()
+            self.create_conversations()
+            self.create_notifications()
+            FundingRollupService.rebuild()
+        # Signals were muted, so cached_for() values were never invalidated
+        invalidate(*(apps.get_model(label) for label in VERSIONED_MODELS))
+        return self.counts
+
+    def create_users(self):
+        password = make_password(SEED_PASSWORD)
+        roles = [
+            ('manager', self.count('managers')),
+            ('founder', self.count('founders')),
+            ('team_member', self.count('team_members')),
+            ('investor', self.count('investors')),
+        ]
+        users = (
+            CustomUser(
+                username=f'{self.prefix}-{role}-{i}', email=f'{self.prefix}-{role}-{i}@example.com',
+                password=password, first_name=role.replace('_', ' ').title(), last_name=str(i),
+                role=role, email_verified=True, is_active=True,
+                date_joined=self._past_datetime(),
+            )
+            for role, total in roles
+            for i in range(total)
+        )
+        by_role = {}
+        for user in self._bulk(CustomUser, users, keep=True):
+            by_role.setdefault(user.role, []).append(user)
+        return by_role
+
+    def create_startups(self):
+        industries = _choice_values(Startup.INDUSTRY_CHOICES)
+        stages = _choice_values(Startup.STAGE_CHOICES)
+        founders = self.users['founder']
+        startups = (
+            self._stamped(Startup(
+                name=f'{self.prefix.title()} Startup {i}',
+                description='Synthetic startup',
+                industry=self.random.choice(industries),
+                stage=self.random.choice(stages),
+                founding_date=self._past_date(3650),
+                location='Lagos',
+                team_size=self.random.randint(1, 80),
+                market='B2B',
+                monthly_revenue=self._money(0, 500_000),
+                valuation=self._money(100_000, 50_000_000),
+                founder=founders[i % len(founders)],
+            ))
+            for i in range(self.count('startups'))
+        )
+        # Later tables only need (id, founder_id, name)
+        return [
+            (startup.pk, startup.founder_id, startup.name)
+            for startup in self._bulk(Startup, startups, keep=True)
+        ]
+
+    def create_projects(self):
+        statuses = _choice_values(Project.STATUS_CHOICES)
+        priorities = _choice_values(Project.PRIORITY_CHOICES)
+        projects = (
+            self._stamped(Project(
+                name=f'{name} Project {i}',
+                description='Synthetic project',
+                startup_id=startup_id,
+                status=self.random.choice(statuses),
+                priority=self.random.choice(priorities),
+                budget=self._money(1_000, 250_000),
+                progress=self.random.randint(0, 100),
+                start_date=self._past_date(365),
+                due_date=self.today + timedelta(days=self.random.randint(-60, 180)),
+                created_by_id=founder_id,
+            ))
+            for startup_id, founder_id, name in self.startups
+            for i in range(self.PROJECTS_PER_STARTUP)
+        )
+        return [project.pk for project in self._bulk(Project, projects, keep=True)]
+
+    def create_tasks(self):
+        statuses = _choice_values(Task.STATUS_CHOICES)
+        priorities = _choice_values(Task.PRIORITY_CHOICES)
+        team_ids = [user.pk for user in self.users['team_member']]
+        self._bulk(Task, (
+            self._stamped(Task(
+                title=f'Task {project_id}-{i}',
+                description='Synthetic task',
+                project_id=project_id,
+                status=self.random.choice(statuses),
+                priority=self.random.choice(priorities),
+                progress=self.random.randint(0, 100),
+                assigned_to_id=self.random.choice(team_ids),
+                due_date=self.today + timedelta(days=self.random.randint(-30, 60)),
+            ))
+            for project_id in self.project_ids
+            for i in range(self.TASKS_PER_PROJECT)
+        ))
+
+    def _investment(self, investor_id, rounds, statuses):
+        amount = self._money(10_000, 2_000_000)
+        invested_on = self._past_date(2000)
+        return self._stamped(Investment(
+            investor_id=investor_id,
+            startup_id=self.random.choice(self.startups)[0],
+            amount=amount,
+            equity=round(self.random.uniform(0.5, 20), 2),
+            valuation=amount * 10,
+            round=self.random.choice(rounds),
+            investment_date=invested_on,
+            status=self.random.choice(statuses),
+            current_valuation=amount * self.random.randint(0, 30) if self.random.random() < 0.8 else None,
+        ), created_at=timezone.make_aware(datetime.combine(invested_on, time(12))))
+
+    def create_investments(self):
+        rounds = _choice_values(Investment.ROUND_CHOICES)
+        statuses = _choice_values(Investment.STATUS_CHOICES)
+        investor_ids = [user.pk for user in self.users['investor']]
+        self._bulk(Investment, (
+            self._investment(investor_ids[i % len(investor_ids)], rounds, statuses)
+            for i in range(self.count('investments'))
+        ))
+
+    def create_funding_applications(self):
+        rounds = _choice_values(Investment.ROUND_CHOICES)
+        statuses = _choice_values(FundingApplication.STATUS_CHOICES)
+        self._bulk(FundingApplication, (
+            self._stamped(FundingApplication(
+                startup_id=self.random.choice(self.startups)[0],
+                funding_round=self.random.choice(rounds),
+                amount=self._money(50_000, 5_000_000),
+                equity_offered=round(self.random.uniform(1, 25), 2),
+                pitch='Synthetic pitch',
+                use_of_funds='Growth',
+                milestones='Launch',
+                status=self.random.choice(statuses),
+            ))
+            for _ in range(self.count('funding_applications'))
+        ))
+
+    def create_conversations(self):
+        people = [user.pk for users in self.users.values() for user in users]
+        member_sets = [
+            self.random.sample(people, 2 if i % 2 == 0 else min(5, len(people)))
+            for i in range(self.count('conversations'))
+        ]
+        conversations = self._bulk(Conversation, (
+            self._stamped(Conversation(
+                title=f'{self.prefix.title()} Conversation {i}',
+                conversation_type='direct' if len(members) == 2 else 'venture',
+                created_by_id=members[0],
+            ))
+            for i, members in enumerate(member_sets)
+        ), keep=True)
+        conversations = [(conversation.pk, conversation.created_at) for conversation in conversations]
+
+        self._bulk(ConversationMember, (
+            ConversationMember(
+                conversation_id=conversation_id, user_id=user_id,
+                is_admin=user_id == members[0], joined_at=created_at,
+            )
+            for (conversation_id, created_at), members in zip(conversations, member_sets)
+            for user_id in members
+        ))
+
+        # Messages are written a batch at a time, each followed by its recipients
+        messages = (
+            (self._stamped(Message(
+                conversation_id=conversation_id,
+                sender_id=self.random.choice(members),
+                content=f'Synthetic message {i}',
+            ), created_at=created_at + timedelta(minutes=i)), members)
+            for (conversation_id, created_at), members in zip(conversations, member_sets)
+            for i in range(self.MESSAGES_PER_CONVERSATION)
+        )
+        while True:
+            batch = list(islice(messages, self.batch_size))
+            if not batch:
+                break
+            self._bulk(Message, (message for message, _ in batch))
+            self._bulk(MessageRecipient, (
+                MessageRecipient(message_id=message.pk, user_id=user_id, is_read=self.random.random() < 0.6)
+                for message, members in batch
+                for user_id in members
+                if user_id != message.sender_id
+            ))
+
+    def create_notifications(self):
+        types = _choice_values(Notification.NOTIFICATION_TYPES)
+        people = [user.pk for users in self.users.values() for user in users]
+        self._bulk(Notification, (
+            self._stamped(Notification(
+                user_id=people[i % len(people)],
+                title=f'Synthetic notification {i}',
+                message='Something happened in the portfolio.',
+                notification_type=self.random.choice(types),
+                is_read=self.random.random() < 0.5,
+            ), created_at=self._past_datetime(90))
+            for i in range(self.count('notifications'))
+        ))
@@ -0,0 +1,66 @@
+# dashboard/templatetags/fragments.py
+from django import template
+from django.template.base import token_kwargs
+
+from venture_manager.caching import fragment_cache, fragment_name, get_fragment_config
+
+register = template.Library()
+
+
+class CachedFragmentNode(template.Node):
+    def __init__(self, nodelist, name, vary_on, models, timeout):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+        self.models = models
+        self.timeout = timeout
+
+    def render(self, context):
+        request = context.get('request')
+        user = getattr(request, 'user', None) or context.get('user')
+        if not get_fragment_config()['ENABLED'] or user is None or not user.is_authenticated:
+            return self.nodelist.render(context)
+
+        models = self.models.resolve(context) if self.models else ''
+        if isinstance(models, str):
+            models = models.split()
+        timeout = self.timeout.resolve(context) if self.timeout else None
+        cache = fragment_cache(models, user, timeout=timeout)
+        name = fragment_name(self.name.resolve(context), [value.resolve(context) for value in self.vary_on])
+
+        html = cache.get(name)
+        if html is None:
+            html = self.nodelist.render(context)
+            cache.set(name, html)
+        return html
+
+
+@register.tag
+def cachedfragment(parser, token):
+    """
+    Cache the enclosed HTML per user until one of `models` changes or the
+    timeout passes; further arguments are values the HTML also depends on:
+
+        {% cachedfragment 'recent-projects' status models='projects.Project startups.Startup' %}
+            ...
+        {% endcachedfragment %}
+
+    Each distinct value is another entry per user, so vary on a few known
+    values, never on something like request.path. Only use it around markup
+    without forms: a cached CSRF token goes stale.
+    """
+    bits = token.split_contents()[1:]
+    if not bits:
+        raise template.TemplateSyntaxError("'cachedfragment' takes a fragment name")
+    nodelist = parser.parse(('endcachedfragment',))
+    parser.delete_first_token()
+
+    name = parser.compile_filter(bits[0])
+    vary_on = []
+    remaining = bits[1:]
+    while remaining and '=' not in remaining[0]:
+        vary_on.append(parser.compile_filter(remaining.pop(0)))
+    kwargs = token_kwargs(remaining, parser)
+    if remaining or set(kwargs) - {'models', 'timeout'}:
+        raise template.TemplateSyntaxError("'cachedfragment' only takes models= and timeout= keyword arguments")
+    return CachedFragmentNode(nodelist, name, vary_on, kwargs.get('models'), kwargs.get('timeout'))
@@ -0,0 +1,35 @@
+# dashboard/templatetags/renditions.py
+from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from venture_manager import renditions
+
+register = template.Library()
+
+
+@register.simple_tag
+def rendition(fieldfile, size, **attrs):
+    """
+    <picture> with the WebP and JPEG renditions of an avatar or logo - or an
+    <img> of the original until they exist. Keyword arguments become
+    attributes of the <img>: {% rendition user.avatar 'xs' alt=user.username width=32 %}
+    """
+    if not fieldfile:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    if not renditions.is_ready(fieldfile):
+        return format_html('<img src="{}"{}>', fieldfile.url, flatatt(attrs))
+    return format_html(
+        '<picture><source srcset="{}" type="image/webp"><img src="{}"{}></picture>',
+        renditions.rendition_url(fieldfile, size, 'webp'),
+        renditions.rendition_url(fieldfile, size, 'jpg'),
+        flatatt(attrs),
+    )
+
+
+@register.filter
+def rendition_url(fieldfile, size):
+    """URL of the JPEG rendition, for an <img> whose src scripts replace"""
+    return renditions.rendition_url(fieldfile, size)
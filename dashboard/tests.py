@@ -1,3 +1,535 @@
-from django.test import TestCase
+import io
+import json
+import shutil
+import tempfile
+from io import StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncMonth
+from django.template import Context, Engine, Template
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from communications.models import Message, MessageRecipient, Notification
+from funding.models import FundingApplication
+from funding.services import FundingRollupService
+from investments.models import Investment
+from projects.models import Project
+from startups.models import Startup
+from tasks.models import Task
+from venture_manager.caching import cached_for, check_shared_cache, invalidate, model_versions
+from venture_manager.instrumentation import (
+    NPlusOneError, QueryRecorder, detect_n_plus_one, fingerprint,
+)
+from venture_manager.renditions import rendition_name
+from venture_manager.staticfiles import StaticFilesMiddleware, inline_assets, link_inline_assets
+from .benchmarks import SCENARIOS, BenchmarkRunner, compare, load_baseline, users_by_role
+from .seeding import PortfolioSeeder
+
+User = get_user_model()
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite-specific')
+class QueryPlanTests(TestCase):
+    """Hot dashboard and badge queries must search an index, not scan or sort"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="user", email="user@example.com", password="testpass")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index_name}', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_notification_queries(self):
+        self.assertUsesIndex(Notification.objects.filter(user=self.user, is_read=False), 'notif_user_unread_idx')
+        self.assertUsesIndex(
+            Notification.objects.filter(user=self.user).order_by('-created_at', '-pk')[:25],
+            'notif_user_created_idx',
+        )
+
+    def test_message_queries(self):
+        self.assertUsesIndex(MessageRecipient.objects.filter(user=self.user, is_read=False), 'msgrecipient_unread_idx')
+        self.assertUsesIndex(Message.objects.filter(conversation_id=1), 'message_conv_created_idx')
+
+    def test_dashboard_queries(self):
+        self.assertUsesIndex(
+            Task.objects.filter(assigned_to=self.user, status='in_progress').order_by('due_date'),
+            'task_assignee_status_due_idx',
+        )
+        self.assertUsesIndex(Project.objects.filter(startup_id=1, status='completed'), 'project_startup_status_idx')
+        self.assertUsesIndex(Investment.objects.filter(investor=self.user, status='active'), 'invest_investor_status_idx')
+        self.assertUsesIndex(
+            FundingApplication.objects.filter(status='submitted').order_by('-created_at'),
+            'fundingapp_status_created_idx',
+        )
+
+
+class BenchmarkSuiteTests(TestCase):
+    """Query counts for every dashboard and report must stay within the stored scale-1 baseline"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeder = PortfolioSeeder(scale=1)
+        cls.seeder.run()
+
+    def test_query_counts_within_baseline(self):
+        baseline = load_baseline(1)
+        self.assertIsNotNone(baseline, 'Record one with: manage.py run_benchmarks --scale 1 --update-baseline')
+        results = BenchmarkRunner(users_by_role(self.seeder), metrics=('queries',)).run()
+        self.assertEqual(set(results), {scenario.name for scenario in SCENARIOS})
+        self.assertEqual(compare(results, baseline), [])
+
+    def test_compare_flags_regressions(self):
+        baseline = {'view': {'queries': 10, 'time_ms': 10.0, 'peak_kb': 100.0}}
+        budget = {'queries': 2, 'time_ms': 1.5, 'peak_kb': 1.5}
+        self.assertEqual(compare({'view': {'queries': 12, 'time_ms': 15.0, 'peak_kb': 150.0}}, baseline, budget), [])
+        regressions = compare({'view': {'queries': 13, 'time_ms': 16.0, 'peak_kb': 100.0}}, baseline, budget)
+        self.assertEqual(len(regressions), 2)
+
+
+class BenchmarkScalingTests(TestCase):
+    """Query counts must not grow with the data, which the baseline budget alone can miss"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeder = PortfolioSeeder(scale=2)
+        cls.seeder.run()
+
+    def test_query_counts_match_scale_one(self):
+        baseline = load_baseline(1)
+        self.assertIsNotNone(baseline, 'Record one with: manage.py run_benchmarks --scale 1 --update-baseline')
+        results = BenchmarkRunner(users_by_role(self.seeder), metrics=('queries',)).run()
+        self.assertEqual(
+            {name: metrics['queries'] for name, metrics in results.items()},
+            {name: metrics['queries'] for name, metrics in baseline.items()},
+        )
+
+
+class SeedPortfolioCommandTests(TestCase):
+    def test_seeds_consistent_data_without_firing_signals(self):
+        out = StringIO()
+        call_command('seed_portfolio', scale=1, prefix='demo', batch_size=50, stdout=out)
+
+        counts = PortfolioSeeder.PER_SCALE
+        self.assertEqual(User.objects.filter(username__startswith='demo-').count(), 41)
+        self.assertEqual(Task.objects.count(), counts['startups'] * 3 * 5)
+        # Signal receivers would have added a notification per saved object
+        self.assertEqual(Notification.objects.count(), counts['notifications'])
+        self.assertEqual(FundingRollupService.summary()['total_applications'], counts['funding_applications'])
+        self.assertFalse(
+            MessageRecipient.objects.filter(user_id=F('message__sender_id')).exists()
+        )
+        # Timestamps are spread over the history window rather than all being now()
+        self.assertGreater(
+            FundingApplication.objects.aggregate(months=Count(TruncMonth('created_at'), distinct=True))['months'], 1
+        )
+
+        with self.assertRaises(CommandError):
+            call_command('seed_portfolio', prefix='demo', stdout=out)
+
+
+class RequestInstrumentationTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username="manager", email="manager@example.com", password="testpass", role="manager"
+        )
+        self.client.force_login(self.manager)
+
+    def test_server_timing_header_reports_queries(self):
+        response = self.client.get(reverse('manager_dashboard'))
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+, total;dur=[\d.]+')
+
+    def test_slow_request_and_query_logging(self):
+        config = {'SLOW_REQUEST_MS': 0, 'SLOW_QUERY_MS': 0}
+        with self.settings(REQUEST_INSTRUMENTATION=config), \
+                self.assertLogs('venture_manager.slow', 'WARNING') as logs:
+            self.client.get(reverse('manager_dashboard'))
+        events = [json.loads(line.split(':', 2)[2]) for line in logs.output]
+        slow_request = next(event for event in events if event['event'] == 'slow_request')
+        self.assertEqual(slow_request['view'], 'manager_dashboard')
+        self.assertGreater(slow_request['queries'], 0)
+        self.assertTrue(any(event['event'] == 'slow_query' for event in events))
+
+    def test_fingerprint_groups_repeated_statements(self):
+        recorder = QueryRecorder()
+        with recorder.capture():
+            for pk in (1, 2, 3):
+                list(Task.objects.filter(pk=pk))
+            list(Task.objects.filter(pk__in=[1, 2]))
+            list(Task.objects.filter(pk__in=[1, 2, 3, 4]))
+        self.assertEqual(
+            sorted(count for _, count in recorder.duplicates()), [2, 3]
+        )
+        self.assertEqual(fingerprint("SELECT * FROM t WHERE a = 'x' AND b = 10"), 'SELECT * FROM t WHERE a = ? AND b = ?')
+
+
+class NPlusOneDetectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        PortfolioSeeder(scale=1).run()
+
+    def test_flags_repeated_fingerprint_with_code_location(self):
+        with self.assertRaises(NPlusOneError) as raised:
+            with detect_n_plus_one(threshold=5):
+                for task in Task.objects.all()[:10]:
+                    task.project.name
+        problem = raised.exception.problems[0]
+        self.assertEqual(problem['count'], 10)
+        self.assertIn('dashboard/tests.py', problem['locations'][0]['code'])
+
+    def test_reports_template_line(self):
+        engine = Engine(loaders=[('django.template.loaders.locmem.Loader', {
+            'tasks.html': '<ul>\n{% for task in tasks %}\n<li>{{ task.project.name }}</li>\n{% endfor %}\n</ul>',
+        })])
+        with detect_n_plus_one(threshold=5, raise_error=False) as recorder:
+            engine.get_template('tasks.html').render(Context({'tasks': Task.objects.all()[:10]}))
+        self.assertEqual(recorder.problems[0]['locations'][0]['template'], 'tasks.html:3')
+
+    def test_select_related_passes(self):
+        with detect_n_plus_one(threshold=5):
+            for task in Task.objects.select_related('project')[:10]:
+                task.project.name
+
+    def test_middleware_raises_when_configured(self):
+        self.client.force_login(User.objects.filter(role='manager').first())
+        with self.settings(NPLUSONE_DETECTION={'ENABLED': True, 'THRESHOLD': 1, 'RAISE': True}):
+            with self.assertRaises(NPlusOneError) as raised:
+                self.client.get(reverse('manager_dashboard'))
+        self.assertEqual(raised.exception.view, 'manager_dashboard')
+
+
+class CachedForTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return Startup.objects.count()
+
+    def make_startup(self, name):
+        return Startup.objects.create(
+            name=name, description="Test", industry="tech", stage="seed",
+            founding_date="2020-01-01", location="Lagos", market="B2B", founder=self.founder,
+        )
+
+    def test_hit_until_model_changes(self):
+        self.assertEqual(cached_for(Startup, 'manager').get_or_set('count', self.compute), 0)
+        self.assertEqual(cached_for(Startup, 'manager').get_or_set('count', self.compute), 0)
+        self.assertEqual(self.calls, 1)
+
+        startup = self.make_startup("GreenSpark")
+        self.assertEqual(cached_for(Startup, 'manager').get_or_set('count', self.compute), 1)
+        startup.delete()
+        self.assertEqual(cached_for(Startup, 'manager').get_or_set('count', self.compute), 0)
+        self.assertEqual(self.calls, 3)
+
+    def test_scopes_and_unrelated_models_are_independent(self):
+        cached_for(Startup, 'user:1').set('value', 'one')
+        cached_for([Startup, Investment], 'user:2').set('value', 'two')
+        self.assertEqual(cached_for(Startup, 'user:1').get('value'), 'one')
+        self.assertIsNone(cached_for(Startup, 'user:3').get('value'))
+
+        invalidate(Investment)
+        self.assertEqual(cached_for(Startup, 'user:1').get('value'), 'one')
+        self.assertIsNone(cached_for([Startup, Investment], 'user:2').get('value'))
+
+    def test_lost_version_never_revives_old_entries(self):
+        old = cached_for(Startup)
+        old.set('value', 'stale')
+        cache.delete('model-version:startups.startup')
+        self.assertIsNone(cached_for(Startup).get('value'))
+        self.assertNotEqual(old.prefix, cached_for(Startup).prefix)
+
+    def test_deploy_check_requires_a_shared_cache(self):
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        database = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}}
+        with override_settings(DEBUG=False, CACHES=locmem):
+            self.assertEqual([error.id for error in check_shared_cache()], ['venture_manager.E001'])
+        with override_settings(DEBUG=False, CACHES=database):
+            self.assertEqual(check_shared_cache(), [])
+        with override_settings(DEBUG=True, CACHES=locmem):
+            self.assertEqual(check_shared_cache(), [])
+
+
+class CachedForTransactionTests(TransactionTestCase):
+    def test_value_computed_before_commit_is_not_served_after(self):
+        cache.clear()
+        founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        with transaction.atomic():
+            Startup.objects.create(
+                name="GreenSpark", description="Test", industry="tech", stage="seed",
+                founding_date="2020-01-01", location="Lagos", market="B2B", founder=founder,
+            )
+            # Another request caching what it saw before the commit
+            cached_for(Startup).set('count', 0)
+            version = model_versions([Startup])[0]
+        self.assertGreater(model_versions([Startup])[0], version)
+        self.assertIsNone(cached_for(Startup).get('count'))
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = User.objects.create_user(
+            username="manager", email="manager@example.com", password="testpass", role="manager"
+        )
+        self.founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        self.renders = 0
+
+    def render(self, user, path='/dashboard/'):
+        def count():
+            self.renders += 1
+            return Startup.objects.count()
+
+        template = Template(
+            "{% load fragments %}"
+            "{% cachedfragment 'startups' path models='startups.Startup' %}{{ count }}{% endcachedfragment %}"
+        )
+        return template.render(Context({'user': user, 'path': path, 'count': count}))
+
+    def make_startup(self, name):
+        return Startup.objects.create(
+            name=name, description="Test", industry="tech", stage="seed",
+            founding_date="2020-01-01", location="Lagos", market="B2B", founder=self.founder,
+        )
+
+    def test_fragment_is_reused_until_its_models_change(self):
+        self.assertEqual(self.render(self.manager), '0')
+        self.assertEqual(self.render(self.manager), '0')
+        self.assertEqual(self.renders, 1)
+
+        self.make_startup("GreenSpark")
+        self.assertEqual(self.render(self.manager), '1')
+        self.assertEqual(self.renders, 2)
+
+    def test_fragments_are_per_user_and_per_vary_value(self):
+        self.render(self.manager)
+        self.render(self.founder)
+        self.render(self.manager, path='/manager/startups/')
+        self.assertEqual(self.renders, 3)
+
+        self.render(AnonymousUser())
+        self.render(AnonymousUser())
+        self.assertEqual(self.renders, 5)
+
+    def test_dashboard_shows_changes_with_cached_fragments(self):
+        self.client.force_login(self.manager)
+        with CaptureQueriesContext(connection) as cold:
+            self.client.get(reverse('manager_dashboard'))
+        with CaptureQueriesContext(connection) as warm:
+            self.client.get(reverse('manager_dashboard'))
+        self.assertLess(len(warm), len(cold))
+
+        self.make_startup("GreenSpark")
+        self.assertContains(self.client.get(reverse('manager_dashboard')), "GreenSpark")
+
+
+@override_settings(IMAGE_RENDITIONS={'ASYNC': False})
+class ImageRenditionTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        cache.clear()
+        self.founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+
+    def upload(self, name, size, mode='RGBA'):
+        buffer = io.BytesIO()
+        Image.new(mode, size, (200, 30, 30, 128) if mode == 'RGBA' else (200, 30, 30)).save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def create_startup(self, **kwargs):
+        return Startup.objects.create(
+            name="GreenSpark", description="Test", industry="tech", stage="seed", founding_date="2020-01-01",
+            location="Lagos", market="B2B", founder=self.founder, **kwargs,
+        )
+
+    def test_renditions_are_generated_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            startup = self.create_startup(logo=self.upload('logo.png', (2000, 1000)))
+        # Nothing is resized inside the saving request's transaction
+        self.assertFalse(default_storage.exists(rendition_name(startup.logo.name, 'md', 'jpg')))
+        for callback in callbacks:
+            callback()
+
+        for size, expected in (('xs', (64, 32)), ('md', (480, 240))):
+            for ext in ('webp', 'jpg'):
+                with default_storage.open(rendition_name(startup.logo.name, size, ext)) as f:
+                    self.assertEqual(Image.open(f).size, expected)
+        self.assertLess(default_storage.size(rendition_name(startup.logo.name, 'xs', 'webp')), 2000)
+
+    def test_avatars_are_cropped_square(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.founder.avatar = self.upload('me.png', (300, 200), mode='RGB')
+            self.founder.save()
+        with default_storage.open(rendition_name(self.founder.avatar.name, 'sm', 'jpg')) as f:
+            self.assertEqual(Image.open(f).size, (160, 160))
+
+        # Saving again without a new upload generates nothing
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.founder.save()
+        self.assertEqual(callbacks, [])
+
+    def test_tag_uses_the_original_until_renditions_exist(self):
+        template = Template("{% load renditions %}{% rendition startup.logo 'xs' alt=startup.name width=32 %}")
+        with self.captureOnCommitCallbacks() as callbacks:
+            startup = self.create_startup(logo=self.upload('logo.png', (400, 400)))
+        html = template.render(Context({'startup': startup}))
+        self.assertIn(f'src="{startup.logo.url}"', html)
+        self.assertNotIn('<picture>', html)
+
+        for callback in callbacks:
+            callback()
+        html = template.render(Context({'startup': startup}))
+        webp = reverse('rendition', args=[rendition_name(startup.logo.name, 'xs', 'webp')])
+        self.assertIn(f'<source srcset="{webp}" type="image/webp">', html)
+        self.assertIn('alt="GreenSpark"', html)
+        self.assertIn('loading="lazy"', html)
+
+    def test_rendition_view_sets_long_lived_cache_headers(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            startup = self.create_startup(logo=self.upload('logo.png', (400, 400)))
+        response = self.client.get(reverse('rendition', args=[rendition_name(startup.logo.name, 'sm', 'webp')]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+        # Only renditions are served, not originals or anything else in storage
+        for name in (startup.logo.name, 'startups/logos/../../secret.sm.jpg', 'startups/logos/missing.png.sm.jpg'):
+            self.assertEqual(self.client.get(reverse('rendition', args=[name])).status_code, 404)
+
+    def test_rendition_view_does_not_serve_other_uploads(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_startup(logo=self.upload('logo.png', (400, 400)))
+        default_storage.save('documents/report.pdf', ContentFile(b'private'))
+        # Rendition-shaped names outside the logo and avatar directories, or without an original
+        for name in ('message_attachments/payroll.sm.jpg', 'documents/report.pdf.sm.jpg', 'startups/logos/orphan.sm.jpg'):
+            default_storage.save(name, ContentFile(b'private'))
+            self.assertEqual(self.client.get(reverse('rendition', args=[name])).status_code, 404)
+
+    def test_command_backfills_missing_renditions(self):
+        startup = self.create_startup(logo=self.upload('logo.png', (400, 400)))
+        out = StringIO()
+        call_command('generate_renditions', stdout=out)
+        self.assertIn('Generated renditions for 1 image(s)', out.getvalue())
+        self.assertTrue(default_storage.exists(rendition_name(startup.logo.name, 'md', 'webp')))
+        call_command('generate_renditions', stdout=out)
+        self.assertIn('Generated renditions for 0 image(s)', out.getvalue())
+
+
+class StaticPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.build_dir = tempfile.mkdtemp()
+        cls.settings = override_settings(
+            STATIC_ROOT=cls.static_root, STATIC_PIPELINE={'BUILD_DIR': cls.build_dir},
+        )
+        cls.settings.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.static_root, ignore_errors=True)
+        shutil.rmtree(cls.build_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_only_large_plain_blocks_are_extracted(self):
+        body = 'body { color: red; }' * 40
+        source = (
+            f'<style>{body}</style>'
+            '<style>p { margin: 0; }</style>'
+            f'<script>var url = "{{{{ url }}}}"; {body}</script>'
+            f'<script type="module">{body}</script>'
+        )
+        assets = list(inline_assets(source))
+        self.assertEqual(len(assets), 1)
+        _, name, content = assets[0]
+        self.assertRegex(name, r'^inline/[0-9a-f]{16}\.css$')
+        self.assertEqual(content, body)
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        hashed = staticfiles_storage.stored_name('css/styles.css')
+        self.assertRegex(hashed, r'^css/styles\.[0-9a-f]{12}\.css$')
+        self.assertTrue(staticfiles_storage.exists(hashed + '.gz'))
+        self.assertLess(staticfiles_storage.size(hashed + '.gz'), staticfiles_storage.size(hashed))
+        # Images are already compressed
+        self.assertFalse(staticfiles_storage.exists(staticfiles_storage.stored_name('images/favicon.png') + '.gz'))
+
+    def test_loaders_link_extracted_blocks(self):
+        engine = Engine(
+            dirs=[settings.BASE_DIR / 'templates'],
+            loaders=['venture_manager.staticfiles.FilesystemLoader'],
+            libraries={'static': 'django.templatetags.static'},
+        )
+        source = engine.get_template('base.html').source
+        self.assertIn('<link rel="stylesheet" href="/static/inline/', source)
+        self.assertNotEqual(source, open(settings.BASE_DIR / 'templates' / 'base.html', encoding='utf-8').read())
+        # Emails stay self-contained
+        email = '<style>' + 'p { color: red; }' * 40 + '</style>'
+        self.assertEqual(link_inline_assets(email, 'emails/welcome.html'), email)
+
+    def test_middleware_serves_precompressed_immutable_files(self):
+        hashed = staticfiles_storage.stored_name('css/styles.css')
+        response = self.client.get(f'/static/{hashed}', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(b''.join(response.streaming_content), staticfiles_storage.open(hashed + '.gz').read())
+
+        response = self.client.get('/static/css/styles.css', HTTP_ACCEPT_ENCODING='identity')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+        self.assertEqual(
+            self.client.get(
+                '/static/css/styles.css', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+            ).status_code,
+            304,
+        )
+        self.assertEqual(self.client.get('/static/../manage.py').status_code, 404)
+
+    def test_middleware_is_async_capable(self):
+        async def get_response(request):
+            return None
+
+        self.assertTrue(iscoroutinefunction(StaticFilesMiddleware(get_response)))
+        self.assertFalse(iscoroutinefunction(StaticFilesMiddleware(lambda request: None)))
+
+    async def test_middleware_serves_async_requests(self):
+        hashed = await sync_to_async(staticfiles_storage.stored_name)('css/styles.css')
+        response = await self.async_client.get(f'/static/{hashed}', ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
@@ -78,20 +78,20 @@ def founder_dashboard(request):
     if role != 'founder':
         return redirect('dashboard_redirect')
 
-    user_startups = request.user.founded_startups.all()
+    user_startups = Startup.objects.for_user(request.user)
 
     # Startup statistics
     total_startups = user_startups.count()
     active_startups = user_startups.filter(projects__status='in_progress').distinct().count()
 
     # Project statistics
-    user_projects = Project.objects.filter(startup__in=user_startups)
+    user_projects = Project.objects.for_user(request.user)
     total_projects = user_projects.count()
     active_projects = user_projects.filter(status='in_progress').count()
     completed_projects = user_projects.filter(status='completed').count()
 
     # Task statistics
-    user_tasks = Task.objects.filter(project__startup__in=user_startups)
+    user_tasks = Task.objects.for_user(request.user)
     total_tasks = user_tasks.count()
     completed_tasks = user_tasks.filter(status='completed').count()
     overdue_tasks = user_tasks.filter(
@@ -99,7 +99,7 @@ def founder_dashboard(request):
     ).exclude(status='completed').count()
 
     # Funding statistics
-    funding_applications = FundingApplication.objects.filter(startup__in=user_startups)
+    funding_applications = FundingApplication.objects.for_user(request.user)
     pending_applications = funding_applications.filter(status__in=['submitted', 'under_review']).count()
     approved_applications = funding_applications.filter(status='approved').count()
 
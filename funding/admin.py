@@ -1,6 +1,8 @@
 # funding/admin.py
 from django.contrib import admin
-from .models import FundingApplication
+from .exports import APPLICATIONS
+from .models import FundingApplication, FundingApplicationRollup
+from .services import FundingRollupService
 
 @admin.register(FundingApplication)
 class FundingApplicationAdmin(admin.ModelAdmin):
@@ -74,26 +76,28 @@ class FundingApplicationAdmin(admin.ModelAdmin):
     
     def change_status_to_approved(self, request, queryset):
         """Admin action to approve selected funding applications"""
-        updated = queryset.update(status='approved')
+        updated = FundingRollupService.update_status(queryset, 'approved')
         self.message_user(request, f'{updated} funding application(s) approved.')
     change_status_to_approved.short_description = "Approve selected applications"
     
     def change_status_to_rejected(self, request, queryset):
         """Admin action to reject selected funding applications"""
-        updated = queryset.update(status='rejected')
+        updated = FundingRollupService.update_status(queryset, 'rejected')
         self.message_user(request, f'{updated} funding application(s) rejected.')
     change_status_to_rejected.short_description = "Reject selected applications"
     
     def change_status_to_under_review(self, request, queryset):
         """Admin action to mark selected applications as under review"""
-        updated = queryset.update(status='under_review')
+        updated = FundingRollupService.update_status(queryset, 'under_review')
         self.message_user(request, f'{updated} funding application(s) marked as under review.')
     change_status_to_under_review.short_description = "Mark selected as under review"
     
     actions = [
         change_status_to_approved,
         change_status_to_rejected,
-        change_status_to_under_review
+        change_status_to_under_review,
+        APPLICATIONS.admin_action(),
+        APPLICATIONS.admin_action('ndjson'),
     ]
     
     def get_readonly_fields(self, request, obj=None):
@@ -101,4 +105,19 @@ class FundingApplicationAdmin(admin.ModelAdmin):
         if obj and obj.status in ['approved', 'rejected', 'funded']:
             # Once approved/rejected/funded, prevent editing of financial details
             return self.readonly_fields + ('amount', 'equity_offered', 'valuation', 'funding_round')
-        return self.readonly_fields
\ No newline at end of file
+        return self.readonly_fields
+
+
+@admin.register(FundingApplicationRollup)
+class FundingApplicationRollupAdmin(admin.ModelAdmin):
+    list_display = ('month', 'status', 'funding_round', 'startup_stage', 'application_count', 'total_amount')
+    list_filter = ('status', 'funding_round', 'startup_stage')
+    date_hierarchy = 'month'
+    
+    def rebuild_rollups(self, request, queryset):
+        """Admin action to rebuild the whole rollup table from applications"""
+        buckets = FundingRollupService.rebuild()
+        self.message_user(request, f'Rebuilt {buckets} rollup bucket(s).')
+    rebuild_rollups.short_description = "Rebuild all rollup buckets"
+    
+    actions = [rebuild_rollups]
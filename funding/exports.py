@@ -0,0 +1,15 @@
+# funding/exports.py
+from venture_manager.exporting import Export
+
+APPLICATIONS = Export('funding-applications', [
+    ('id', 'id'),
+    ('startup', 'startup__name'),
+    ('startup_stage', 'startup__stage'),
+    ('funding_round', 'funding_round'),
+    ('status', 'status'),
+    ('amount', 'amount'),
+    ('equity_offered_pct', 'equity_offered'),
+    ('valuation', 'valuation'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+])
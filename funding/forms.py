@@ -1,5 +1,6 @@
 # funding/forms.py
 from django import forms
+from startups.models import Startup
 from .models import FundingApplication
 
 class FundingApplicationForm(forms.ModelForm):
@@ -17,4 +18,4 @@ class FundingApplicationForm(forms.ModelForm):
         user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
         if user:
-            self.fields['startup'].queryset = user.founded_startups.all()
\ No newline at end of file
+            self.fields['startup'].queryset = Startup.objects.for_user(user)
\ No newline at end of file
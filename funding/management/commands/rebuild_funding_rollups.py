@@ -0,0 +1,12 @@
+# funding/management/commands/rebuild_funding_rollups.py
+from django.core.management.base import BaseCommand
+
+from funding.services import FundingRollupService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly FundingApplicationRollup table from FundingApplication rows"
+
+    def handle(self, *args, **options):
+        buckets = FundingRollupService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} funding rollup bucket(s)."))
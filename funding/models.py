@@ -2,6 +2,16 @@
 from django.db import models
 from startups.models import Startup
 from investments.models import Investment
+from venture_manager.access import user_scope
+
+
+class FundingApplicationQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Applications of the founder's startups; managers see all"""
+        scope = user_scope(user)
+        if scope.role not in ('manager', 'founder'):
+            return self.none()
+        return scope.by_startup(self)
 
 
 class FundingApplication(models.Model):
@@ -34,5 +44,35 @@ class FundingApplication(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = FundingApplicationQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='fundingapp_status_created_idx'),
+            # Sort keys of the manager funding list (venture_manager.listing), id breaking ties
+            models.Index(fields=['created_at', 'id'], name='fundingapp_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='fundingapp_updated_idx'),
+            models.Index(fields=['amount', 'id'], name='fundingapp_amount_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.startup.name} - {self.get_funding_round_display()}"
+
+class FundingApplicationRollup(models.Model):
+    """
+    Month-bucketed application counts and amounts by status, round and startup stage.
+    Kept current by funding.signals and rebuilt with `manage.py rebuild_funding_rollups`.
+    """
+    month = models.DateField(help_text="First day of the month the application was created")
+    status = models.CharField(max_length=20, choices=FundingApplication.STATUS_CHOICES)
+    funding_round = models.CharField(max_length=20, choices=Investment.ROUND_CHOICES)
+    startup_stage = models.CharField(max_length=20, choices=Startup.STAGE_CHOICES)
+    application_count = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    
+    class Meta:
+        unique_together = ['month', 'status', 'funding_round', 'startup_stage']
+        ordering = ['month']
+    
     def __str__(self):
-        return f"{self.startup.name} - {self.get_funding_round_display()}"
\ No newline at end of file
+        return f"{self.month:%Y-%m} {self.status}/{self.funding_round}/{self.startup_stage}: {self.application_count}"
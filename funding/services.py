@@ -0,0 +1,187 @@
+# funding/services.py
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Q, Sum, Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from venture_manager.caching import invalidate
+
+from .models import FundingApplication, FundingApplicationRollup
+
+
+class FundingRollupService:
+    
+    @staticmethod
+    def month_of(created_at):
+        """Rollup bucket for a creation timestamp (first day of the local month)"""
+        return timezone.localtime(created_at).date().replace(day=1)
+    
+    @staticmethod
+    def key_for(application, startup_stage=None):
+        """Rollup key for an application instance"""
+        return {
+            'month': FundingRollupService.month_of(application.created_at),
+            'status': application.status,
+            'funding_round': application.funding_round,
+            'startup_stage': startup_stage or application.startup.stage,
+        }
+    
+    @staticmethod
+    def row_key(row):
+        """Rollup key for a row produced by _grouped()"""
+        return {
+            'month': row['rollup_month'].date(),
+            'status': row['status'],
+            'funding_round': row['funding_round'],
+            'startup_stage': row['startup__stage'],
+        }
+    
+    @staticmethod
+    def snapshot(pk):
+        """Rollup key and amount of the stored row, taken before it is changed"""
+        row = FundingApplication.objects.filter(pk=pk).values(
+            'created_at', 'status', 'funding_round', 'amount', 'startup__stage'
+        ).first()
+        if not row:
+            return None
+        key = {
+            'month': FundingRollupService.month_of(row['created_at']),
+            'status': row['status'],
+            'funding_round': row['funding_round'],
+            'startup_stage': row['startup__stage'],
+        }
+        return key, row['amount']
+    
+    @staticmethod
+    def apply(key, count_delta, amount_delta):
+        """Add deltas to one rollup bucket, creating it when needed"""
+        if not count_delta and not amount_delta:
+            return
+        with transaction.atomic():
+            bucket, _ = FundingApplicationRollup.objects.get_or_create(**key)
+            FundingApplicationRollup.objects.filter(pk=bucket.pk).update(
+                application_count=F('application_count') + count_delta,
+                total_amount=F('total_amount') + Decimal(amount_delta or 0),
+            )
+    
+    @staticmethod
+    def record_change(previous, key, amount):
+        """Move an application from its previous bucket (if any) to its current one"""
+        if previous:
+            previous_key, previous_amount = previous
+            if previous_key == key and previous_amount == amount:
+                return
+            FundingRollupService.apply(previous_key, -1, -previous_amount)
+        FundingRollupService.apply(key, 1, amount)
+    
+    @staticmethod
+    def record_delete(key, amount):
+        FundingRollupService.apply(key, -1, -amount)
+    
+    @staticmethod
+    def _grouped(queryset):
+        """Group applications into rollup buckets in the database"""
+        return queryset.annotate(rollup_month=TruncMonth('created_at')).values(
+            'rollup_month', 'status', 'funding_round', 'startup__stage'
+        ).annotate(
+            application_count=Count('id'),
+            total_amount=Sum('amount'),
+        ).order_by()
+    
+    @staticmethod
+    def move_applications(queryset, **changes):
+        """
+        Apply bucket deltas for a set of applications about to change in bulk
+        (status via QuerySet.update, or startup stage) without per-row work.
+        """
+        with transaction.atomic():
+            for row in FundingRollupService._grouped(queryset):
+                old_key = FundingRollupService.row_key(row)
+                new_key = dict(old_key, **changes)
+                if new_key == old_key:
+                    continue
+                FundingRollupService.apply(old_key, -row['application_count'], -row['total_amount'])
+                FundingRollupService.apply(new_key, row['application_count'], row['total_amount'])
+    
+    @staticmethod
+    def move_startup_stage(startup, previous_stage):
+        """Re-bucket a startup's applications after its stage changed (rows already carry the new stage)"""
+        with transaction.atomic():
+            for row in FundingRollupService._grouped(FundingApplication.objects.filter(startup=startup)):
+                new_key = FundingRollupService.row_key(row)
+                old_key = dict(new_key, startup_stage=previous_stage)
+                FundingRollupService.apply(old_key, -row['application_count'], -row['total_amount'])
+                FundingRollupService.apply(new_key, row['application_count'], row['total_amount'])
+    
+    @staticmethod
+    def update_status(queryset, status):
+        """QuerySet.update(status=...) that keeps the rollup in step"""
+        with transaction.atomic():
+            FundingRollupService.move_applications(queryset.exclude(status=status), status=status)
+            updated = queryset.update(status=status)
+            invalidate(FundingApplication)
+            return updated
+    
+    @staticmethod
+    def rebuild():
+        """Recompute every bucket from FundingApplication; returns the number of buckets"""
+        buckets = [
+            FundingApplicationRollup(
+                **FundingRollupService.row_key(row),
+                application_count=row['application_count'],
+                total_amount=row['total_amount'] or 0,
+            )
+            for row in FundingRollupService._grouped(FundingApplication.objects.all())
+        ]
+        with transaction.atomic():
+            FundingApplicationRollup.objects.all().delete()
+            FundingApplicationRollup.objects.bulk_create(buckets, batch_size=500)
+        return len(buckets)
+    
+    # ---- Read side ----
+    @staticmethod
+    def summary():
+        """Totals across all buckets"""
+        totals = FundingApplicationRollup.objects.aggregate(
+            total_applications=Sum('application_count'),
+            total_requested=Sum('total_amount'),
+            pending_applications=Sum('application_count', filter=Q(status='submitted')),
+            approved_applications=Sum('application_count', filter=Q(status='approved')),
+            rejected_applications=Sum('application_count', filter=Q(status='rejected')),
+            total_approved_amount=Sum('total_amount', filter=Q(status='approved')),
+        )
+        summary = {key: value or 0 for key, value in totals.items()}
+        summary['avg_amount'] = (
+            summary['total_requested'] / summary['total_applications']
+            if summary['total_applications'] else 0
+        )
+        summary['avg_approved_amount'] = (
+            summary['total_approved_amount'] / summary['approved_applications']
+            if summary['approved_applications'] else 0
+        )
+        return summary
+    
+    @staticmethod
+    def breakdown(field):
+        """Counts and amounts grouped by one rollup dimension (status, funding_round, startup_stage, month)"""
+        return FundingApplicationRollup.objects.values(field).annotate(
+            count=Sum('application_count'),
+            amount=Sum('total_amount'),
+        ).filter(count__gt=0).order_by(field)
+    
+    @staticmethod
+    def monthly_trends():
+        return FundingRollupService.breakdown('month')
+    
+    @staticmethod
+    def success_by_stage():
+        rows = list(FundingApplicationRollup.objects.values('startup_stage').annotate(
+            total=Sum('application_count'),
+            approved=Sum('application_count', filter=Q(status='approved')),
+        ).filter(total__gt=0).order_by('startup_stage'))
+        for row in rows:
+            row['approved'] = row['approved'] or 0
+            row['success_rate'] = row['approved'] * 100.0 / row['total']
+        return rows
@@ -0,0 +1,46 @@
+# funding/signals.py
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from startups.models import Startup
+
+from .models import FundingApplication
+from .services import FundingRollupService
+
+
+# Keep FundingApplicationRollup in step with application writes
+@receiver(pre_save, sender=FundingApplication)
+def capture_previous_rollup_bucket(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous = None
+    if instance.pk and not raw:
+        instance._rollup_previous = FundingRollupService.snapshot(instance.pk)
+
+@receiver(post_save, sender=FundingApplication)
+def update_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    FundingRollupService.record_change(
+        getattr(instance, '_rollup_previous', None),
+        FundingRollupService.key_for(instance),
+        instance.amount,
+    )
+
+@receiver(post_delete, sender=FundingApplication)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    FundingRollupService.record_delete(FundingRollupService.key_for(instance), instance.amount)
+
+# Applications are bucketed by their startup's current stage
+@receiver(pre_save, sender=Startup)
+def capture_previous_startup_stage(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous_stage = None
+    if instance.pk and not raw:
+        instance._rollup_previous_stage = Startup.objects.filter(pk=instance.pk).values_list(
+            'stage', flat=True
+        ).first()
+
+@receiver(post_save, sender=Startup)
+def move_applications_on_stage_change(sender, instance, raw=False, **kwargs):
+    previous_stage = getattr(instance, '_rollup_previous_stage', None)
+    if raw or not previous_stage or previous_stage == instance.stage:
+        return
+    FundingRollupService.move_startup_stage(instance, previous_stage)
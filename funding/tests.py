@@ -1,3 +1,120 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+
+from startups.models import Startup
+from .exports import APPLICATIONS
+from .models import FundingApplication, FundingApplicationRollup
+from .services import FundingRollupService
+
+User = get_user_model()
+
+
+class FundingTestMixin:
+    def setUp(self):
+        self.founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        self.manager = User.objects.create_user(
+            username="manager", email="manager@example.com", password="testpass", role="manager"
+        )
+        self.startup = Startup.objects.create(
+            name="GreenSpark", description="Test", industry="tech", stage="seed",
+            founding_date=date(2020, 1, 1), location="Lagos", market="B2B", founder=self.founder,
+        )
+
+    def apply_for(self, amount, status='submitted', funding_round='seed'):
+        return FundingApplication.objects.create(
+            startup=self.startup, funding_round=funding_round, amount=amount, status=status,
+            pitch="Pitch", use_of_funds="Growth", milestones="Launch",
+        )
+
+    def rollup_rows(self):
+        return sorted(
+            FundingApplicationRollup.objects.filter(application_count__gt=0).values_list(
+                'month', 'status', 'funding_round', 'startup_stage', 'application_count', 'total_amount'
+            )
+        )
+
+
+class FundingRollupTests(FundingTestMixin, TestCase):
+    def assertRollupMatchesRebuild(self):
+        incremental = self.rollup_rows()
+        FundingRollupService.rebuild()
+        self.assertEqual(incremental, self.rollup_rows())
+
+    def test_create_update_delete_keep_rollup_in_step(self):
+        first = self.apply_for(1000)
+        second = self.apply_for(2500, funding_round='series_a')
+        self.assertEqual(FundingRollupService.summary()['total_applications'], 2)
+
+        first.status = 'approved'
+        first.amount = 1500
+        first.save()
+        second.delete()
+        self.assertRollupMatchesRebuild()
+
+        summary = FundingRollupService.summary()
+        self.assertEqual(summary['total_applications'], 1)
+        self.assertEqual(summary['approved_applications'], 1)
+        self.assertEqual(summary['total_approved_amount'], 1500)
+
+    def test_bulk_status_update_and_stage_change(self):
+        for amount in (100, 200, 300):
+            self.apply_for(amount)
+        FundingRollupService.update_status(FundingApplication.objects.filter(amount__gte=200), 'rejected')
+        self.startup.stage = 'series_a'
+        self.startup.save()
+        self.assertRollupMatchesRebuild()
+
+        stages = {row['startup_stage']: row for row in FundingRollupService.success_by_stage()}
+        self.assertEqual(list(stages), ['series_a'])
+        self.assertEqual(stages['series_a']['total'], 3)
+
+    def test_rebuild_command(self):
+        self.apply_for(1000)
+        FundingApplicationRollup.objects.all().delete()
+        call_command('rebuild_funding_rollups', stdout=StringIO())
+        self.assertEqual(FundingRollupService.summary()['total_applications'], 1)
+
+
+class ManagerFundingViewTests(FundingTestMixin, TestCase):
+    def test_rounds_and_analytics_render(self):
+        for amount in range(1, 26):
+            self.apply_for(amount * 100)
+        self.client.force_login(self.manager)
+
+        response = self.client.get(reverse('funding:manager_funding_rounds'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_applications'], 25)
+        self.assertEqual(len(response.context['applications']), 20)
+
+        response = self.client.get(reverse('funding:manager_funding_analytics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['monthly_trends'][0]['count'], 25)
+
+
+class FundingExportTests(FundingTestMixin, TestCase):
+    def test_founder_export_and_admin_action(self):
+        first, second = self.apply_for(1000), self.apply_for(2500, status='approved')
+        other_founder = User.objects.create_user(
+            username="other", email="other@example.com", password="testpass", role="founder"
+        )
+        self.client.force_login(other_founder)
+        body = b''.join(self.client.get(reverse('funding:funding_export')).streaming_content).decode()
+        self.assertEqual(body.splitlines(), [','.join(APPLICATIONS.headers)])
 
-# Create your tests here.
+        admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="testpass", role="manager"
+        )
+        self.client.force_login(admin)
+        response = self.client.post(reverse('admin:funding_fundingapplication_changelist'), {
+            'action': 'export_csv', '_selected_action': [second.pk, first.pk],
+        })
+        rows = b''.join(response.streaming_content).decode().splitlines()[1:]
+        self.assertEqual([row.split(',')[0] for row in rows], [str(first.pk), str(second.pk)])
+        self.assertIn('GreenSpark,seed,seed,approved,2500.00', rows[1])
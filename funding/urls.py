@@ -13,10 +13,12 @@ urlpatterns = [
     path('manager/funding/rounds/', views.manager_funding_rounds, name='manager_funding_rounds'),
     path('manager/funding/<int:pk>/', views.manager_funding_detail, name='manager_funding_detail'),
     path('manager/funding/<int:pk>/review/', views.manager_funding_review, name='manager_funding_review'),
+    path('manager/funding/<int:pk>/delete/', views.manager_funding_delete, name='delete_application'),
     path('manager/funding/analytics/', views.funding_analytics, name='manager_funding_analytics'),
     
     # Generic URL (redirects based on role)
     path('funding/rounds/', views.funding_rounds, name='funding_rounds'),
     path('funding/analytics/', views.funding_analytics, name='funding_analytics'),
+    path('funding/export/', views.funding_export, name='funding_export'),
     
 ]
\ No newline at end of file
@@ -3,8 +3,13 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.db.models import Count, Q, Sum, Avg
+from investments.models import Investment
+from startups.models import Startup
+from venture_manager.listing import ListQuery, ListFilter, id_filter
+from .exports import APPLICATIONS
 from .models import FundingApplication
 from .forms import FundingApplicationForm
+from .services import FundingRollupService
 
 @login_required
 def funding_apply(request):
@@ -25,14 +30,14 @@ def funding_apply(request):
     
     return render(request, 'founder/funding_apply.html', {
         'form': form,
-        'user_startups': request.user.founded_startups.all(),
+        'user_startups': Startup.objects.for_user(request.user),
     })
 
 @login_required
 def funding_rounds(request):
     """Generic funding rounds view that redirects based on user role"""
     if request.user.role.lower() == 'founder':
-        applications = FundingApplication.objects.filter(startup__in=request.user.founded_startups.all())
+        applications = FundingApplication.objects.for_user(request.user)
         return render(request, 'founder/funding_rounds.html', {
             'applications': applications,
         })
@@ -44,6 +49,19 @@ def funding_rounds(request):
         messages.error(request, 'Access denied.')
         return redirect('dashboard_redirect')
 
+def _application_json(application):
+    return {
+        'id': application.id,
+        'startup': application.startup.name,
+        'startup_id': application.startup_id,
+        'funding_round': application.funding_round,
+        'amount': str(application.amount),
+        'valuation': str(application.valuation) if application.valuation is not None else None,
+        'equity_offered': application.equity_offered,
+        'status': application.status,
+        'created_at': application.created_at.isoformat(),
+    }
+
 # New manager-specific views
 @login_required
 def manager_funding_rounds(request):
@@ -52,48 +70,38 @@ def manager_funding_rounds(request):
         messages.error(request, 'Access denied.')
         return redirect('dashboard_redirect')
     
-    # Get all funding applications with related data
-    applications = FundingApplication.objects.select_related('startup').prefetch_related(
-        'startup__founders'
-    ).order_by('-created_at')
-    
-    # Advanced statistics for manager - use the actual field names from your model
-    total_applications = applications.count()
-    pending_applications = applications.filter(status='submitted').count()
-    approved_applications = applications.filter(status='approved').count()
-    rejected_applications = applications.filter(status='rejected').count()
-    
-    # Funding amount statistics - use 'amount' field instead of 'amount_requested'
-    funding_stats = applications.aggregate(
-        total_amount=Sum('amount'),
-        total_approved_amount=Sum('amount', filter=Q(status='approved'))
+    listing = ListQuery(
+        request,
+        FundingApplication.objects.select_related('startup', 'startup__founder'),
+        sort_keys={'created': 'created_at', 'updated': 'updated_at', 'amount': 'amount'},
+        default_sort='-created',
+        filters={
+            'status': ListFilter('status', FundingApplication.STATUS_CHOICES),
+            'round': ListFilter('funding_round', Investment.ROUND_CHOICES),
+            'stage': ListFilter('startup__stage', Startup.STAGE_CHOICES),
+            'startup': id_filter('startup_id'),
+        },
+        page_size=20,
     )
+    applications = listing.page()
     
-    total_funding_amount = funding_stats['total_amount'] or 0
-    total_approved_amount = funding_stats['total_approved_amount'] or 0
+    if listing.wants_json():
+        return listing.json_response(applications, _application_json)
     
-    # Applications by stage
-    applications_by_stage = applications.values('startup__stage').annotate(
-        count=Count('id'),
-        total_amount=Sum('amount')
-    )
-    
-    # Applications by status
-    applications_by_status = applications.values('status').annotate(
-        count=Count('id'),
-        total_amount=Sum('amount')
-    )
+    # Statistics come from the monthly rollup table, not the applications themselves
+    summary = FundingRollupService.summary()
     
     return render(request, 'manager/funding_rounds.html', {
         'applications': applications,
-        'total_applications': total_applications,
-        'pending_applications': pending_applications,
-        'approved_applications': approved_applications,
-        'rejected_applications': rejected_applications,
-        'total_funding_amount': total_funding_amount,
-        'total_approved_amount': total_approved_amount,
-        'applications_by_stage': applications_by_stage,
-        'applications_by_status': applications_by_status,
+        'total_applications': summary['total_applications'],
+        'pending_applications': summary['pending_applications'],
+        'approved_applications': summary['approved_applications'],
+        'rejected_applications': summary['rejected_applications'],
+        'total_funding_amount': summary['total_requested'],
+        'total_approved_amount': summary['total_approved_amount'],
+        'applications_by_stage': FundingRollupService.breakdown('startup_stage'),
+        'applications_by_status': FundingRollupService.breakdown('status'),
+        **listing.context(),
     })
 
 @login_required
@@ -155,6 +163,22 @@ def manager_funding_review(request, pk):
         'application': application,
     })
 
+@login_required
+def manager_funding_delete(request, pk):
+    """Manager view to delete a funding application"""
+    if request.user.role.lower() != 'manager':
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard_redirect')
+    
+    application = get_object_or_404(FundingApplication.objects.select_related('startup'), pk=pk)
+    
+    if request.method == 'POST':
+        startup_name = application.startup.name
+        application.delete()
+        messages.success(request, f'Funding application for {startup_name} deleted successfully.')
+    
+    return redirect('funding:manager_funding_rounds')
+
 @login_required
 def funding_analytics(request):
     """Advanced analytics view for managers"""
@@ -162,33 +186,22 @@ def funding_analytics(request):
         messages.error(request, 'Access denied.')
         return redirect('dashboard_redirect')
     
-    # Comprehensive analytics data
-    applications = FundingApplication.objects.select_related('startup').prefetch_related('startup__founders')
-    
-    # Monthly application trends
-    from django.db.models.functions import TruncMonth
-    monthly_trends = applications.annotate(
-        month=TruncMonth('created_at')
-    ).values('month').annotate(
-        count=Count('id'),
-        total_amount=Sum('amount')
-    ).order_by('month')
-    
-    # Success rate by startup stage
-    success_by_stage = applications.values('startup__stage').annotate(
-        total=Count('id'),
-        approved=Count('id', filter=Q(status='approved')),
-        success_rate=Count('id', filter=Q(status='approved')) * 100.0 / Count('id')
-    )
-    
-    # Average funding amounts
-    avg_amount = applications.aggregate(avg=Avg('amount'))['avg'] or 0
-    avg_approved_amount = applications.filter(status='approved').aggregate(avg=Avg('amount'))['avg'] or 0
+    # Everything below reads the pre-aggregated monthly rollup rows
+    summary = FundingRollupService.summary()
     
     return render(request, 'manager/funding_analytics.html', {
-        'monthly_trends': monthly_trends,
-        'success_by_stage': success_by_stage,
-        'avg_amount': avg_amount,
-        'avg_approved_amount': avg_approved_amount,
-        'applications': applications,
-    })
\ No newline at end of file
+        'monthly_trends': FundingRollupService.monthly_trends(),
+        'success_by_stage': FundingRollupService.success_by_stage(),
+        'applications_by_round': FundingRollupService.breakdown('funding_round'),
+        'avg_amount': summary['avg_amount'],
+        'avg_approved_amount': summary['avg_approved_amount'],
+        'summary': summary,
+        'recent_applications': FundingApplication.objects.select_related('startup').order_by('-created_at')[:10],
+    })
+
+
+@login_required
+def funding_export(request):
+    """Stream the funding applications the user can see (?format=ndjson)"""
+    applications = FundingApplication.objects.for_user(request.user).order_by('created_at', 'pk')
+    return APPLICATIONS.response(applications, request.GET.get('format'))
@@ -1,5 +1,9 @@
 # investments/admin.py
 from django.contrib import admin
+
+from venture_manager.caching import invalidate
+
+from .exports import INVESTMENTS
 from .models import Investment
 
 @admin.register(Investment)
@@ -70,25 +74,30 @@ class InvestmentAdmin(admin.ModelAdmin):
     def mark_as_exited(self, request, queryset):
         """Admin action to mark selected investments as exited"""
         updated = queryset.update(status='exited')
+        invalidate(Investment)
         self.message_user(request, f'{updated} investment(s) marked as exited.')
     mark_as_exited.short_description = "Mark selected investments as exited"
     
     def mark_as_written_off(self, request, queryset):
         """Admin action to mark selected investments as written off"""
         updated = queryset.update(status='written_off')
+        invalidate(Investment)
         self.message_user(request, f'{updated} investment(s) marked as written off.')
     mark_as_written_off.short_description = "Mark selected investments as written off"
     
     def mark_as_active(self, request, queryset):
         """Admin action to mark selected investments as active"""
         updated = queryset.update(status='active')
+        invalidate(Investment)
         self.message_user(request, f'{updated} investment(s) marked as active.')
     mark_as_active.short_description = "Mark selected investments as active"
     
     actions = [
         mark_as_exited,
         mark_as_written_off,
-        mark_as_active
+        mark_as_active,
+        INVESTMENTS.admin_action(),
+        INVESTMENTS.admin_action('ndjson'),
     ]
     
     def get_readonly_fields(self, request, obj=None):
@@ -0,0 +1,20 @@
+# investments/exports.py
+from venture_manager.exporting import Export
+
+# market_value and roi come from InvestmentQuerySet.with_returns(), computed in SQL
+INVESTMENTS = Export('investments', [
+    ('id', 'id'),
+    ('investor', 'investor__email'),
+    ('startup', 'startup__name'),
+    ('round', 'round'),
+    ('status', 'status'),
+    ('investment_date', 'investment_date'),
+    ('amount', 'amount'),
+    ('equity_pct', 'equity'),
+    ('valuation', 'valuation'),
+    ('current_valuation', 'current_valuation'),
+    ('market_value', 'market_value'),
+    ('roi_pct', 'roi'),
+    ('exit_date', 'exit_date'),
+    ('exit_value', 'exit_value'),
+], prepare=lambda queryset: queryset.with_returns())
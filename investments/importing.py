@@ -0,0 +1,51 @@
+# investments/importing.py
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+
+from startups.importing import StartupReferences
+from venture_manager.importing import CsvImporter
+
+from .forms import InvestmentCreateForm
+from .models import Investment
+
+CustomUser = get_user_model()
+
+
+class InvestmentImportForm(InvestmentCreateForm):
+    """InvestmentCreateForm's checks, without the startup lookup"""
+
+    class Meta(InvestmentCreateForm.Meta):
+        fields = ('amount', 'equity', 'valuation', 'round', 'investment_date', 'current_valuation')
+
+
+class InvestmentImporter(CsvImporter):
+    """
+    One investment per row. `startup` is a startup id or exact name. Managers
+    also give `investor`, the investor's email; investors import their own.
+    """
+    model = Investment
+    form_class = InvestmentImportForm
+
+    @property
+    def reference_columns(self):
+        if self.user.role == 'manager':
+            return ('startup', 'investor')
+        return ('startup',)
+
+    def resolve(self, rows):
+        references = {'startups': StartupReferences([row.get('startup', '') for row in rows])}
+        if 'investor' in self.reference_columns:
+            emails = {row.get('investor', '') for row in rows}
+            references['investors'] = dict(
+                CustomUser.objects.filter(email__in=emails, role='investor').values_list('email', 'pk')
+            )
+        return references
+
+    def attach(self, instance, row, references):
+        instance.startup_id = references['startups'].get(row.get('startup', ''))
+        if 'investors' in references:
+            instance.investor_id = references['investors'].get(row.get('investor', ''))
+            if instance.investor_id is None:
+                raise ValidationError(f"investor: no investor with email '{row.get('investor', '')}'.")
+        else:
+            instance.investor_id = self.user.pk
@@ -1,11 +1,74 @@
 # investments/models.py
 from django.db import models
+from django.db.models import Avg, Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, NullIf
 from django.utils import timezone
 from startups.models import Startup
 from django.contrib.auth import get_user_model
+from venture_manager.access import user_scope
 
 CustomUser = get_user_model()
 
+
+def current_value_expression():
+    """SQL equivalent of Investment.current_value (valuation x equity, else amount)"""
+    return Case(
+        When(
+            Q(current_valuation__isnull=False) & ~Q(current_valuation=0),
+            then=Cast('current_valuation', FloatField()) * F('equity') / Value(100.0),
+        ),
+        default=Cast('amount', FloatField()),
+        output_field=FloatField(),
+    )
+
+
+def roi_expression():
+    """SQL equivalent of Investment.current_roi as a percentage"""
+    amount = Cast('amount', FloatField())
+    return (current_value_expression() - amount) * Value(100.0) / NullIf(amount, Value(0.0))
+
+
+class InvestmentQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Investments the user's role reaches; investors see their own"""
+        scope = user_scope(user)
+        if scope.role == 'investor':
+            return self.filter(investor_id=user.pk)
+        if scope.role == 'team_member':
+            return self.none()
+        return scope.by_startup(self)
+
+    def with_returns(self):
+        """Annotate each investment with market_value and roi computed in the database"""
+        return self.annotate(market_value=current_value_expression(), roi=roi_expression())
+
+    def performance_summary(self):
+        """Portfolio-wide totals in a single aggregate query"""
+        summary = self.aggregate(
+            total_invested=Coalesce(Sum(Cast('amount', FloatField())), Value(0.0)),
+            current_value=Coalesce(Sum(current_value_expression()), Value(0.0)),
+            avg_roi=Coalesce(Avg(roi_expression()), Value(0.0)),
+            total_count=Count('id'),
+            active_count=Count('id', filter=Q(status='active')),
+            startup_count=Count('startup', distinct=True),
+        )
+        total_invested = summary['total_invested']
+        summary['total_roi'] = (
+            (summary['current_value'] - total_invested) / total_invested * 100
+            if total_invested > 0 else 0
+        )
+        return summary
+
+    def performance_by(self, *fields):
+        """Group by the given fields with invested, value and average ROI per group"""
+        return self.values(*fields).annotate(
+            count=Count('id'),
+            total_invested=Sum('amount'),
+            current_value=Coalesce(Sum(current_value_expression()), Value(0.0)),
+            avg_roi=Coalesce(Avg(roi_expression()), Value(0.0)),
+        ).order_by(*fields)
+
+
 class Investment(models.Model):
     ROUND_CHOICES = [
         ('pre_seed', 'Pre-Seed'),
@@ -38,6 +101,13 @@ class Investment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = InvestmentQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['investor', 'status', 'investment_date'], name='invest_investor_status_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.investor} - {self.startup} (${self.amount})"
     
@@ -1,3 +1,239 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from communications.models import Notification
+from startups.models import Startup
+from .importing import InvestmentImporter
+from .models import Investment
+
+User = get_user_model()
+
+
+class InvestmentTestMixin:
+    def setUp(self):
+        self.founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        self.investor = User.objects.create_user(
+            username="investor", email="investor@example.com", password="testpass", role="investor"
+        )
+        self.startups = [
+            Startup.objects.create(
+                name=f"Startup {i}", description="Test", industry=industry, stage="seed",
+                founding_date=date(2020, 1, 1), location="Lagos", market="B2B", founder=self.founder,
+            )
+            for i, industry in enumerate(["tech", "finance", "tech"])
+        ]
+
+    def create_investment(self, startup, amount, equity, current_valuation=None, **kwargs):
+        defaults = {
+            'round': 'seed',
+            'investment_date': date(2023, 6, 1),
+            'valuation': amount * 10,
+        }
+        defaults.update(kwargs)
+        return Investment.objects.create(
+            investor=self.investor, startup=startup, amount=amount, equity=equity,
+            current_valuation=current_valuation, **defaults
+        )
+
+
+class InvestmentReturnsTests(InvestmentTestMixin, TestCase):
+    def test_sql_returns_match_python_properties(self):
+        self.create_investment(self.startups[0], 100000, 10, current_valuation=2000000)
+        self.create_investment(self.startups[1], 50000, 5, current_valuation=0)
+        self.create_investment(self.startups[2], 80000, 8)
+
+        for investment in Investment.objects.with_returns():
+            self.assertAlmostEqual(investment.market_value, investment.current_value, places=4)
+            self.assertAlmostEqual(investment.roi, investment.current_roi, places=4)
+
+    def test_performance_by_round(self):
+        self.create_investment(self.startups[0], 100000, 10, current_valuation=2000000, round='seed')
+        self.create_investment(self.startups[1], 100000, 10, current_valuation=500000, round='seed')
+        self.create_investment(self.startups[2], 50000, 5, round='series_a')
+
+        rows = {row['round']: row for row in Investment.objects.performance_by('round')}
+        self.assertEqual(rows['seed']['count'], 2)
+        self.assertAlmostEqual(rows['seed']['avg_roi'], (100 + -50) / 2)
+        self.assertAlmostEqual(rows['series_a']['avg_roi'], 0)
+
+
+class InvestorReportsViewTests(InvestmentTestMixin, TestCase):
+    def test_query_count_independent_of_rounds(self):
+        self.client.force_login(self.investor)
+        url = reverse('investments:investor_reports')
+        self.create_investment(self.startups[0], 100000, 10, current_valuation=2000000)
+        with CaptureQueriesContext(connection) as baseline:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        for i, round_name in enumerate(['pre_seed', 'series_a', 'series_b', 'series_c']):
+            self.create_investment(
+                self.startups[i % 3], 20000, 2, round=round_name, investment_date=date(2020 + i, 1, 1)
+            )
+        with CaptureQueriesContext(connection) as grown:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(grown), len(baseline))
+
+
+
+class FundingHistoryTests(InvestmentTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.investor)
+        for day in range(1, 31):
+            self.create_investment(self.startups[0], 1000, 1, investment_date=date(2024, 1, day))
+        self.create_investment(self.startups[1], 5000, 1, investment_date=date(2022, 3, 1))
+
+    def test_first_paint_loads_latest_year_page_only(self):
+        response = self.client.get(reverse('investments:funding_history'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['current_year'], 2024)
+        self.assertEqual(len(response.context['investments']), 25)
+        self.assertEqual(response.context['total_deals'], 31)
+        self.assertEqual(response.context['total_invested'], 35000)
+
+    def test_year_api_keyset_pages(self):
+        url = reverse('investments:funding_history_year', args=[2024])
+        first = self.client.get(url).json()
+        self.assertEqual(len(first['investments']), 25)
+        self.assertEqual(first['investments'][0]['investment_date'], '2024-01-30')
+
+        second = self.client.get(url, {'cursor': first['next_cursor']}).json()
+        self.assertEqual(len(second['investments']), 5)
+        self.assertIsNone(second['next_cursor'])
+        seen = {inv['id'] for inv in first['investments'] + second['investments']}
+        self.assertEqual(len(seen), 30)
+
+    def test_year_api_ignores_malformed_cursor(self):
+        url = reverse('investments:funding_history_year', args=[2024])
+        for cursor in ('abc:5', '2024-01-10:x', 'nonsense'):
+            response = self.client.get(url, {'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['investments'][0]['investment_date'], '2024-01-30')
+
+    def test_years_api(self):
+        data = self.client.get(reverse('investments:funding_history_years')).json()
+        self.assertEqual([row['year'] for row in data['years']], [2024, 2022])
+        older = self.client.get(reverse('investments:funding_history_years'), {'before': 2024}).json()
+        self.assertEqual([row['year'] for row in older['years']], [2022])
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class InvestmentExportTests(InvestmentTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.investments = [
+            self.create_investment(self.startups[0], 1000, 10, current_valuation=20000),
+            self.create_investment(self.startups[1], 2000, 5),
+            self.create_investment(self.startups[2], 500, 1, current_valuation=100000),
+        ]
+        other = User.objects.create_user(
+            username="other", email="other@example.com", password="testpass", role="investor"
+        )
+        Investment.objects.create(
+            investor=other, startup=self.startups[0], amount=1, equity=1, valuation=1,
+            round='seed', investment_date=date(2023, 1, 1),
+        )
+        self.client.force_login(self.investor)
+        self.url = reverse('investments:investment_export')
+
+    def test_csv_streams_own_positions_with_sql_returns(self):
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="investments-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+        self.assertEqual([int(row['id']) for row in rows], [i.pk for i in self.investments])
+        for row, investment in zip(rows, self.investments):
+            self.assertAlmostEqual(float(row['market_value']), investment.current_value)
+            self.assertAlmostEqual(float(row['roi_pct']), investment.current_roi)
+        self.assertEqual(rows[1]['current_valuation'], '')
+
+    def test_ndjson_reads_in_chunks_without_model_instances(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'format': 'ndjson'})
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])['startup'], 'Startup 0')
+        self.assertEqual(json.loads(lines[2])['investment_date'], '2023-06-01')
+        # One SELECT for the export, however many rows and chunks
+        self.assertEqual(sum('"investments_investment"' in q['sql'] for q in queries), 1)
+
+    def test_formula_cells_are_neutralised(self):
+        Startup.objects.filter(pk=self.startups[0].pk).update(name='=HYPERLINK("x")')
+        body = b''.join(self.client.get(self.url).streaming_content).decode()
+        self.assertIn("'=HYPERLINK", body)
+
+
+class InvestmentImportTests(InvestmentTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.manager = User.objects.create_user(
+            username="manager", email="manager@example.com", password="testpass", role="manager"
+        )
+        Startup.objects.create(
+            name="Startup 1", description="Twin", industry="tech", stage="seed",
+            founding_date=date(2020, 1, 1), location="Lagos", market="B2B", founder=self.founder,
+        )
+        Notification.objects.all().delete()
+
+    def upload(self, rows, header='startup,investor,amount,equity,valuation,round,investment_date'):
+        return io.BytesIO('\n'.join([header, *rows]).encode())
+
+    def test_manager_import_reports_row_errors_and_sends_one_notification(self):
+        result = InvestmentImporter(self.manager).run(self.upload([
+            f'{self.startups[0].pk},investor@example.com,1000,10,10000,seed,2024-01-31',
+            'Startup 2,investor@example.com,2000,5,40000,series_a,2024-02-01',
+            'Startup 1,investor@example.com,1000,10,10000,seed,2024-01-31',
+            'Nope,investor@example.com,1000,10,10000,seed,2024-01-31',
+            'Startup 0,founder@example.com,1000,10,10000,seed,2024-01-31',
+            'Startup 0,investor@example.com,1000,150,10000,seed,2024-01-31',
+        ]))
+        self.assertEqual((result.rows, result.created), (6, 2))
+        self.assertEqual([line for line, _ in result.errors], [4, 5, 6, 7])
+        self.assertIn('matches 2 startups', result.errors[0][1])
+        self.assertIn('equity', result.errors[3][1])
+        self.assertEqual(
+            sorted(Investment.objects.values_list('startup__name', 'investor__email', 'round')),
+            [('Startup 0', 'investor@example.com', 'seed'), ('Startup 2', 'investor@example.com', 'series_a')],
+        )
+        # No per-investment notifications to founders, one summary to the importer
+        self.assertEqual(list(Notification.objects.values_list('user__email', 'notification_type')),
+                         [('manager@example.com', 'warning')])
+
+    def test_references_are_resolved_once_per_batch(self):
+        rows = [f'Startup 0,investor@example.com,{100 + i},1,1000,seed,2024-01-01' for i in range(40)]
+        importer = InvestmentImporter(self.manager, batch_size=10)
+        with CaptureQueriesContext(connection) as queries:
+            result = importer.run(self.upload(rows))
+        self.assertEqual(result.created, 40)
+        startup_lookups = [q for q in queries if q['sql'].startswith('SELECT') and '"startups_startup"' in q['sql']]
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "investments_investment"')]
+        self.assertEqual((len(startup_lookups), len(inserts)), (4, 4))
+
+    def test_investor_dry_run_through_the_view(self):
+        self.client.force_login(self.investor)
+        upload = SimpleUploadedFile('book.csv', self.upload(
+            ['Startup 0,1000,10,10000,seed,2024-01-31'],
+            header='startup,amount,equity,valuation,round,investment_date',
+        ).getvalue())
+        response = self.client.post(reverse('investments:investment_import'), {'file': upload, 'dry_run': 'on'})
+        self.assertEqual(response.context['result'].created, 1)
+        self.assertFalse(Investment.objects.exists())
+
+        upload.seek(0)
+        self.client.post(reverse('investments:investment_import'), {'file': upload})
+        self.assertEqual(Investment.objects.get().investor, self.investor)
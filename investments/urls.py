@@ -8,8 +8,12 @@ urlpatterns = [
     path('dashboard/', views.investor_dashboard, name='investor_dashboard'),
     path('portfolio/', views.investor_portfolio, name='investor_portfolio'),
     path('funding/history/', views.funding_history, name='funding_history'),
+    path('funding/history/years/', views.funding_history_years, name='funding_history_years'),
+    path('funding/history/<int:year>/', views.funding_history_year, name='funding_history_year'),
     path('startups/', views.portfolio_startups, name='portfolio_startups'),
     path('reports/', views.investor_reports, name='investor_reports'),
+    path('export/', views.investment_export, name='investment_export'),
+    path('import/', views.investment_import, name='investment_import'),
     path('create/', views.investment_create, name='investment_create'),
     path('<int:pk>/edit/', views.investment_edit, name='investment_edit'),
     path('<int:pk>/', views.investment_detail, name='investment_detail'),
@@ -1,13 +1,18 @@
 # investments/views.py
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
+from django.urls import reverse
 from django.contrib import messages
+from django.http import JsonResponse
 from django.db.models import Sum, Avg, Count, Q
 from django.utils import timezone
-from datetime import timedelta
-from .models import Investment
+from datetime import date, timedelta
+from .exports import INVESTMENTS
+from .importing import InvestmentImporter
+from .models import Investment, roi_expression
 from .forms import InvestmentCreateForm, InvestmentEditForm
 from startups.models import Startup
+from venture_manager.importing import CsvUploadForm
 
 @login_required
 def investor_dashboard(request):
@@ -28,7 +33,7 @@ def investor_dashboard(request):
     exited_investments = investments.filter(status='exited')
     
     # ROI calculations
-    avg_roi = investments.aggregate(avg_roi=Avg('current_roi'))['avg_roi'] or 0
+    avg_roi = investments.aggregate(avg_roi=Avg(roi_expression()))['avg_roi'] or 0
     
     # Stage distribution
     stage_distribution = investments.values('round').annotate(
@@ -136,6 +141,34 @@ def investor_portfolio(request):
     
     return render(request, 'investor/portfolio.html', context)
 
+HISTORY_PAGE_SIZE = 25
+HISTORY_YEARS_PAGE_SIZE = 10
+
+
+def _history_page(investments, year, cursor=None, page_size=HISTORY_PAGE_SIZE):
+    """
+    Keyset page of one year's investments, newest first.
+    The cursor is "<investment_date>:<id>" of the last row already shown.
+    """
+    page = investments.filter(investment_date__year=year).select_related('startup')
+    if cursor:
+        try:
+            cursor_date, cursor_id = cursor.split(':')
+            cursor_date, cursor_id = date.fromisoformat(cursor_date), int(cursor_id)
+            page = page.filter(
+                Q(investment_date__lt=cursor_date) |
+                Q(investment_date=cursor_date, id__lt=cursor_id)
+            )
+        except ValueError:
+            pass
+    rows = list(page.order_by('-investment_date', '-id')[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = f"{rows[-1].investment_date.isoformat()}:{rows[-1].id}"
+    return rows, next_cursor
+
+
 @login_required
 def funding_history(request):
     """Funding History Timeline"""
@@ -143,32 +176,88 @@ def funding_history(request):
         messages.error(request, 'Access denied.')
         return redirect('dashboard_redirect')
     
-    investments = request.user.investments.select_related('startup').order_by('-investment_date')
+    investments = request.user.investments.all()
     
-    # Group by year
-    investments_by_year = {}
-    for investment in investments:
-        year = investment.investment_date.year
-        if year not in investments_by_year:
-            investments_by_year[year] = []
-        investments_by_year[year].append(investment)
+    # Yearly totals - grand total and deal count come from the same grouped query
+    yearly_totals = list(
+        investments.performance_by('investment_date__year').order_by('-investment_date__year')
+    )
+    total_invested = sum(year['total_invested'] for year in yearly_totals)
+    total_deals = sum(year['count'] for year in yearly_totals)
     
-    # Yearly totals
-    yearly_totals = investments.values('investment_date__year').annotate(
-        total_amount=Sum('amount'),
-        count=Count('id')
-    ).order_by('-investment_date__year')
+    # First paint only loads the first page of the latest year, the rest comes from the timeline API
+    current_year = yearly_totals[0]['investment_date__year'] if yearly_totals else None
+    first_page, next_cursor = [], None
+    if current_year:
+        first_page, next_cursor = _history_page(investments, current_year)
     
     context = {
-        'investments': investments,
-        'investments_by_year': investments_by_year,
+        'investments': first_page,
+        'next_cursor': next_cursor,
+        'current_year': current_year,
         'yearly_totals': yearly_totals,
-        'total_invested': investments.aggregate(total=Sum('amount'))['total'] or 0,
-        'total_deals': investments.count(),
+        'total_invested': total_invested,
+        'total_deals': total_deals,
+        'avg_investment': total_invested / total_deals if total_deals else 0,
     }
     
     return render(request, 'investor/funding_history.html', context)
 
+@login_required
+def funding_history_years(request):
+    """Timeline API: yearly totals, paged by year (newest first)"""
+    if request.user.role.lower() != 'investor':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    years = request.user.investments.all()
+    before = request.GET.get('before')
+    if before and before.isdigit():
+        years = years.filter(investment_date__lt=date(int(before), 1, 1))
+    
+    rows = list(
+        years.performance_by('investment_date__year')
+        .order_by('-investment_date__year')[:HISTORY_YEARS_PAGE_SIZE + 1]
+    )
+    has_more = len(rows) > HISTORY_YEARS_PAGE_SIZE
+    rows = rows[:HISTORY_YEARS_PAGE_SIZE]
+    
+    return JsonResponse({
+        'years': [
+            {
+                'year': row['investment_date__year'],
+                'count': row['count'],
+                'total_amount': float(row['total_invested'] or 0),
+                'current_value': row['current_value'],
+            }
+            for row in rows
+        ],
+        'next_before': rows[-1]['investment_date__year'] if has_more else None,
+    })
+
+@login_required
+def funding_history_year(request, year):
+    """Timeline API: one keyset page of a year's investments"""
+    if request.user.role.lower() != 'investor':
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    rows, next_cursor = _history_page(request.user.investments.all(), year, request.GET.get('cursor'))
+    
+    return JsonResponse({
+        'year': year,
+        'investments': [
+            {
+                'id': investment.id,
+                'startup': investment.startup.name,
+                'industry': investment.startup.get_industry_display(),
+                'round': investment.get_round_display(),
+                'investment_date': investment.investment_date.isoformat(),
+                'amount': float(investment.amount),
+            }
+            for investment in rows
+        ],
+        'next_cursor': next_cursor,
+    })
+
 @login_required
 def investment_create(request):
     """Create new investment"""
@@ -285,66 +374,77 @@ def portfolio_startups(request):
 # investments/views.py
 @login_required
 def investor_reports(request):
-    # """Investor reports and analytics"""
-    # if request.user.role.lower() != 'investor':
-    #     messages.error(request, 'Access denied.')
-    #     return redirect('dashboard_redirect')
-    
-    investments = request.user.investments.select_related('startup').all()
-    
-    # Performance metrics
-    total_invested = investments.aggregate(total=Sum('amount'))['total'] or 0
-    active_investments = investments.filter(status='active')
-    
-    # Calculate ROI manually since it's a property
-    total_current_value = sum(float(inv.current_value) for inv in investments)
-    total_roi = ((total_current_value - float(total_invested)) / float(total_invested) * 100) if total_invested > 0 else 0
-    
-    # Stage performance (without ROI aggregation)
-    stage_performance = investments.values('round').annotate(
-        total_invested=Sum('amount'),
-        count=Count('id')
-    )
+    """Investor reports and analytics"""
+    if request.user.role.lower() != 'investor':
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard_redirect')
     
-    # Calculate average ROI per stage manually
-    for stage in stage_performance:
-        stage_investments = investments.filter(round=stage['round'])
-        stage_roi_sum = sum(inv.current_roi for inv in stage_investments)
-        stage['avg_roi'] = stage_roi_sum / len(stage_investments) if stage_investments else 0
+    investments = request.user.investments.all()
     
-    # Industry performance
-    industry_performance = investments.values('startup__industry').annotate(
-        total_invested=Sum('amount'),
-        count=Count('id')
-    )
+    # Performance metrics (one aggregate query, ROI derived from valuation/equity in SQL)
+    summary = investments.performance_summary()
+    total_invested = summary['total_invested']
     
-    # Status distribution
-    status_distribution = investments.values('status').annotate(
-        count=Count('id'),
-        total_amount=Sum('amount')
-    )
+    # Stage, industry, status and yearly performance - one grouped query each
+    stage_performance = investments.performance_by('round')
+    industry_performance = list(investments.performance_by('startup__industry'))
+    for industry in industry_performance:
+        industry['percentage'] = (
+            float(industry['total_invested']) / total_invested * 100 if total_invested > 0 else 0
+        )
+    status_distribution = investments.performance_by('status')
+    investments_by_year = investments.performance_by('investment_date__year')
     
     # Recent investments for the report
-    recent_investments = investments.order_by('-investment_date')[:10]
-    
-    # Performance by year
-    investments_by_year = investments.values('investment_date__year').annotate(
-        total_amount=Sum('amount'),
-        count=Count('id')
-    ).order_by('investment_date__year')
+    recent_investments = investments.select_related('startup').with_returns().order_by('-investment_date')[:10]
     
     context = {
         'total_invested': total_invested,
-        'estimated_value': total_current_value,
-        'total_roi': total_roi,
-        'active_investments_count': active_investments.count(),
+        'estimated_value': summary['current_value'],
+        'total_roi': summary['total_roi'],
+        'avg_roi': summary['avg_roi'],
+        'active_investments_count': summary['active_count'],
         'stage_performance': stage_performance,
         'industry_performance': industry_performance,
         'status_distribution': status_distribution,
-        'total_startups': investments.values('startup').distinct().count(),
-        'investments': investments,
+        'total_startups': summary['startup_count'],
         'recent_investments': recent_investments,
         'investments_by_year': investments_by_year,
+        'current_date': timezone.now(),
     }
     
-    return render(request, 'investor/reports.html', context)
\ No newline at end of file
+    return render(request, 'investor/reports.html', context)
+
+
+@login_required
+def investment_export(request):
+    """Stream the investments the user can see, with SQL-computed value and ROI (?format=ndjson)"""
+    investments = Investment.objects.for_user(request.user).order_by('investment_date', 'pk')
+    return INVESTMENTS.response(investments, request.GET.get('format'))
+
+
+@login_required
+def investment_import(request):
+    """Bulk-import investments from an uploaded CSV"""
+    if request.user.role.lower() not in ('investor', 'manager'):
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard_redirect')
+    
+    result = None
+    importer = InvestmentImporter(request.user)
+    if request.method == 'POST':
+        form = CsvUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            importer.dry_run = form.cleaned_data['dry_run']
+            result = importer.run(form.cleaned_data['file'])
+    else:
+        form = CsvUploadForm()
+    
+    return render(request, 'imports/csv_import.html', {
+        'title': 'Import Investments',
+        'form': form,
+        'result': result,
+        'columns': importer.columns,
+        'required_columns': importer.required_columns,
+        'back_url': reverse('investments:investor_portfolio'),
+    })
@@ -29,7 +29,7 @@ class ProjectForm(forms.ModelForm):
             
             # Startup field logic
             if self.user.role == 'founder':
-                self.fields['startup'].queryset = self.user.founded_startups.all()
+                self.fields['startup'].queryset = Startup.objects.for_user(self.user)
                 print(f"DEBUG: Founder startups: {self.fields['startup'].queryset.count()}")
             elif self.user.role == 'manager':
                 self.fields['startup'].queryset = Startup.objects.all()
@@ -3,9 +3,21 @@ from django.db import models
 from django.utils import timezone
 from startups.models import Startup
 from django.contrib.auth import get_user_model
+from venture_manager.access import user_scope
 
 CustomUser = get_user_model()
 
+
+class ProjectQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Projects the user's role reaches; team members see those they have tasks in"""
+        scope = user_scope(user)
+        if scope.role == 'team_member':
+            return self.filter(pk__in=user.tasks.values('project_id'))
+        if scope.role == 'investor':
+            return self.none()
+        return scope.by_startup(self)
+
 class Project(models.Model):
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
@@ -43,6 +55,18 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ProjectQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['startup', 'status'], name='project_startup_status_idx'),
+            # Sort keys of the manager project list (venture_manager.listing), id breaking ties
+            models.Index(fields=['created_at', 'id'], name='project_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='project_updated_idx'),
+            models.Index(fields=['name', 'id'], name='project_name_idx'),
+            models.Index(fields=['progress', 'id'], name='project_progress_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.name} - {self.startup.name}"
     
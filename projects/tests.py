@@ -1,3 +1,110 @@
+from datetime import date
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+
+from funding.models import FundingApplication
+from investments.models import Investment
+from startups.models import Startup
+from tasks.models import Task
+from venture_manager.access import can_access, user_scope
+from .models import Project
+
+User = get_user_model()
+
+
+class ScopedAccessTests(TestCase):
+    def setUp(self):
+        self.users = {
+            role: User.objects.create_user(
+                username=role, email=f"{role}@example.com", password="testpass", role=role
+            )
+            for role in ('manager', 'founder', 'investor', 'team_member')
+        }
+        self.other_founder = User.objects.create_user(
+            username="other", email="other@example.com", password="testpass", role="founder"
+        )
+        self.mine = self.make_startup("Mine", self.users['founder'])
+        self.theirs = self.make_startup("Theirs", self.other_founder)
+        self.my_project = Project.objects.create(name="Mine P", description="-", startup=self.mine)
+        self.their_project = Project.objects.create(name="Theirs P", description="-", startup=self.theirs)
+        self.my_task = Task.objects.create(
+            title="T1", description="-", project=self.my_project, assigned_to=self.users['team_member'],
+        )
+        self.their_task = Task.objects.create(
+            title="T2", description="-", project=self.their_project, assigned_to=self.other_founder,
+        )
+        self.investment = Investment.objects.create(
+            investor=self.users['investor'], startup=self.theirs, amount=1000, equity=1,
+            valuation=100000, round='seed', investment_date=date(2024, 1, 1),
+        )
+        self.application = FundingApplication.objects.create(
+            startup=self.mine, funding_round='seed', amount=5000, pitch="-", use_of_funds="-", milestones="-",
+        )
+
+    def make_startup(self, name, founder):
+        return Startup.objects.create(
+            name=name, description="-", industry="tech", stage="seed", founding_date=date(2020, 1, 1),
+            location="Lagos", market="B2B", founder=founder,
+        )
+
+    def visible(self, model, role):
+        return set(model.objects.for_user(self.users[role]).values_list('pk', flat=True))
+
+    def test_for_user_by_role(self):
+        self.assertEqual(self.visible(Startup, 'manager'), {self.mine.pk, self.theirs.pk})
+        self.assertEqual(self.visible(Startup, 'founder'), {self.mine.pk})
+        self.assertEqual(self.visible(Project, 'founder'), {self.my_project.pk})
+        self.assertEqual(self.visible(Task, 'founder'), {self.my_task.pk})
+        self.assertEqual(self.visible(FundingApplication, 'founder'), {self.application.pk})
+        self.assertEqual(self.visible(Investment, 'founder'), set())
+
+        self.assertEqual(self.visible(Startup, 'investor'), {self.theirs.pk})
+        self.assertEqual(self.visible(Investment, 'investor'), {self.investment.pk})
+        self.assertEqual(self.visible(Project, 'investor'), set())
+
+        self.assertEqual(self.visible(Task, 'team_member'), {self.my_task.pk})
+        self.assertEqual(self.visible(Project, 'team_member'), {self.my_project.pk})
+        self.assertEqual(self.visible(Startup, 'team_member'), {self.mine.pk})
+        self.assertEqual(self.visible(FundingApplication, 'team_member'), set())
+
+    def test_check_is_one_query_whatever_the_portfolio_size(self):
+        founder = self.users['founder']
+        for i in range(40):
+            self.make_startup(f"Extra {i}", founder)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(can_access(founder, self.my_project))
+        with self.assertNumQueries(1):
+            self.assertFalse(can_access(founder, self.their_project))
+        # Answers and the scope are memoized on the user for the request
+        with self.assertNumQueries(0):
+            self.assertTrue(can_access(founder, self.my_project))
+            self.assertIs(user_scope(founder), user_scope(founder))
+
+    @skipUnless(connection.vendor == 'sqlite', 'SQLite query plan')
+    def test_check_uses_the_primary_key_and_founder_indexes(self):
+        founder = self.users['founder']
+        plan = Project.objects.for_user(founder).filter(pk=self.my_project.pk).explain()
+        self.assertIn('USING INTEGER PRIMARY KEY', plan)
+        self.assertIn('USING COVERING INDEX startups_startup_founder_id', plan)
+        self.assertNotIn('SCAN', plan)
+
+    def test_founder_views_refuse_other_startups(self):
+        self.client.force_login(self.users['founder'])
+        response = self.client.get(reverse('projects:founder_project_detail', args=[self.their_project.pk]))
+        self.assertRedirects(response, reverse('dashboard_redirect'), fetch_redirect_response=False)
+        self.assertEqual(
+            self.client.get(reverse('projects:founder_project_detail', args=[self.my_project.pk])).status_code, 200,
+        )
+
+        self.client.post(reverse('startups:startup_delete', args=[self.theirs.pk]))
+        self.assertTrue(Startup.objects.filter(pk=self.theirs.pk).exists())
 
-# Create your tests here.
+    def test_team_member_project_list(self):
+        self.client.force_login(self.users['team_member'])
+        response = self.client.get(reverse('projects:team_projects'))
+        self.assertEqual(list(response.context['projects']), [self.my_project])
@@ -9,6 +9,8 @@ from .models import Project
 from tasks.models import Task
 from .forms import ProjectForm
 from tasks.forms import TaskCreateForm
+from venture_manager.access import can_access
+from venture_manager.listing import ListQuery, ListFilter, id_filter
 
 
 @login_required
@@ -32,11 +34,11 @@ def project_list(request):
         })
     
     elif request.user.role.lower() == 'founder':
-        projects = Project.objects.filter(startup__in=request.user.founded_startups.all())
+        projects = Project.objects.for_user(request.user)
         return render(request, 'founder/projects.html', {'projects': projects})
     
     elif request.user.role.lower() == 'team_member':
-        projects = request.user.projects.all()
+        projects = Project.objects.for_user(request.user)
         return render(request, 'team/projects.html', {'projects': projects})
     
     else:
@@ -48,7 +50,7 @@ def project_detail(request, pk):
     project = get_object_or_404(Project, pk=pk)
     
     # Check permissions
-    if request.user.role.lower() == 'founder' and project.startup not in request.user.founded_startups.all():
+    if request.user.role.lower() == 'founder' and not can_access(request.user, project):
         messages.error(request, 'You do not have permission to view this project.')
         return redirect('dashboard_redirect')
     
@@ -73,7 +75,7 @@ def project_archive(request, pk):
         return redirect('dashboard_redirect')
     
     if request.user.role.lower() == 'founder':
-        if project.startup not in request.user.founded_startups.all():
+        if not can_access(request.user, project):
             messages.error(request, 'You do not have permission to archive this project.')
             return redirect('dashboard_redirect')
     
@@ -109,7 +111,7 @@ def project_delete(request, pk):
         pass
     elif request.user.role.lower() == 'founder':
         # Founders can only delete projects from their startups
-        if project.startup not in request.user.founded_startups.all():
+        if not can_access(request.user, project):
             messages.error(request, 'You do not have permission to delete this project.')
             return redirect('dashboard_redirect')
     else:
@@ -154,7 +156,7 @@ def project_create_edit(request, pk=None):
         
         # Check edit permissions
         if request.user.role.lower() == 'founder':
-            if project.startup not in request.user.founded_startups.all():
+            if not can_access(request.user, project):
                 messages.error(request, 'You do not have permission to edit this project.')
                 return redirect('dashboard_redirect')
     
@@ -190,6 +192,21 @@ def project_create_edit(request, pk=None):
     })
 
 # New manager-specific views
+def _project_json(project):
+    return {
+        'id': project.id,
+        'name': project.name,
+        'startup': project.startup.name,
+        'startup_id': project.startup_id,
+        'status': project.status,
+        'priority': project.priority,
+        'progress': project.progress,
+        'task_count': project.task_count,
+        'completed_tasks': project.completed_tasks,
+        'created_at': project.created_at.isoformat(),
+    }
+
+
 @login_required
 def manager_projects(request):
     """Manager-specific projects view with enhanced analytics"""
@@ -197,23 +214,39 @@ def manager_projects(request):
         messages.error(request, 'Access denied.')
         return redirect('dashboard_redirect')
     
-    projects = Project.objects.select_related('startup').annotate(
-        task_count=Count('tasks'),
-        completed_tasks=Count('tasks', filter=Q(tasks__status='completed'))
-    ).order_by('-created_at')
-    
-    # Calculate all statistics
-    total_projects = projects.count()
-    active_projects = projects.filter(status='in_progress').count()
-    completed_projects = projects.filter(status='completed').count()
-    delayed_projects = projects.filter(status='delayed').count()
-    on_hold_projects = projects.filter(status='on_hold').count()
-    not_started_projects = projects.filter(status='not_started').count()
-    
-    # Priority counts
-    high_priority_projects = projects.filter(priority='high').count()
-    medium_priority_projects = projects.filter(priority='medium').count()
-    low_priority_projects = projects.filter(priority='low').count()
+    listing = ListQuery(
+        request,
+        Project.objects.select_related('startup').annotate(
+            task_count=Count('tasks'),
+            completed_tasks=Count('tasks', filter=Q(tasks__status='completed'))
+        ),
+        sort_keys={'created': 'created_at', 'updated': 'updated_at', 'name': 'name', 'progress': 'progress'},
+        default_sort='-created',
+        filters={
+            'status': ListFilter('status', Project.STATUS_CHOICES),
+            'priority': ListFilter('priority', Project.PRIORITY_CHOICES),
+            'startup': id_filter('startup_id'),
+        },
+    )
+    projects = listing.page()
+    
+    if listing.wants_json():
+        return listing.json_response(projects, _project_json)
+    
+    # All statistics in a single aggregate
+    stats = Project.objects.aggregate(
+        total_projects=Count('id'),
+        active_projects=Count('id', filter=Q(status='in_progress')),
+        completed_projects=Count('id', filter=Q(status='completed')),
+        delayed_projects=Count('id', filter=Q(status='delayed')),
+        on_hold_projects=Count('id', filter=Q(status='on_hold')),
+        not_started_projects=Count('id', filter=Q(status='not_started')),
+        high_priority_projects=Count('id', filter=Q(priority='high')),
+        medium_priority_projects=Count('id', filter=Q(priority='medium')),
+        low_priority_projects=Count('id', filter=Q(priority='low')),
+    )
+    total_projects = stats['total_projects']
+    active_projects = stats['active_projects']
     
     # Calculate active rate
     active_rate = (active_projects / total_projects * 100) if total_projects > 0 else 0
@@ -224,18 +257,11 @@ def manager_projects(request):
     
     return render(request, 'manager/projects.html', {
         'projects': projects,
-        'total_projects': total_projects,
-        'active_projects': active_projects,
-        'completed_projects': completed_projects,
-        'delayed_projects': delayed_projects,
-        'on_hold_projects': on_hold_projects,
-        'not_started_projects': not_started_projects,
-        'high_priority_projects': high_priority_projects,
-        'medium_priority_projects': medium_priority_projects,
-        'low_priority_projects': low_priority_projects,
+        **stats,
         'active_rate': active_rate,
         'project_status_choices': project_status_choices,
         'project_priority_choices': project_priority_choices,
+        **listing.context(),
     })
     
     
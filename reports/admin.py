@@ -1,11 +1,35 @@
 # reports/admin.py
+from django import forms
 from django.contrib import admin
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils.html import format_html
 import json
+from .exports import REPORTS
 from .models import Report
 
+
+class ReportAdminForm(forms.ModelForm):
+    # Report.content is a property backed by ReportPayload, not a model field
+    content = forms.JSONField(encoder=DjangoJSONEncoder, required=False)
+
+    class Meta:
+        model = Report
+        fields = ('name', 'report_type', 'generated_by', 'file')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial['content'] = self.instance.content
+
+    def save(self, commit=True):
+        if 'content' in self.changed_data or not self.instance.pk:
+            self.instance.content = self.cleaned_data['content']
+        return super().save(commit)
+
+
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
+    form = ReportAdminForm
     list_display = (
         'name',
         'report_type_display',
@@ -92,11 +116,11 @@ class ReportAdmin(admin.ModelAdmin):
     file_link_display.allow_tags = True
     
     def content_preview(self, obj):
-        """Display a preview of the JSON content"""
-        if obj.content:
+        """Display a preview of the JSON content, from the summary so the payload is not loaded"""
+        if obj.summary:
             try:
                 # Format JSON for display, limit to 200 characters
-                formatted_content = json.dumps(obj.content, indent=2)
+                formatted_content = json.dumps(obj.summary, indent=2, cls=DjangoJSONEncoder)
                 preview = formatted_content[:200] + "..." if len(formatted_content) > 200 else formatted_content
                 return format_html('<pre style="background: #f5f5f5; padding: 10px; border-radius: 3px; overflow-x: auto; font-size: 12px;">{}</pre>', preview)
             except (TypeError, ValueError):
@@ -106,8 +130,8 @@ class ReportAdmin(admin.ModelAdmin):
     content_preview.allow_tags = True
     
     def download_report(self, request, queryset):
-        """Admin action to download selected reports (placeholder for actual implementation)"""
-        self.message_user(request, f'Download functionality would be implemented for {queryset.count()} report(s).')
+        """Admin action to download selected reports, content included, as NDJSON"""
+        return REPORTS.response(queryset.order_by('pk'), 'ndjson')
     download_report.short_description = "Download selected reports"
     
     def generate_sample_data(self, request, queryset):
@@ -0,0 +1,14 @@
+# reports/exports.py
+from venture_manager.exporting import Export
+
+from .models import decompress_content
+
+# content is a nested JSON document; export as NDJSON to keep its structure
+REPORTS = Export('reports', [
+    ('id', 'id'),
+    ('name', 'name'),
+    ('report_type', 'report_type'),
+    ('generated_by', 'generated_by__email'),
+    ('created_at', 'created_at'),
+    ('content', 'payload__data', decompress_content),
+])
@@ -0,0 +1,38 @@
+# reports/management/commands/generate_quarterly_statements.py
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.statements import StatementBatch
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a quarterly Report for every investor, building the statements "
+        "on a pool of worker processes and inserting them in bulk"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--as-of', type=date.fromisoformat, default=None,
+                            help="Quarter end date, YYYY-MM-DD (default today)")
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes (default: one per CPU; 1 runs in this process)")
+        parser.add_argument('--chunk-size', type=int, default=200,
+                            help="Investors per worker task and per bulk insert")
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1")
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be at least 1")
+
+        batch = StatementBatch(as_of=options['as_of'], workers=options['workers'], chunk_size=options['chunk_size'])
+        result = batch.run()
+        self.stdout.write(
+            f"{result['statements']} statement(s) in {result['seconds']}s "
+            f"({result['per_second']}/s on {result['workers']} worker(s))"
+        )
+        if result['skipped']:
+            self.stdout.write(f"Skipped {result['skipped']} investor(s) who already have \"{batch.name}\".")
+        self.stdout.write(self.style.SUCCESS(f'Generated "{batch.name}" for every investor.'))
@@ -1,11 +1,74 @@
 # reports/models.py
-from django.db import models
+import datetime
+import json
+import zlib
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from startups.models import Startup
 from django.contrib.auth import get_user_model
 
 
 CustomUser = get_user_model()
 
+# Top-level scalar values of the content copied into Report.summary
+SUMMARY_KEYS = 12
+
+
+def compress_content(content):
+    return zlib.compress(json.dumps(content, cls=DjangoJSONEncoder).encode('utf-8'))
+
+
+def decompress_content(data):
+    if data is None:
+        return None
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+class SummaryEncoder(DjangoJSONEncoder):
+    """Tags Decimals and dates so SummaryDecoder gives them back as such, not as strings"""
+
+    def default(self, o):
+        if isinstance(o, Decimal):
+            return {'__decimal__': str(o)}
+        if isinstance(o, datetime.datetime):
+            return {'__datetime__': o.isoformat()}
+        if isinstance(o, datetime.date):
+            return {'__date__': o.isoformat()}
+        return super().default(o)
+
+
+class SummaryDecoder(json.JSONDecoder):
+    TYPES = {
+        '__decimal__': Decimal,
+        '__datetime__': datetime.datetime.fromisoformat,
+        '__date__': datetime.date.fromisoformat,
+    }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, object_hook=self.untag, **kwargs)
+
+    def untag(self, obj):
+        if len(obj) == 1:
+            (tag, value), = obj.items()
+            if tag in self.TYPES:
+                return self.TYPES[tag](value)
+        return obj
+
+
+def summarize_content(content):
+    """The first SUMMARY_KEYS scalar values of the report, for list pages"""
+    if not isinstance(content, dict):
+        return {}
+    # Anything but a nested object or list: numbers, Decimals, strings, dates
+    scalars = (
+        (key, value) for key, value in content.items()
+        if not isinstance(value, (dict, list, tuple))
+    )
+    return dict(item for _, item in zip(range(SUMMARY_KEYS), scalars))
+
+
 class Report(models.Model):
     REPORT_TYPE_CHOICES = [
         ('portfolio', 'Portfolio Report'),
@@ -13,13 +76,53 @@ class Report(models.Model):
         ('sector', 'Sector Analysis'),
         ('quarterly', 'Quarterly Review'),
     ]
-    
+
     name = models.CharField(max_length=200)
     report_type = models.CharField(max_length=20, choices=REPORT_TYPE_CHOICES)
     generated_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
-    content = models.JSONField()  # Store report data as JSON
+    # Small precomputed digest of the content; the full payload is in ReportPayload
+    summary = models.JSONField(encoder=SummaryEncoder, decoder=SummaryDecoder, default=dict, blank=True)
     file = models.FileField(upload_to='reports/', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
     def __str__(self):
-        return f"{self.name} - {self.get_report_type_display()}"
\ No newline at end of file
+        return f"{self.name} - {self.get_report_type_display()}"
+
+    @property
+    def content(self):
+        """
+        The report data, decompressed on first access. Loading a Report never
+        reads it, so list pages only pay for the summary; detail views should
+        select_related('payload') to fetch it with the report.
+        """
+        if not hasattr(self, '_content'):
+            try:
+                data = self.payload.data if self.pk else None
+            except ReportPayload.DoesNotExist:
+                data = None
+            self._content = decompress_content(data)
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self._content_changed = True
+        self.summary = summarize_content(value)
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if getattr(self, '_content_changed', False):
+                data = compress_content(self._content)
+                if adding:
+                    ReportPayload.objects.create(report=self, data=data)
+                else:
+                    ReportPayload.objects.update_or_create(report=self, defaults={'data': data})
+        self._content_changed = False
+
+
+class ReportPayload(models.Model):
+    """zlib-compressed JSON content of a Report, kept out of the reports table"""
+    report = models.OneToOneField(Report, on_delete=models.CASCADE, primary_key=True, related_name='payload')
+    data = models.BinaryField()
@@ -0,0 +1,163 @@
+"""
+Report files.
+
+render_report_file() writes a Report's content to Report.file as an HTML
+document, or as a PDF when fmt='pdf' and WeasyPrint is installed.
+
+The content is split into sections: the scalar values as a summary, one
+key/value section per nested object and one table per list. Tables are
+rendered ROWS_PER_CHUNK rows at a time. Each section or chunk's HTML is
+cached under a hash of its template's source and the data it shows.
+Regenerating a report therefore only renders the parts whose data changed -
+for a quarterly pack, usually just the summary with its new generated_at -
+and editing a template retires its cached parts by itself.
+
+The HTML is written part by part to a temporary file and the storage reads
+it from there, so memory use does not grow with the number of rows.
+
+Settings live in settings.REPORT_RENDERING.
+"""
+import hashlib
+import importlib.util
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.template import loader
+from django.utils import timezone
+
+DEFAULTS = {
+    'ROWS_PER_CHUNK': 500,
+    'CACHE_TIMEOUT': 7 * 24 * 3600,
+}
+
+CONTENT_TYPES = {
+    'html': 'text/html; charset=utf-8',
+    'pdf': 'application/pdf',
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'REPORT_RENDERING', {}))
+    return config
+
+
+def pdf_available():
+    return importlib.util.find_spec('weasyprint') is not None
+
+
+def _title(key):
+    return key.replace('_', ' ').capitalize()
+
+
+def _is_scalar(value):
+    return not isinstance(value, (dict, list, tuple))
+
+
+class ReportRenderer:
+    def __init__(self, report, config=None):
+        self.report = report
+        self.config = config or get_config()
+        self.rendered = 0
+        self.reused = 0
+
+    def render_part(self, template_name, context):
+        """HTML of one section or chunk, from the cache when its data and template are unchanged"""
+        template = loader.get_template(template_name)
+        digest = hashlib.sha256(
+            json.dumps(
+                [template.template.source, template_name, context],
+                cls=DjangoJSONEncoder, sort_keys=True,
+            ).encode('utf-8')
+        ).hexdigest()
+        key = f'report-part:{digest}'
+        html = cache.get(key)
+        if html is None:
+            html = template.render(context)
+            cache.set(key, html, self.config['CACHE_TIMEOUT'])
+            self.rendered += 1
+        else:
+            self.reused += 1
+        return html
+
+    def sections(self, content):
+        """(template name, context) of every section of the content, in order"""
+        if not isinstance(content, dict):
+            content = {'content': content}
+        summary = [(_title(key), value) for key, value in content.items() if _is_scalar(value)]
+        if summary:
+            yield 'reports/render/values.html', {'title': 'Summary', 'items': summary}
+
+        for key, value in content.items():
+            if isinstance(value, dict):
+                items = [(_title(name), item) for name, item in value.items()]
+                yield 'reports/render/values.html', {'title': _title(key), 'items': items}
+            elif isinstance(value, (list, tuple)):
+                yield from self.table(_title(key), value)
+
+    def table(self, title, rows):
+        if rows and all(isinstance(row, dict) for row in rows):
+            columns = list(dict.fromkeys(name for row in rows for name in row))
+            rows = [[row.get(name) for name in columns] for row in rows]
+        else:
+            columns = ['Value']
+            rows = [[row] for row in rows]
+
+        size = self.config['ROWS_PER_CHUNK']
+        starts = range(0, len(rows), size) or [0]
+        for start in starts:
+            yield 'reports/render/table.html', {
+                'title': title,
+                'columns': [_title(name) for name in columns],
+                'rows': rows[start:start + size],
+                'first': start == 0,
+                'last': start + size >= len(rows),
+            }
+
+    def parts(self):
+        """The HTML document, one section or table chunk at a time"""
+        report = self.report
+        yield loader.get_template('reports/render/document_start.html').render({'report': report})
+        for template_name, context in self.sections(report.content):
+            yield self.render_part(template_name, context)
+        yield loader.get_template('reports/render/document_end.html').render({
+            'report': report, 'rendered_at': timezone.now(),
+        })
+
+    def write_html(self, target):
+        for part in self.parts():
+            target.write(part.encode('utf-8'))
+
+    def write_pdf(self, target):
+        import weasyprint
+
+        with tempfile.NamedTemporaryFile(suffix='.html') as html:
+            self.write_html(html)
+            html.flush()
+            weasyprint.HTML(filename=html.name).write_pdf(target)
+
+    def save(self, fmt='html'):
+        """Render into Report.file, replacing the previous file; returns the format written"""
+        if fmt == 'pdf' and not pdf_available():
+            fmt = 'html'
+        with tempfile.TemporaryFile() as output:
+            if fmt == 'pdf':
+                self.write_pdf(output)
+            else:
+                self.write_html(output)
+            output.seek(0)
+            if self.report.file:
+                self.report.file.delete(save=False)
+            name = f'report-{self.report.pk}-{timezone.now():%Y%m%d%H%M%S}.{fmt}'
+            self.report.file.save(name, File(output), save=False)
+        self.report.save(update_fields=['file'])
+        return fmt
+
+
+def render_report_file(report, fmt='html'):
+    """Write `report` to Report.file as HTML, or as PDF when available; returns the format written"""
+    return ReportRenderer(report).save(fmt)
@@ -0,0 +1,191 @@
+"""
+Quarterly statements for every investor in one batch.
+
+generate_investor_report_data() builds one investor's report with its own
+queries. To cover thousands of investors at quarter end, StatementBatch:
+
+1. reads the startup data the statements show (name, industry, stage,
+   valuation) once, and hands it to each worker process as it starts;
+2. splits the investors into chunks of `chunk_size`. For each chunk a worker
+   reads the investments with one query, their value and ROI computed in SQL,
+   then builds every statement and compresses its content;
+3. bulk-inserts the Report and ReportPayload rows of each finished chunk from
+   the parent process, the only one that writes.
+
+A statement only counts investments made on or before its as_of date, so
+backdated statements show the portfolio as it was. Investors who already have
+the statement of that date are skipped, so running the batch again only fills
+in the missing ones.
+
+With workers=1 everything runs in the calling process. Bulk inserts need a
+database that returns the new primary keys (SQLite 3.35+, PostgreSQL).
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from itertools import groupby
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from investments.models import Investment
+from startups.models import Startup
+from .models import Report, ReportPayload, compress_content, summarize_content
+
+# Same window as generate_investor_report_data()
+QUARTER_DAYS = 90
+
+# Startup data shared by the statements of a worker process
+_startups = None
+
+
+def startup_data():
+    """{startup id: {...}} for every startup, in one query"""
+    return {
+        pk: {'startup_name': name, 'industry': industry, 'stage': stage, 'startup_valuation': valuation}
+        for pk, name, industry, stage, valuation in Startup.objects.values_list(
+            'pk', 'name', 'industry', 'stage', 'valuation',
+        )
+    }
+
+
+def _roi(invested, value):
+    return (value - invested) / invested * 100 if invested > 0 else 0
+
+
+def build_statement(holdings, quarter_start, as_of, generated_at):
+    """
+    Content of one quarterly statement, with the keys of the quarterly
+    investor report plus the investor's holdings up to as_of
+    """
+    holdings = [holding for holding in holdings if holding['investment_date'] <= as_of]
+    invested = sum(float(holding['amount']) for holding in holdings)
+    value = sum(holding['current_value'] for holding in holdings)
+    recent = [holding for holding in holdings if quarter_start <= holding['investment_date'] <= as_of]
+    recent_invested = sum(float(holding['amount']) for holding in recent)
+    return {
+        'generated_at': generated_at.isoformat(),
+        'date_range': 'all_time',
+        'report_type': 'quarterly',
+        'quarter_start': quarter_start,
+        'new_investments': len(recent),
+        'total_invested_quarter': recent_invested,
+        'portfolio_growth': _roi(recent_invested, sum(holding['current_value'] for holding in recent)),
+        'total_invested': invested,
+        'current_portfolio_value': value,
+        'overall_roi': _roi(invested, value),
+        'holdings': holdings,
+    }
+
+
+def _init_worker(startups):
+    global _startups
+    if not apps.ready:
+        # Spawned rather than forked: set Django up again
+        import django
+        django.setup()
+    _startups = startups
+
+
+def build_chunk(investor_ids, quarter_start, as_of, generated_at):
+    """(investor id, summary, compressed content) for each investor of the chunk"""
+    rows = (
+        Investment.objects.filter(investor_id__in=investor_ids, investment_date__lte=as_of)
+        .with_returns()
+        .order_by('investor_id', 'investment_date', 'pk')
+        .values_list('investor_id', 'startup_id', 'round', 'status', 'investment_date', 'amount', 'market_value', 'roi')
+    )
+    holdings = {investor_id: [] for investor_id in investor_ids}
+    for investor_id, investments in groupby(rows.iterator(), key=lambda row: row[0]):
+        holdings[investor_id] = [
+            {
+                **_startups.get(startup_id, {}),
+                'round': round_, 'status': status, 'investment_date': investment_date,
+                'amount': amount, 'current_value': market_value, 'roi': roi,
+            }
+            for _, startup_id, round_, status, investment_date, amount, market_value, roi in investments
+        ]
+
+    results = []
+    for investor_id in investor_ids:
+        content = build_statement(holdings[investor_id], quarter_start, as_of, generated_at)
+        results.append((investor_id, summarize_content(content), compress_content(content)))
+    return results
+
+
+def _build_chunk_in_worker(args):
+    return build_chunk(*args)
+
+
+class StatementBatch:
+    def __init__(self, as_of=None, workers=1, chunk_size=200):
+        self.generated_at = timezone.now()
+        self.as_of = as_of or timezone.localdate()
+        self.quarter_start = self.as_of - timedelta(days=QUARTER_DAYS)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.name = f"Quarterly Report - {self.as_of:%Y-%m-%d}"
+
+    def investor_ids(self):
+        """(investors without this statement yet, number who already have it)"""
+        existing = Report.objects.filter(report_type='quarterly', name=self.name, generated_by=OuterRef('pk'))
+        rows = (
+            get_user_model().objects.filter(role__iexact='investor')
+            .annotate(has_statement=Exists(existing))
+            .order_by('pk')
+            .values_list('pk', 'has_statement')
+        )
+        ids, skipped = [], 0
+        for pk, has_statement in rows:
+            if has_statement:
+                skipped += 1
+            else:
+                ids.append(pk)
+        return ids, skipped
+
+    def save_chunk(self, results):
+        reports = Report.objects.bulk_create([
+            Report(name=self.name, report_type='quarterly', generated_by_id=investor_id, summary=summary)
+            for investor_id, summary, _ in results
+        ])
+        ReportPayload.objects.bulk_create([
+            ReportPayload(report_id=report.pk, data=data)
+            for report, (_, _, data) in zip(reports, results)
+        ])
+
+    def run(self):
+        """Generate the missing statements; returns {'statements', 'skipped', 'seconds', 'per_second', 'workers'}"""
+        started = time.perf_counter()
+        ids, skipped = self.investor_ids()
+        tasks = [
+            (ids[start:start + self.chunk_size], self.quarter_start, self.as_of, self.generated_at)
+            for start in range(0, len(ids), self.chunk_size)
+        ]
+        startups = startup_data()
+
+        if self.workers > 1 and len(tasks) > 1:
+            # Forked workers must not share the parent's database connection
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(startups,),
+            ) as pool:
+                for results in pool.map(_build_chunk_in_worker, tasks):
+                    with transaction.atomic():
+                        self.save_chunk(results)
+        else:
+            _init_worker(startups)
+            for task in tasks:
+                with transaction.atomic():
+                    self.save_chunk(build_chunk(*task))
+
+        seconds = time.perf_counter() - started
+        return {
+            'statements': len(ids),
+            'skipped': skipped,
+            'seconds': round(seconds, 2),
+            'per_second': round(len(ids) / seconds, 1) if seconds else 0,
+            'workers': self.workers if len(tasks) > 1 else 1,
+        }
@@ -1,3 +1,225 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from decimal import Decimal
+from unittest import skipIf
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .exports import REPORTS
+from investments.models import Investment
+from startups.models import Startup
+from .models import Report, ReportPayload
+from .rendering import ReportRenderer, pdf_available
+from .statements import StatementBatch
+from .views import generate_investor_report_data
+
+User = get_user_model()
+
+
+class ReportContentStorageTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username="manager", email="manager@example.com", password="testpass", role="manager"
+        )
+        self.content = {
+            'report_type': 'performance',
+            'total_projects': 3,
+            'investments': [{'startup_name': f'S{i}', 'roi': i * 1.5} for i in range(500)],
+        }
+        self.report = Report.objects.create(
+            name="Perf", report_type='performance', generated_by=self.manager, content=self.content,
+        )
+
+    def test_content_is_compressed_in_the_payload_table(self):
+        payload = ReportPayload.objects.get(report=self.report)
+        self.assertLess(len(payload.data), len(str(self.content)) / 4)
+        self.assertEqual(self.report.summary, {'report_type': 'performance', 'total_projects': 3})
+        self.assertEqual(Report.objects.get(pk=self.report.pk).content, self.content)
+
+    def test_summary_keeps_decimal_and_date_values(self):
+        self.report.content = {'total_invested': Decimal('1500.50'), 'as_of': date(2024, 3, 31), 'rows': []}
+        self.report.save()
+        summary = Report.objects.get(pk=self.report.pk).summary
+        self.assertEqual(summary, {'total_invested': Decimal('1500.50'), 'as_of': date(2024, 3, 31)})
+
+    def test_loading_reports_does_not_read_the_payload(self):
+        with CaptureQueriesContext(connection) as queries:
+            reports = list(Report.objects.filter(generated_by=self.manager))
+            self.assertEqual(reports[0].summary['total_projects'], 3)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('payload', queries[0]['sql'])
+
+        with self.assertNumQueries(1):
+            report = Report.objects.select_related('payload').get(pk=self.report.pk)
+            self.assertEqual(report.content['investments'][2]['roi'], 3.0)
+
+    def test_changing_content_rewrites_the_payload(self):
+        self.report.content = {'total_projects': 4}
+        self.report.save()
+        report = Report.objects.get(pk=self.report.pk)
+        self.assertEqual(report.content, {'total_projects': 4})
+        self.assertEqual(report.summary, {'total_projects': 4})
+        self.assertEqual(ReportPayload.objects.count(), 1)
+
+    def test_export_decompresses_content(self):
+        response = REPORTS.response(Report.objects.all(), 'ndjson')
+        line = b''.join(response.streaming_content).decode()
+        self.assertIn('"startup_name": "S499"', line)
+
+    def test_generated_report_detail(self):
+        self.client.force_login(self.manager)
+        response = self.client.post(
+            reverse('reports:generate_manager_report'), {'report_type': 'portfolio', 'date_range': 'all_time'},
+        )
+        report = Report.objects.latest('pk')
+        self.assertRedirects(
+            response, reverse('reports:manager_report_detail', args=[report.pk]), fetch_redirect_response=False,
+        )
+        self.assertEqual(report.summary['total_startups'], 0)
+        self.assertEqual(report.content['startups_by_stage'], [])
+
+
+@override_settings(REPORT_RENDERING={'ROWS_PER_CHUNK': 100})
+class ReportRenderingTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        cache.clear()
+
+        self.investor = User.objects.create_user(
+            username="investor", email="investor@example.com", password="testpass", role="investor"
+        )
+        self.report = Report.objects.create(
+            name="Q1 pack", report_type='quarterly', generated_by=self.investor, content=self.pack('2024-04-01'),
+        )
+
+    def pack(self, generated_at):
+        return {
+            'generated_at': generated_at,
+            'new_investments': 450,
+            'totals': {'invested': Decimal('125000.00')},
+            'investments': [{'startup_name': f'Startup {i}', 'roi': i} for i in range(449)] + [
+                {'startup_name': '<b>Acme</b>', 'roi': None},
+            ],
+        }
+
+    def test_file_is_written_in_sections_and_chunks(self):
+        renderer = ReportRenderer(self.report)
+        self.assertEqual(renderer.save('html'), 'html')
+        # Summary, totals and five 100-row chunks of the investments table
+        self.assertEqual((renderer.rendered, renderer.reused), (7, 0))
+
+        with self.report.file.open('rb') as f:
+            html = f.read().decode()
+        self.assertEqual(html.count('<table>'), 3)
+        self.assertEqual(html.count('<td>Startup '), 449)
+        self.assertIn('<td>&lt;b&gt;Acme&lt;/b&gt;</td><td>-</td>', html)
+        self.assertIn('<td>125000.00</td>', html)
+        self.assertTrue(html.rstrip().endswith('</html>'))
+
+    def test_regeneration_reuses_unchanged_sections(self):
+        ReportRenderer(self.report).save('html')
+
+        self.report.content = self.pack('2024-04-02')
+        self.report.save()
+        renderer = ReportRenderer(self.report)
+        renderer.save('html')
+        # Only the summary, with the new generated_at, is rendered again
+        self.assertEqual((renderer.rendered, renderer.reused), (1, 6))
+        # The previous file is replaced, not left behind
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, 'reports'))), 1)
+
+    @skipIf(pdf_available(), 'WeasyPrint is installed')
+    def test_pdf_falls_back_to_html_without_a_renderer(self):
+        self.assertEqual(ReportRenderer(self.report).save('pdf'), 'html')
+        self.assertTrue(self.report.file.name.endswith('.html'))
+
+    def test_generate_and_download(self):
+        self.client.force_login(self.investor)
+        response = self.client.post(reverse('reports:generate_investor_report'), {
+            'report_type': 'performance', 'date_range': 'all_time', 'format': 'html',
+        })
+        report = Report.objects.latest('pk')
+        download = reverse('reports:download_report', args=[report.pk])
+        self.assertRedirects(response, download, fetch_redirect_response=False)
+
+        response = self.client.get(download)
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertIn('attachment', response['Content-Disposition'])
+        self.assertIn(b'Performance', b''.join(response.streaming_content))
+
+
+class QuarterlyStatementTests(TestCase):
+    def setUp(self):
+        founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        self.startup = Startup.objects.create(
+            name="Acme", description="-", industry="tech", stage="seed", founding_date=date(2020, 1, 1),
+            location="Lagos", market="B2B", founder=founder, valuation=2000000,
+        )
+        self.investors = [
+            User.objects.create_user(
+                username=f"investor{i}", email=f"investor{i}@example.com", password="testpass", role="investor"
+            )
+            for i in range(5)
+        ]
+        today = date.today()
+        for i, investor in enumerate(self.investors[:4]):
+            for days_ago in (30, 400):
+                Investment.objects.create(
+                    investor=investor, startup=self.startup, amount=1000 * (i + 1), equity=1,
+                    valuation=100000, current_valuation=150000 * (i + 1), round='seed',
+                    investment_date=today - timedelta(days=days_ago),
+                )
+
+    def test_statements_match_the_quarterly_investor_report(self):
+        call_command('generate_quarterly_statements', workers=1, chunk_size=2, stdout=StringIO())
+
+        reports = Report.objects.filter(report_type='quarterly').select_related('payload')
+        self.assertEqual({report.generated_by_id for report in reports}, {investor.pk for investor in self.investors})
+        for investor in self.investors:
+            statement = reports.get(generated_by=investor).content
+            expected = generate_investor_report_data('quarterly', 'all_time', investor)
+            self.assertEqual(statement['new_investments'], expected['new_investments'])
+            self.assertAlmostEqual(statement['total_invested_quarter'], float(expected['total_invested_quarter']))
+            self.assertAlmostEqual(statement['portfolio_growth'], expected['portfolio_growth'])
+
+        statement = reports.get(generated_by=self.investors[1]).content
+        self.assertEqual(len(statement['holdings']), 2)
+        self.assertEqual(statement['holdings'][0]['startup_name'], 'Acme')
+        self.assertEqual(statement['holdings'][0]['current_value'], 3000.0)
+        self.assertEqual(reports.get(generated_by=self.investors[1]).summary['new_investments'], 1)
+
+    def test_queries_do_not_grow_with_investors(self):
+        # Investors, startups, then per chunk one read and two inserts in a savepoint
+        with self.assertNumQueries(7):
+            StatementBatch(chunk_size=10).run()
+        self.assertEqual(ReportPayload.objects.count(), 5)
+
+    def test_backdated_statement_leaves_out_later_investments(self):
+        as_of = date.today() - timedelta(days=100)
+        StatementBatch(as_of=as_of).run()
+        statement = Report.objects.get(generated_by=self.investors[1], name=f"Quarterly Report - {as_of:%Y-%m-%d}").content
+        self.assertEqual(len(statement['holdings']), 1)
+        self.assertEqual(statement['total_invested'], 2000.0)
+        self.assertEqual(statement['new_investments'], 0)
+
+    def test_second_run_for_the_same_date_skips_existing_statements(self):
+        StatementBatch().run()
+        Report.objects.filter(generated_by=self.investors[0]).delete()
+        result = StatementBatch().run()
+        self.assertEqual((result['statements'], result['skipped']), (1, 4))
+        self.assertEqual(Report.objects.filter(report_type='quarterly').count(), 5)
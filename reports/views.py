@@ -1,7 +1,7 @@
 # apps/reports/views.py
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, JsonResponse
 from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Count, Sum, Avg, Q
@@ -10,6 +10,7 @@ import json
 from datetime import datetime, timedelta
 
 from .models import Report
+from .rendering import CONTENT_TYPES, render_report_file
 from startups.models import Startup
 from projects.models import Project
 from tasks.models import Task
@@ -188,6 +189,7 @@ def generate_investor_report(request):
     if request.method == 'POST':
         report_type = request.POST.get('report_type')
         date_range = request.POST.get('date_range', 'all_time')
+        format_type = request.POST.get('format', 'web')
         
         # Generate investor-specific report data
         report_data = generate_investor_report_data(report_type, date_range, request.user)
@@ -202,6 +204,11 @@ def generate_investor_report(request):
             content=report_data
         )
         
+        if format_type in CONTENT_TYPES:
+            render_report_file(report, format_type)
+            messages.success(request, f'{report_name} generated and ready for download!')
+            return redirect('reports:download_report', pk=report.pk)
+        
         messages.success(request, f'{report_name} generated successfully!')
         return redirect('reports:investor_reports')
     
@@ -211,7 +218,7 @@ def generate_investor_report(request):
 @login_required
 def report_detail(request, pk):
     """View detailed report"""
-    report = get_object_or_404(Report, pk=pk)
+    report = get_object_or_404(Report.objects.select_related('payload'), pk=pk)
     
     # Check permissions - users can only view their own reports
     if report.generated_by != request.user:
@@ -236,9 +243,12 @@ def download_report(request, pk):
         return JsonResponse({'error': 'Access denied'}, status=403)
     
     if report.file:
-        response = HttpResponse(report.file.read(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{report.name}.pdf"'
-        return response
+        # Streamed from storage in chunks rather than read into memory
+        extension = report.file.name.rsplit('.', 1)[-1].lower()
+        return FileResponse(
+            report.file.open('rb'), as_attachment=True, filename=f'{report.name}.{extension}',
+            content_type=CONTENT_TYPES.get(extension, 'application/octet-stream'),
+        )
     else:
         messages.error(request, 'No file available for download.')
         return redirect('reports:report_detail', pk=pk)
@@ -327,10 +337,9 @@ def generate_manager_report(request):
             content=report_data
         )
         
-        if format_type == 'pdf':
-            # Generate PDF (you'd implement this with reportlab or similar)
-            # pdf_file = generate_pdf_report(report_data)
-            # report.file.save(f'{report_name}.pdf', ContentFile(pdf_file))
+        if format_type in CONTENT_TYPES:
+            # PDF when a renderer is installed, HTML otherwise
+            render_report_file(report, format_type)
             messages.success(request, f'{report_name} generated and ready for download!')
             return redirect('reports:download_report', pk=report.pk)
         else:
@@ -343,18 +352,17 @@ def generate_manager_report(request):
 @login_required
 def manager_report_detail(request, pk):
     """Manager-specific report detail view"""
-    report = get_object_or_404(Report, pk=pk)
+    report = get_object_or_404(Report.objects.select_related('payload'), pk=pk)
     
     # Check permissions
     if report.generated_by != request.user:
         messages.error(request, 'You do not have permission to view this report.')
         return redirect('reports:manager_reports')
     
-    # Parse report content for display
-    try:
-        report_data = json.loads(report.content)
-    except:
-        report_data = {'error': 'Could not parse report data'}
+    # Decompressed here, the only page that shows the full content
+    report_data = report.content
+    if report_data is None:
+        report_data = {'error': 'Report data is missing'}
     
     return render(request, 'manager/report_detail.html', {
         'report': report,
@@ -541,16 +549,15 @@ def generate_investor_report_data(report_type, date_range, user):
     
     if report_type == 'portfolio':
         # Investor portfolio report
-        total_invested = investments.aggregate(Sum('amount'))['amount__sum'] or 0
-        portfolio_value = sum(inv.current_value for inv in investments)
+        summary = investments.performance_summary()
         
         report_data.update({
-            'total_investments': investments.count(),
-            'total_invested': total_invested,
-            'current_portfolio_value': portfolio_value,
-            'total_return': portfolio_value - total_invested,
-            'overall_roi': ((portfolio_value - total_invested) / total_invested * 100) if total_invested > 0 else 0,
-            'active_investments': investments.filter(status='active').count(),
+            'total_investments': summary['total_count'],
+            'total_invested': summary['total_invested'],
+            'current_portfolio_value': summary['current_value'],
+            'total_return': summary['current_value'] - summary['total_invested'],
+            'overall_roi': summary['total_roi'],
+            'active_investments': summary['active_count'],
             'investments_by_round': list(investments.values('round').annotate(
                 count=Count('id'),
                 total_amount=Sum('amount')
@@ -560,34 +567,32 @@ def generate_investor_report_data(report_type, date_range, user):
     elif report_type == 'performance':
         # Investment performance report
         performance_data = []
-        for investment in investments:
+        for investment in investments.with_returns():
             performance_data.append({
                 'startup_name': investment.startup.name,
                 'industry': investment.startup.industry,
                 'investment_amount': float(investment.amount),
-                'current_value': float(investment.current_value),
+                'current_value': investment.market_value,
                 'roi': investment.roi,
                 'status': investment.status,
             })
         
         report_data['investments'] = performance_data
-        report_data['average_roi'] = sum(inv.roi for inv in investments) / len(investments) if investments else 0
+        report_data['average_roi'] = investments.performance_summary()['avg_roi']
         
     elif report_type == 'sector':
         # Sector analysis for investor
+        industry_labels = dict(Startup.INDUSTRY_CHOICES)
         sector_analysis = []
-        for industry in Startup.INDUSTRY_CHOICES:
-            industry_investments = investments.filter(startup__industry=industry[0])
-            if industry_investments:
-                total_invested = industry_investments.aggregate(Sum('amount'))['amount__sum'] or 0
-                current_value = sum(inv.current_value for inv in industry_investments)
-                sector_analysis.append({
-                    'industry': industry[1],
-                    'investment_count': industry_investments.count(),
-                    'total_invested': total_invested,
-                    'current_value': current_value,
-                    'average_roi': ((current_value - total_invested) / total_invested * 100) if total_invested > 0 else 0,
-                })
+        for row in investments.performance_by('startup__industry'):
+            total_invested = float(row['total_invested'] or 0)
+            sector_analysis.append({
+                'industry': industry_labels.get(row['startup__industry'], row['startup__industry']),
+                'investment_count': row['count'],
+                'total_invested': total_invested,
+                'current_value': row['current_value'],
+                'average_roi': ((row['current_value'] - total_invested) / total_invested * 100) if total_invested > 0 else 0,
+            })
         
         report_data['sector_analysis'] = sector_analysis
         
@@ -608,9 +613,4 @@ def calculate_portfolio_growth(investments, since_date):
     """Calculate portfolio growth since a specific date"""
     # This is a simplified calculation
     # In a real application, you'd track historical valuation data
-    recent_investments = investments.filter(investment_date__gte=since_date)
-    if recent_investments:
-        total_invested = recent_investments.aggregate(Sum('amount'))['amount__sum'] or 0
-        current_value = sum(inv.current_value for inv in recent_investments)
-        return ((current_value - total_invested) / total_invested * 100) if total_invested > 0 else 0
-    return 0
\ No newline at end of file
+    return investments.filter(investment_date__gte=since_date).performance_summary()['total_roi']
\ No newline at end of file
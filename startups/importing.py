@@ -0,0 +1,85 @@
+# startups/importing.py
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from venture_manager.importing import CsvImporter
+
+from .forms import StartupCreateForm
+from .models import Startup
+
+CustomUser = get_user_model()
+
+
+class StartupReferences:
+    """
+    Startups referred to by id or exact name, looked up in one query.
+    get() raises ValidationError for unknown or ambiguous references.
+    """
+
+    def __init__(self, references):
+        references = {reference for reference in references if reference}
+        ids = {int(reference) for reference in references if reference.isdigit()}
+        names = references - {str(pk) for pk in ids}
+        self.by_id = {}
+        self.by_name = {}
+        if ids or names:
+            for pk, name in Startup.objects.filter(Q(pk__in=ids) | Q(name__in=names)).values_list('pk', 'name'):
+                self.by_id[str(pk)] = pk
+                self.by_name.setdefault(name, []).append(pk)
+
+    def get(self, reference):
+        if reference in self.by_id:
+            return self.by_id[reference]
+        matches = self.by_name.get(reference, [])
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            raise ValidationError(f"startup: '{reference}' matches {len(matches)} startups; use its id.")
+        raise ValidationError(f"startup: no startup with id or name '{reference}'.")
+
+
+class StartupImportForm(StartupCreateForm):
+    """StartupCreateForm without the logo upload"""
+
+    class Meta(StartupCreateForm.Meta):
+        fields = (
+            'name', 'description', 'industry', 'stage', 'founding_date',
+            'website', 'location', 'team_size', 'market',
+            'monthly_revenue', 'valuation'
+        )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Left blank, these take the model defaults
+        for name in ('team_size', 'monthly_revenue', 'valuation'):
+            self.fields[name].required = False
+
+
+class StartupImporter(CsvImporter):
+    """
+    One startup per row. Managers also give `founder`, the founder's email;
+    founders import their own startups.
+    """
+    model = Startup
+    form_class = StartupImportForm
+
+    @property
+    def reference_columns(self):
+        return ('founder',) if self.user.role == 'manager' else ()
+
+    def resolve(self, rows):
+        if not self.reference_columns:
+            return {}
+        emails = {row.get('founder', '') for row in rows}
+        return {'founders': dict(
+            CustomUser.objects.filter(email__in=emails, role='founder').values_list('email', 'pk')
+        )}
+
+    def attach(self, instance, row, references):
+        if 'founders' not in references:
+            instance.founder_id = self.user.pk
+            return
+        instance.founder_id = references['founders'].get(row.get('founder', ''))
+        if instance.founder_id is None:
+            raise ValidationError(f"founder: no founder with email '{row.get('founder', '')}'.")
@@ -1,9 +1,19 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from venture_manager.access import user_scope
 
 CustomUser = get_user_model()
 
 
+class StartupQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Startups the user's role reaches (see venture_manager.access)"""
+        scope = user_scope(user)
+        if scope.is_manager:
+            return self.all()
+        return self.filter(pk__in=scope.startup_ids)
+
+
 class Startup(models.Model):
     INDUSTRY_CHOICES = [
         ('tech', 'Technology'),
@@ -49,5 +59,16 @@ class Startup(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = StartupQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Sort keys of the manager startup list (venture_manager.listing), id breaking ties
+            models.Index(fields=['created_at', 'id'], name='startup_created_idx'),
+            models.Index(fields=['name', 'id'], name='startup_name_idx'),
+            models.Index(fields=['valuation', 'id'], name='startup_valuation_idx'),
+            models.Index(fields=['monthly_revenue', 'id'], name='startup_revenue_idx'),
+        ]
+
     def __str__(self):
         return self.name
@@ -1,3 +1,101 @@
+import io
+from datetime import date
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+
+from .importing import StartupImporter
+from .models import Startup
+
+User = get_user_model()
+
+
+class ManagerStartupListTests(TestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(
+            username="manager", email="manager@example.com", password="testpass", role="manager"
+        )
+        self.founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        for i in range(30):
+            Startup.objects.create(
+                name=f"Startup {i:02d}", description="Test", industry="tech" if i % 2 else "finance",
+                stage="seed" if i < 20 else "idea", founding_date=date(2020, 1, 1),
+                location="Lagos", market="B2B", founder=self.founder, valuation=i * 1000,
+            )
+        self.client.force_login(self.manager)
+        self.url = reverse('startups:manager_startup_list')
+
+    def test_keyset_pages_cover_every_startup_once(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        page = response.context['startups']
+        self.assertEqual(len(page), 25)
+        self.assertFalse(page.has_previous())
+        self.assertEqual(response.context['stage_counts']['seed'], 20)
+        self.assertEqual(response.context['total_startups'], 30)
+
+        second = self.client.get(f"{self.url}?{page.next_query}").context['startups']
+        self.assertEqual(len(second), 5)
+        self.assertFalse(second.has_next())
+        self.assertEqual(len({s.pk for s in list(page) + list(second)}), 30)
+
+        back = self.client.get(f"{self.url}?{second.previous_query}").context['startups']
+        self.assertEqual([s.pk for s in back], [s.pk for s in page])
+
+    def test_json_sort_and_filters(self):
+        data = self.client.get(self.url, {
+            'format': 'json', 'sort': '-valuation', 'industry': 'tech', 'page_size': 5,
+        }).json()
+        self.assertEqual(data['filters'], {'industry': 'tech'})
+        self.assertEqual([row['name'] for row in data['results']][:2], ['Startup 29', 'Startup 27'])
+        self.assertEqual(len(data['results']), 5)
+
+        following = self.client.get(self.url, {
+            'format': 'json', 'sort': '-valuation', 'industry': 'tech', 'page_size': 5,
+            'after': data['next'],
+        }).json()
+        self.assertEqual(following['results'][0]['name'], 'Startup 19')
+
+    def test_unknown_sort_and_bad_cursor_fall_back(self):
+        data = self.client.get(self.url, {
+            'format': 'json', 'sort': 'founder__password', 'after': 'tampered', 'stage': 'bogus',
+        }).json()
+        self.assertEqual(data['sort'], '-created')
+        self.assertEqual(data['filters'], {})
+        self.assertEqual(len(data['results']), 25)
+
+    def test_cursor_from_another_sort_is_ignored(self):
+        by_name = self.client.get(self.url, {'format': 'json', 'sort': 'name', 'page_size': 5}).json()
+        response = self.client.get(self.url, {'format': 'json', 'sort': '-created', 'after': by_name['next']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['name'], 'Startup 29')
+
+
+class StartupImportTests(TestCase):
+    def setUp(self):
+        self.founder = User.objects.create_user(
+            username="founder", email="founder@example.com", password="testpass", role="founder"
+        )
+        self.header = 'name,description,industry,stage,founding_date,location,market,team_size'
+
+    def test_founder_imports_own_startups_with_defaults(self):
+        csv_file = io.BytesIO('\n'.join([
+            self.header,
+            'Acme,Widgets,tech,seed,2021-03-01,Lagos,B2B,',
+            'Bolt,Rides,transport,seed,2021-03-01,Nairobi,B2C,4',
+        ]).encode('utf-8-sig'))
+        result = StartupImporter(self.founder).run(csv_file)
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.errors[0][0], 3)
+        self.assertIn('industry', result.errors[0][1])
+        startup = Startup.objects.get()
+        self.assertEqual((startup.name, startup.founder, startup.team_size), ('Acme', self.founder, 1))
 
-# Create your tests here.
+    def test_missing_required_column_imports_nothing(self):
+        result = StartupImporter(self.founder).run(io.BytesIO(b'name,description\nAcme,Widgets\n'))
+        self.assertEqual(result.created, 0)
+        self.assertEqual(result.errors[0][0], 1)
+        self.assertIn('industry', result.errors[0][1])
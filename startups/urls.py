@@ -8,6 +8,7 @@ urlpatterns = [
     # Generic URLs that work for all roles
     path('<int:pk>/edit/', views.startup_edit, name='startup_edit'),
     path('<int:pk>/delete/', views.startup_delete, name='startup_delete'),
+    path('import/', views.startup_import, name='startup_import'),
     
     # Manager URLs
     path('manager/', views.manager_startup_list, name='manager_startup_list'),
@@ -1,39 +1,77 @@
+import logging
+
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.db.models import Count
 from .models import Startup
 from .forms import StartupCreateForm, StartupEditForm
+from .importing import StartupImporter
+from django.urls import reverse
+from venture_manager.access import can_access
+from venture_manager.importing import CsvUploadForm
+from venture_manager.listing import ListQuery, ListFilter, boolean_filter
 from django.core.paginator import Paginator
 
+logger = logging.getLogger(__name__)
+
 # ==============================
 # 🔹 Manager-Specific Views
 # ==============================
 
+def _startup_json(startup):
+    return {
+        'id': startup.id,
+        'name': startup.name,
+        'industry': startup.industry,
+        'stage': startup.stage,
+        'is_active': startup.is_active,
+        'founder': startup.founder.get_full_name() or startup.founder.email,
+        'valuation': str(startup.valuation),
+        'monthly_revenue': str(startup.monthly_revenue),
+        'project_count': startup.project_count,
+        'task_count': startup.task_count,
+        'created_at': startup.created_at.isoformat(),
+    }
+
 @login_required
 def manager_startup_list(request):
     if request.user.role.lower() != 'manager':
         messages.error(request, 'Access denied.')
         return redirect('dashboard_redirect')
     
-    startups = Startup.objects.all().annotate(
-        project_count=Count('projects', distinct=True),
-        task_count=Count('projects__tasks', distinct=True)
-    ).order_by('-created_at')
+    listing = ListQuery(
+        request,
+        Startup.objects.select_related('founder').annotate(
+            project_count=Count('projects', distinct=True),
+            task_count=Count('projects__tasks', distinct=True)
+        ),
+        sort_keys={
+            'created': 'created_at', 'name': 'name',
+            'valuation': 'valuation', 'revenue': 'monthly_revenue',
+        },
+        default_sort='-created',
+        filters={
+            'stage': ListFilter('stage', Startup.STAGE_CHOICES),
+            'industry': ListFilter('industry', Startup.INDUSTRY_CHOICES),
+            'active': boolean_filter('is_active'),
+        },
+    )
+    startups = listing.page()
     
-    stage_counts = {
-        'idea': startups.filter(stage='idea').count(),
-        'pre_seed': startups.filter(stage='pre_seed').count(),
-        'seed': startups.filter(stage='seed').count(),
-        'series_a': startups.filter(stage='series_a').count(),
-        'series_b': startups.filter(stage='series_b').count(),
-        'growth': startups.filter(stage='growth').count(),
-    }
+    if listing.wants_json():
+        return listing.json_response(startups, _startup_json)
+    
+    # One grouped query instead of a COUNT per stage
+    stage_counts = {stage: 0 for stage, _ in Startup.STAGE_CHOICES}
+    for row in Startup.objects.values('stage').annotate(count=Count('id')).order_by():
+        stage_counts[row['stage']] = row['count']
     
     return render(request, 'manager/startup_list.html', {
         'startups': startups,
-        'total_startups': startups.count(),
+        'total_startups': sum(stage_counts.values()),
         'stage_counts': stage_counts,
+        **listing.context(),
     })
 
 
@@ -61,28 +99,20 @@ def manager_startup_create(request):
         messages.error(request, 'Only managers can access this page.')
         return redirect('dashboard_redirect')
     
-    print(f"=== MANAGER STARTUP CREATE ===")
-    print(f"User: {request.user} (Role: {request.user.role})")
-    print(f"Method: {request.method}")
-    
     if request.method == 'POST':
-        print("POST request received")
         form = StartupCreateForm(request.POST, request.FILES)
         
         if form.is_valid():
-            print("✅ Form is valid - saving startup")
             startup = form.save(commit=False)
             startup.founder = request.user   # 🔹 Assign manager as founder automatically
             startup.save()
-            print(f"✅ Startup saved: {startup.name} (ID: {startup.id})")
+            logger.info("Startup %s created by %s", startup.pk, request.user.pk)
             
             messages.success(request, f'Startup "{startup.name}" created successfully!')
             return redirect('startups:manager_startup_list')
         else:
-            print("❌ Form is NOT valid")
-            print(f"Form errors: {form.errors}")
+            logger.debug("Startup form errors: %s", form.errors.as_json())
     else:
-        print("GET request - showing empty form")
         form = StartupCreateForm()
     
     return render(request, 'manager/startup_create.html', {'form': form})
@@ -185,9 +215,6 @@ def founder_startup_create(request):
         messages.error(request, 'Only founders can access this page.')
         return redirect('dashboard_redirect')
     
-    print(f"=== FOUNDER STARTUP CREATE ===")
-    print(f"User: {request.user} (Role: {request.user.role})")
-    
     if request.method == 'POST':
         form = StartupCreateForm(request.POST, request.FILES)
         if form.is_valid():
@@ -197,8 +224,7 @@ def founder_startup_create(request):
             messages.success(request, 'Startup created successfully!')
             return redirect('startups:founder_startup_detail', pk=startup.pk)
         else:
-            print("❌ Form is NOT valid")
-            print(f"Form errors: {form.errors}")
+            logger.debug("Startup form errors: %s", form.errors.as_json())
     else:
         form = StartupCreateForm()
     
@@ -213,7 +239,7 @@ def founder_startup_create(request):
 def startup_edit(request, pk):
     startup = get_object_or_404(Startup, pk=pk)
     
-    if request.user.role.lower() not in ['manager', 'founder']:
+    if request.user.role.lower() not in ['manager', 'founder'] or not can_access(request.user, startup):
         messages.error(request, 'You do not have permission to edit this startup.')
         return redirect('dashboard_redirect')
     
@@ -241,7 +267,7 @@ def startup_edit(request, pk):
 def startup_delete(request, pk):
     startup = get_object_or_404(Startup, pk=pk)
     
-    if request.user.role.lower() not in ['manager', 'founder']:
+    if request.user.role.lower() not in ['manager', 'founder'] or not can_access(request.user, startup):
         messages.error(request, 'You do not have permission to delete this startup.')
         return redirect('dashboard_redirect')
     
@@ -261,3 +287,32 @@ def startup_delete(request, pk):
         else 'manager/startup_confirm_delete.html'
     )
     return render(request, template, {'startup': startup})
+
+
+@login_required
+def startup_import(request):
+    """Bulk-import startups from an uploaded CSV"""
+    role = request.user.role.lower()
+    if role not in ['manager', 'founder']:
+        messages.error(request, 'Access denied.')
+        return redirect('dashboard_redirect')
+    
+    result = None
+    importer = StartupImporter(request.user)
+    if request.method == 'POST':
+        form = CsvUploadForm(request.POST, request.FILES)
+        if form.is_valid():
+            importer.dry_run = form.cleaned_data['dry_run']
+            result = importer.run(form.cleaned_data['file'])
+    else:
+        form = CsvUploadForm()
+    
+    back_url = 'startups:founder_startup_list' if role == 'founder' else 'startups:manager_startup_list'
+    return render(request, 'imports/csv_import.html', {
+        'title': 'Import Startups',
+        'form': form,
+        'result': result,
+        'columns': importer.columns,
+        'required_columns': importer.required_columns,
+        'back_url': reverse(back_url),
+    })
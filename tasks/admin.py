@@ -2,6 +2,10 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils import timezone
+
+from venture_manager.caching import invalidate
+
+from .exports import TASKS
 from .models import Task
 
 @admin.register(Task)
@@ -142,36 +146,42 @@ class TaskAdmin(admin.ModelAdmin):
     def mark_as_completed(self, request, queryset):
         """Admin action to mark selected tasks as completed"""
         updated = queryset.update(status='completed', progress=100)
+        invalidate(Task)
         self.message_user(request, f'{updated} task(s) marked as completed.')
     mark_as_completed.short_description = "Mark selected tasks as completed"
     
     def mark_as_in_progress(self, request, queryset):
         """Admin action to mark selected tasks as in progress"""
         updated = queryset.update(status='in_progress')
+        invalidate(Task)
         self.message_user(request, f'{updated} task(s) marked as in progress.')
     mark_as_in_progress.short_description = "Mark selected tasks as in progress"
     
     def set_high_priority(self, request, queryset):
         """Admin action to set selected tasks to high priority"""
         updated = queryset.update(priority='high')
+        invalidate(Task)
         self.message_user(request, f'{updated} task(s) set to high priority.')
     set_high_priority.short_description = "Set selected tasks to high priority"
     
     def update_progress_25(self, request, queryset):
         """Admin action to set progress to 25%"""
         updated = queryset.update(progress=25, status='in_progress')
+        invalidate(Task)
         self.message_user(request, f'{updated} task(s) progress set to 25%.')
     update_progress_25.short_description = "Set progress to 25%"
     
     def update_progress_50(self, request, queryset):
         """Admin action to set progress to 50%"""
         updated = queryset.update(progress=50, status='in_progress')
+        invalidate(Task)
         self.message_user(request, f'{updated} task(s) progress set to 50%.')
     update_progress_50.short_description = "Set progress to 50%"
     
     def update_progress_75(self, request, queryset):
         """Admin action to set progress to 75%"""
         updated = queryset.update(progress=75, status='in_progress')
+        invalidate(Task)
         self.message_user(request, f'{updated} task(s) progress set to 75%.')
     update_progress_75.short_description = "Set progress to 75%"
     
@@ -182,6 +192,8 @@ class TaskAdmin(admin.ModelAdmin):
         update_progress_25,
         update_progress_50,
         update_progress_75,
+        TASKS.admin_action(),
+        TASKS.admin_action('ndjson'),
     ]
     
     def get_readonly_fields(self, request, obj=None):
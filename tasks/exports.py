@@ -0,0 +1,16 @@
+# tasks/exports.py
+from venture_manager.exporting import Export
+
+TASKS = Export('tasks', [
+    ('id', 'id'),
+    ('title', 'title'),
+    ('startup', 'project__startup__name'),
+    ('project', 'project__name'),
+    ('assigned_to', 'assigned_to__email'),
+    ('status', 'status'),
+    ('priority', 'priority'),
+    ('progress', 'progress'),
+    ('due_date', 'due_date'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+])
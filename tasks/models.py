@@ -2,10 +2,22 @@
 from django.db import models
 from projects.models import Project
 from django.contrib.auth import get_user_model
+from venture_manager.access import user_scope
 
 
 CustomUser = get_user_model()
 
+
+class TaskQuerySet(models.QuerySet):
+    def for_user(self, user):
+        """Tasks the user's role reaches; team members see the ones assigned to them"""
+        scope = user_scope(user)
+        if scope.role == 'team_member':
+            return self.filter(assigned_to_id=user.pk)
+        if scope.role == 'investor':
+            return self.none()
+        return scope.by_startup(self, 'project__startup')
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
@@ -35,5 +47,16 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TaskQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['assigned_to', 'status', 'due_date'], name='task_assignee_status_due_idx'),
+            # Sort keys of the task list (venture_manager.listing), id breaking ties
+            models.Index(fields=['created_at', 'id'], name='task_created_idx'),
+            models.Index(fields=['updated_at', 'id'], name='task_updated_idx'),
+            models.Index(fields=['title', 'id'], name='task_title_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.title} - {self.project.name}"
\ No newline at end of file
@@ -17,4 +17,7 @@ urlpatterns = [
     path('team/tasks/', views.task_list, name='team_tasks'),
     path('team/tasks/<int:pk>/', views.task_detail, name='team_task_detail'),
     path('team/tasks/<int:pk>/update/', views.task_update, name='team_task_update'),
+    
+    # Exports
+    path('tasks/export/', views.task_export, name='task_export'),
 ]
\ No newline at end of file
@@ -3,19 +3,44 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.utils import timezone
+from .exports import TASKS
 from .models import Task
 from .forms import TaskUpdateForm, TaskEditForm
+from venture_manager.listing import ListQuery, ListFilter, id_filter
+
+def _task_json(task):
+    return {
+        'id': task.id,
+        'title': task.title,
+        'project': task.project.name,
+        'project_id': task.project_id,
+        'startup': task.project.startup.name,
+        'status': task.status,
+        'priority': task.priority,
+        'assigned_to_id': task.assigned_to_id,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'created_at': task.created_at.isoformat(),
+    }
 
 @login_required
 def task_list(request):
-    if request.user.role.lower() == 'manager':
-        tasks = Task.objects.all()
-    elif request.user.role.lower() == 'founder':
-        tasks = Task.objects.filter(project__startup__in=request.user.founded_startups.all())
-    elif request.user.role.lower() == 'team_member':
-        tasks = request.user.tasks.all()
-    else:
-        tasks = Task.objects.none()
+    tasks = Task.objects.for_user(request.user)
+    
+    listing = ListQuery(
+        request,
+        tasks.select_related('project', 'project__startup', 'assigned_to'),
+        sort_keys={'created': 'created_at', 'updated': 'updated_at', 'title': 'title'},
+        default_sort='-created',
+        filters={
+            'status': ListFilter('status', Task.STATUS_CHOICES),
+            'priority': ListFilter('priority', Task.PRIORITY_CHOICES),
+            'project': id_filter('project_id'),
+        },
+    )
+    tasks = listing.page()
+    
+    if listing.wants_json():
+        return listing.json_response(tasks, _task_json)
     
     template_map = {
         'manager': 'manager/tasks.html',
@@ -24,14 +49,14 @@ def task_list(request):
     }
     template = template_map.get(request.user.role.lower(), 'tasks.html')
     
-    return render(request, template, {'tasks': tasks})
+    return render(request, template, {'tasks': tasks, **listing.context()})
 
 @login_required
 def task_detail(request, pk):
     task = get_object_or_404(Task, pk=pk)
     
     # Check permissions
-    if request.user.role.lower() == 'team_member' and task.assigned_to != request.user:
+    if request.user.role.lower() == 'team_member' and task.assigned_to_id != request.user.pk:
         messages.error(request, 'You do not have permission to view this task.')
         return redirect('team_dashboard')
     
@@ -49,7 +74,7 @@ def task_update(request, pk):
     task = get_object_or_404(Task, pk=pk)
     
     # Check permissions
-    if request.user.role.lower() == 'team_member' and task.assigned_to != request.user:
+    if request.user.role.lower() == 'team_member' and task.assigned_to_id != request.user.pk:
         messages.error(request, 'You can only update tasks assigned to you.')
         return redirect('team_dashboard')
     
@@ -64,4 +89,11 @@ def task_update(request, pk):
     else:
         form = TaskUpdateForm(instance=task)
     
-    return render(request, 'team/task_update.html', {'form': form, 'task': task})
\ No newline at end of file
+    return render(request, 'team/task_update.html', {'form': form, 'task': task})
+
+
+@login_required
+def task_export(request):
+    """Stream the tasks the user can see (?format=ndjson)"""
+    tasks = Task.objects.for_user(request.user).order_by('pk')
+    return TASKS.response(tasks, request.GET.get('format'))
@@ -0,0 +1,84 @@
+"""
+Role-scoped querysets and object permission checks.
+
+Startup, Project, Task, Investment and FundingApplication querysets have
+for_user(user), which narrows them to the rows the user's role reaches:
+
+- manager: everything
+- founder: the startups they founded and everything belonging to them
+- investor: the startups they invested in and their own investments
+- team_member: the tasks assigned to them, and the projects and startups
+  those tasks belong to
+
+The filters are subqueries (startup_id IN (SELECT ...)); ids are never loaded
+into Python, so the cost does not grow with the size of a portfolio.
+
+can_access(user, obj) answers "is obj in for_user(user)?" with a single
+EXISTS on the object's primary key:
+
+    if not can_access(request.user, project):
+        return redirect('dashboard_redirect')
+
+The user's scope - role and startup subquery - and every answer are memoized
+on the user object, which Django builds afresh for each request.
+"""
+from django.apps import apps
+
+SCOPE_ATTR = '_access_scope'
+
+
+class UserScope:
+    def __init__(self, user):
+        self.user = user
+        self.role = (getattr(user, 'role', '') or '').lower() if user.is_authenticated else ''
+        self._startup_ids = None
+        self._answers = {}
+
+    @property
+    def is_manager(self):
+        return self.role == 'manager'
+
+    @property
+    def startup_ids(self):
+        """Subquery selecting the ids of the startups the role reaches"""
+        if self._startup_ids is None:
+            pk = self.user.pk
+            if self.role == 'founder':
+                ids = apps.get_model('startups', 'Startup').objects.filter(founder_id=pk).values('pk')
+            elif self.role == 'investor':
+                ids = apps.get_model('investments', 'Investment').objects.filter(investor_id=pk).values('startup_id')
+            elif self.role == 'team_member':
+                ids = apps.get_model('tasks', 'Task').objects.filter(assigned_to_id=pk).values('project__startup_id')
+            else:
+                ids = apps.get_model('startups', 'Startup').objects.none().values('pk')
+            self._startup_ids = ids
+        return self._startup_ids
+
+    def by_startup(self, queryset, field='startup'):
+        """`queryset` narrowed to rows whose `field` is one of the scope's startups"""
+        if self.is_manager:
+            return queryset.all()
+        return queryset.filter(**{f'{field}_id__in': self.startup_ids})
+
+    def can_access(self, obj):
+        if self.is_manager:
+            return True
+        key = (obj._meta.label_lower, obj.pk)
+        if key not in self._answers:
+            manager = type(obj)._default_manager
+            self._answers[key] = manager.for_user(self.user).filter(pk=obj.pk).exists()
+        return self._answers[key]
+
+
+def user_scope(user):
+    """The UserScope memoized on `user`"""
+    scope = getattr(user, SCOPE_ATTR, None)
+    if scope is None:
+        scope = UserScope(user)
+        setattr(user, SCOPE_ATTR, scope)
+    return scope
+
+
+def can_access(user, obj):
+    """Whether `obj` is within for_user(user) for its model"""
+    return user_scope(user).can_access(obj)
@@ -0,0 +1,193 @@
+"""
+Versioned cache helpers.
+
+Each cached model has a version number stored in the cache. cached_for(model,
+scope) builds keys that include the current version of every model the value
+was computed from. Saving or deleting a row bumps its model's version
+(post_save/post_delete, connected by connect_invalidation()), so every key
+built from the old version becomes unreachable and simply expires. Nothing has
+to list or wildcard-delete keys, so this works the same on the local-memory,
+file and Redis backends:
+
+    counts = cached_for(Startup, scope='manager').get_or_set('stage_counts', compute)
+    summary = cached_for([Investment, Startup], scope=f'investor:{user.pk}').get_or_set(
+        'portfolio_summary', lambda: build_summary(user), timeout=600,
+    )
+
+QuerySet.update(), bulk_create() and signal-muted code paths send no signals;
+call invalidate(Model) after them.
+
+Templates cache per-user fragments the same way ({% cachedfragment %} in
+dashboard/templatetags/fragments.py, keys from fragment_cache()).
+"""
+import hashlib
+import time
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+# Backends that keep entries inside one process: a version bump there never
+# reaches the other workers
+PER_PROCESS_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Models whose saves and deletes invalidate cached_for() keys
+VERSIONED_MODELS = [
+    'startups.Startup',
+    'projects.Project',
+    'tasks.Task',
+    'investments.Investment',
+    'funding.FundingApplication',
+    'communications.Notification',
+]
+
+
+def _version_key(model):
+    return f'model-version:{model._meta.label_lower}'
+
+
+def _fresh_version():
+    # Time based, so a version lost to eviction or a restart never reuses an old number
+    return time.time_ns() // 1000
+
+
+def model_versions(models):
+    """Current version of each model, creating any that are missing"""
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _fresh_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _bump(model):
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), timeout=None)
+
+
+def invalidate(*models):
+    """
+    Make every cached_for() value computed from these models unreachable.
+    Inside a transaction the versions are bumped again on commit, so a value
+    recomputed from pre-commit data by another request does not survive it.
+    """
+    for model in models:
+        _bump(model)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(partial(_bump, model))
+
+
+class VersionedCache:
+    """Cache keys scoped to `scope` and to the current versions of `models`"""
+
+    def __init__(self, models, scope='global', timeout=DEFAULT_TIMEOUT):
+        self.models = tuple(models)
+        self.scope = scope
+        self.timeout = timeout
+        self._prefix = None
+
+    @property
+    def prefix(self):
+        # Versions are read once, before anything is computed: a value built
+        # while a write lands is stored under the old version and never read
+        if self._prefix is None:
+            parts = [
+                f'{model._meta.label_lower}@{version}'
+                for model, version in zip(self.models, model_versions(self.models))
+            ]
+            self._prefix = f"cached:{self.scope}:{','.join(parts)}"
+        return self._prefix
+
+    def key(self, name):
+        return f'{self.prefix}:{name}'
+
+    def get(self, name, default=None):
+        return cache.get(self.key(name), default)
+
+    def set(self, name, value, timeout=DEFAULT_TIMEOUT):
+        cache.set(self.key(name), value, self._timeout(timeout))
+
+    def get_or_set(self, name, default, timeout=DEFAULT_TIMEOUT):
+        """`default` may be a callable; it only runs on a miss"""
+        return cache.get_or_set(self.key(name), default, self._timeout(timeout))
+
+    def _timeout(self, timeout):
+        return self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+
+def cached_for(models, scope='global', timeout=DEFAULT_TIMEOUT):
+    """A VersionedCache for one model or a list of models"""
+    if not isinstance(models, (list, tuple)):
+        models = [models]
+    return VersionedCache(models, scope=scope, timeout=timeout)
+
+
+FRAGMENT_DEFAULTS = {
+    'ENABLED': True,
+    # Also bounds how stale relative dates ("3 hours ago") in a fragment get
+    'TIMEOUT': 300,
+}
+
+
+def get_fragment_config():
+    config = dict(FRAGMENT_DEFAULTS)
+    config.update(getattr(settings, 'FRAGMENT_CACHE', {}))
+    return config
+
+
+def fragment_cache(models, user, timeout=None):
+    """A VersionedCache for template fragments of `user` built from `models` (labels or classes)"""
+    models = [apps.get_model(model) if isinstance(model, str) else model for model in models]
+    # date_joined too: SQLite hands the id of a deleted last row to the next user
+    scope = f'fragment:user:{user.pk}:{user.date_joined.timestamp()}'
+    return VersionedCache(models, scope=scope, timeout=timeout or get_fragment_config()['TIMEOUT'])
+
+
+def fragment_name(name, vary_on=()):
+    """Key name of one variant of a fragment, e.g. a list for one status filter"""
+    digest = hashlib.md5(':'.join(str(value) for value in vary_on).encode('utf-8'), usedforsecurity=False)
+    return f'{name}:{digest.hexdigest()}'
+
+
+def _invalidate_sender(sender, **kwargs):
+    invalidate(sender)
+
+
+def connect_invalidation():
+    """Bump a model's version whenever one of its rows is saved or deleted"""
+    for label in VERSIONED_MODELS:
+        model = apps.get_model(label)
+        for signal in (post_save, post_delete):
+            signal.connect(
+                _invalidate_sender, sender=model, weak=False,
+                dispatch_uid=f'venture_manager.caching:{label}',
+            )
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_cache(app_configs=None, **kwargs):
+    """Deployments need a cache every worker shares (`manage.py check --deploy`)"""
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or backend not in PER_PROCESS_BACKENDS:
+        return []
+    return [checks.Error(
+        f"The default cache ({backend}) is per process.",
+        hint=(
+            "Model versions, rate limits, fragments and cached sessions would differ between "
+            "workers. Set CACHE_BACKEND to 'database' or 'redis'."
+        ),
+        id='venture_manager.E001',
+    )]
@@ -0,0 +1,23 @@
+"""
+Bounded batch deletes for housekeeping jobs.
+
+A single DELETE over a large backlog holds the write lock for the whole
+statement (the entire database on SQLite). delete_in_batches() selects a
+batch of primary keys, deletes just those rows in their own short
+transaction, and repeats until nothing matches, optionally sleeping between
+batches so other writers get a turn.
+"""
+import time
+
+
+def delete_in_batches(queryset, batch_size=1000, pause=0):
+    """Delete every row in `queryset`; returns the number of rows deleted"""
+    model = queryset.model
+    deleted = 0
+    while True:
+        keys = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+        if not keys:
+            return deleted
+        deleted += model._base_manager.filter(pk__in=keys).delete()[1].get(model._meta.label, 0)
+        if pause:
+            time.sleep(pause)
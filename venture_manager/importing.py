@@ -0,0 +1,166 @@
+"""
+Bulk CSV imports.
+
+An importer reads the uploaded CSV as a stream, `batch_size` rows at a time,
+and for each batch:
+
+1. resolves the reference columns (a startup, an investor, a founder) for
+   the whole batch with one query each - resolve();
+2. validates every row with a ModelForm that leaves those references out,
+   so checking a row never touches the database;
+3. writes the valid rows with bulk_create() in one transaction.
+
+Invalid rows are skipped and reported by line number; the rest of the file
+is still imported. bulk_create() sends no post_save signals, so none of the
+per-row notifications go out: run() bumps the model's cache version and
+sends the importing user a single summary notification instead. With
+dry_run=True the file is only validated.
+
+Subclasses set `model`, `form_class` and `reference_columns`, and implement
+resolve() and attach().
+"""
+import csv
+import io
+from itertools import islice
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .caching import invalidate
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class CsvUploadForm(forms.Form):
+    file = forms.FileField(label='CSV file')
+    dry_run = forms.BooleanField(required=False, label='Validate only, import nothing')
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith('.csv'):
+            raise forms.ValidationError('Upload a .csv file.')
+        return upload
+
+
+class ImportResult:
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.rows = 0
+        self.created = 0
+        # (line number, message); line 1 is the header
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.errors.append((line, message))
+
+
+def _form_errors(form):
+    return '; '.join(
+        f"{field}: {' '.join(messages)}" if field != '__all__' else ' '.join(messages)
+        for field, messages in form.errors.items()
+    )
+
+
+class CsvImporter:
+    model = None
+    # ModelForm over the plain value columns
+    form_class = None
+    # Columns resolved per batch by resolve() rather than by the form
+    reference_columns = ()
+    batch_size = DEFAULT_BATCH_SIZE
+
+    def __init__(self, user, dry_run=False, batch_size=None):
+        self.user = user
+        self.dry_run = dry_run
+        self.batch_size = batch_size or self.batch_size
+
+    @property
+    def columns(self):
+        return list(self.form_class._meta.fields) + list(self.reference_columns)
+
+    @property
+    def required_columns(self):
+        form = self.form_class()
+        return [name for name, field in form.fields.items() if field.required] + list(self.reference_columns)
+
+    def resolve(self, rows):
+        """Look up the references of a batch of rows; returns whatever attach() needs"""
+        return {}
+
+    def attach(self, instance, row, references):
+        """Set the references on `instance`, raising ValidationError if one is unknown"""
+
+    def summary(self, result):
+        """Title and message of the notification sent after a real import"""
+        noun = self.model._meta.verbose_name_plural
+        message = f"{result.created} {noun} imported."
+        if result.errors:
+            message += f" {len(result.errors)} row(s) had errors and were skipped."
+        return f"{noun.capitalize()} imported", message
+
+    def notify(self, result):
+        # Imported here: communications depends on the apps that use importers
+        from communications.services import NotificationService
+        title, message = self.summary(result)
+        NotificationService.create_notification(
+            user=self.user, title=title, message=message,
+            notification_type='warning' if result.errors else 'success',
+        )
+
+    def run(self, upload):
+        """Import an uploaded file (or any binary file object); returns an ImportResult"""
+        result = ImportResult(dry_run=self.dry_run)
+        stream = getattr(upload, 'file', upload)
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        try:
+            reader = csv.DictReader(text)
+            header = [name.strip() for name in reader.fieldnames or []]
+            reader.fieldnames = header
+            missing = [name for name in self.required_columns if name not in header]
+            if missing:
+                result.add_error(1, f"Missing column(s): {', '.join(missing)}")
+                return result
+
+            lines = enumerate(reader, start=2)
+            while batch := list(islice(lines, self.batch_size)):
+                self.import_batch(batch, result)
+        except UnicodeDecodeError:
+            result.add_error(result.rows + 2, 'The file is not UTF-8 encoded text.')
+        except csv.Error as exc:
+            result.add_error(result.rows + 2, f'Malformed CSV: {exc}')
+        finally:
+            # Leave the upload open for its owner to close
+            text.detach()
+
+        if result.created and not self.dry_run:
+            invalidate(self.model)
+            self.notify(result)
+        return result
+
+    def import_batch(self, batch, result):
+        rows = [
+            {key: (value or '').strip() for key, value in row.items() if key is not None}
+            for _, row in batch
+        ]
+        references = self.resolve(rows)
+        instances = []
+        for (line, _), row in zip(batch, rows):
+            result.rows += 1
+            # Empty cells are left out so model defaults apply
+            form = self.form_class({key: value for key, value in row.items() if value})
+            if not form.is_valid():
+                result.add_error(line, _form_errors(form))
+                continue
+            instance = form.save(commit=False)
+            try:
+                self.attach(instance, row, references)
+            except ValidationError as exc:
+                result.add_error(line, ' '.join(exc.messages))
+                continue
+            instances.append(instance)
+
+        if instances and not self.dry_run:
+            with transaction.atomic():
+                self.model.objects.bulk_create(instances)
+        result.created += len(instances)
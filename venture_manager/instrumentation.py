@@ -0,0 +1,368 @@
+"""
+Per-request SQL and timing instrumentation.
+
+RequestInstrumentationMiddleware installs a QueryRecorder with
+connection.execute_wrapper() on every database connection for the duration of
+the request. It records query count, DB time, duplicate query fingerprints and
+total/app time, then:
+
+- adds a Server-Timing header (visible in the browser's network panel),
+- logs one structured JSON line per request to `venture_manager.requests`,
+- logs slow requests and slow queries to `venture_manager.slow`.
+
+With settings.NPLUSONE_DETECTION enabled it also records where each query came
+from (project code line and template line) and reports any fingerprint run more
+than THRESHOLD times in one request to `venture_manager.nplusone` - or raises
+NPlusOneError, which fails the test that made the request. detect_n_plus_one()
+does the same around any block of code.
+
+Recorders are found through a context variable rather than installed on one
+thread's connections, so queries the async ORM runs in worker threads are
+recorded against the request that made them, even with many async requests
+sharing a thread.
+
+Thresholds live in settings.REQUEST_INSTRUMENTATION and NPLUSONE_DETECTION.
+"""
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+request_logger = logging.getLogger('venture_manager.requests')
+slow_logger = logging.getLogger('venture_manager.slow')
+nplusone_logger = logging.getLogger('venture_manager.nplusone')
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SERVER_TIMING': True,
+    'SLOW_REQUEST_MS': 500,
+    'SLOW_QUERY_MS': 100,
+    'DUPLICATE_REPORT_LIMIT': 5,
+}
+
+NPLUSONE_DEFAULTS = {
+    'ENABLED': False,
+    'THRESHOLD': 5,
+    'RAISE': False,
+}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'REQUEST_INSTRUMENTATION', {}))
+    return config
+
+
+def get_nplusone_config():
+    config = dict(NPLUSONE_DEFAULTS)
+    config.update(getattr(settings, 'NPLUSONE_DETECTION', {}))
+    return config
+
+
+def fingerprint(sql):
+    """
+    Normalize SQL so the same statement with different values compares equal:
+    literals and numbers become ?, and IN (...) lists collapse to one placeholder.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def _is_project_frame(filename):
+    return (
+        filename.startswith(str(settings.BASE_DIR))
+        and 'site-packages' not in filename
+        and os.path.abspath(filename) != os.path.abspath(__file__)
+    )
+
+
+def query_origin():
+    """
+    Where the current query was issued from: the innermost project code line
+    and, if a template is rendering, the template line of the innermost node.
+    """
+    code_location = template_location = None
+    frame = sys._getframe(1)
+    while frame is not None and (code_location is None or template_location is None):
+        code = frame.f_code
+        if template_location is None and code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin, token = getattr(node, 'origin', None), getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                template_location = f'{origin.template_name}:{token.lineno}'
+        if code_location is None and _is_project_frame(code.co_filename):
+            filename = os.path.relpath(code.co_filename, settings.BASE_DIR)
+            code_location = f'{filename}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return {'code': code_location, 'template': template_location}
+
+
+# Recorders active in the current context, outermost first
+_active_recorders = ContextVar('venture_manager_query_recorders', default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    """execute_wrapper on every connection; hands the query to the active recorders"""
+    for recorder in reversed(_active_recorders.get()):
+        execute = partial(recorder, execute)
+    return execute(sql, params, many, context)
+
+
+def _install_dispatch(connection):
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _install_dispatch(connection)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid='venture_manager.instrumentation')
+
+
+class QueryRecorder:
+    """
+    execute_wrapper callable that times every query run through it.
+    capture_origin=True also records query_origin() for N+1 reports.
+    """
+
+    def __init__(self, slow_query_ms=None, capture_origin=False):
+        self.slow_query_ms = slow_query_ms
+        self.capture_origin = capture_origin
+        self.queries = []
+        # Filled in by detect_n_plus_one()
+        self.problems = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.record(sql, duration_ms, context)
+
+    def record(self, sql, duration_ms, context):
+        self.queries.append({
+            'sql': sql,
+            'fingerprint': fingerprint(sql),
+            'duration_ms': duration_ms,
+            'alias': context['connection'].alias,
+            'origin': query_origin() if self.capture_origin else None,
+        })
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration_ms(self):
+        return sum(query['duration_ms'] for query in self.queries)
+
+    def duplicates(self):
+        """Fingerprints executed more than once, most repeated first"""
+        counts = Counter(query['fingerprint'] for query in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count > 1]
+
+    def slow_queries(self):
+        if self.slow_query_ms is None:
+            return []
+        return [query for query in self.queries if query['duration_ms'] >= self.slow_query_ms]
+
+    @contextmanager
+    def capture(self):
+        """Record every query made in this context - and threads it hands work to - inside the block"""
+        # Connections opened before this module was imported missed connection_created
+        for alias in connections:
+            _install_dispatch(connections[alias])
+        token = _active_recorders.set(_active_recorders.get() + (self,))
+        try:
+            yield self
+        finally:
+            _active_recorders.reset(token)
+
+
+class NPlusOneError(Exception):
+    def __init__(self, problems, view=None):
+        self.problems = problems
+        self.view = view
+        lines = [f'N+1 queries detected{f" in {view}" if view else ""}:']
+        for problem in problems:
+            lines.append(f"  {problem['count']}x {problem['fingerprint'][:200]}")
+            for location in problem['locations']:
+                where = ', '.join(filter(None, [location['code'], location['template']]))
+                lines.append(f"    {location['count']}x from {where or 'unknown'}")
+        super().__init__('\n'.join(lines))
+
+
+def find_n_plus_one(recorder, threshold):
+    """Fingerprints run more than `threshold` times, with the places they came from"""
+    by_fingerprint = {}
+    for query in recorder.queries:
+        by_fingerprint.setdefault(query['fingerprint'], []).append(query)
+
+    problems = []
+    for sql, queries in by_fingerprint.items():
+        if len(queries) <= threshold:
+            continue
+        locations = Counter(
+            (query['origin']['code'], query['origin']['template']) if query['origin'] else (None, None)
+            for query in queries
+        )
+        problems.append({
+            'fingerprint': sql,
+            'count': len(queries),
+            'locations': [
+                {'code': code, 'template': template, 'count': count}
+                for (code, template), count in locations.most_common()
+            ],
+        })
+    return sorted(problems, key=lambda problem: -problem['count'])
+
+
+@contextmanager
+def detect_n_plus_one(threshold=None, raise_error=True):
+    """
+    Record queries made inside the block and raise NPlusOneError if any
+    fingerprint runs more than `threshold` times:
+
+        with detect_n_plus_one(threshold=3):
+            self.client.get(url)
+    """
+    if threshold is None:
+        threshold = get_nplusone_config()['THRESHOLD']
+    recorder = QueryRecorder(capture_origin=True)
+    with recorder.capture():
+        yield recorder
+    recorder.problems = find_n_plus_one(recorder, threshold)
+    if recorder.problems and raise_error:
+        raise NPlusOneError(recorder.problems)
+
+
+def server_timing(recorder, total_ms):
+    db_ms = recorder.duration_ms
+    return ', '.join([
+        f'db;dur={db_ms:.1f};desc="{recorder.count} queries"',
+        f'app;dur={max(total_ms - db_ms, 0):.1f}',
+        f'total;dur={total_ms:.1f}',
+    ])
+
+
+class RequestInstrumentationMiddleware:
+    # Under ASGI a sync-only middleware would push every request, async views
+    # included, onto a worker thread
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        self.nplusone = get_nplusone_config()
+        self.enabled = self.config['ENABLED'] or self.nplusone['ENABLED']
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        recorder = self.start(request)
+        started = time.perf_counter()
+        with recorder.capture():
+            response = self.get_response(request)
+        return self.finish(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        recorder = self.start(request)
+        started = time.perf_counter()
+        with recorder.capture():
+            response = await self.get_response(request)
+        return self.finish(request, response, recorder, started)
+
+    def start(self, request):
+        recorder = QueryRecorder(
+            slow_query_ms=self.config['SLOW_QUERY_MS'],
+            capture_origin=self.nplusone['ENABLED'],
+        )
+        request.query_recorder = recorder
+        return recorder
+
+    def finish(self, request, response, recorder, started):
+        total_ms = (time.perf_counter() - started) * 1000
+
+        if self.nplusone['ENABLED']:
+            self.check_n_plus_one(request, recorder)
+        if self.config['ENABLED']:
+            if self.config['SERVER_TIMING']:
+                response['Server-Timing'] = server_timing(recorder, total_ms)
+            self.log(request, response, recorder, total_ms)
+        return response
+
+    def check_n_plus_one(self, request, recorder):
+        problems = find_n_plus_one(recorder, self.nplusone['THRESHOLD'])
+        if not problems:
+            return
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else request.path
+        if self.nplusone['RAISE']:
+            raise NPlusOneError(problems, view=view)
+        for problem in problems:
+            nplusone_logger.warning(json.dumps({
+                'event': 'n_plus_one', 'path': request.path, 'view': view, **problem,
+            }))
+
+    def log(self, request, response, recorder, total_ms):
+        match = getattr(request, 'resolver_match', None)
+        duplicates = recorder.duplicates()
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(recorder.duration_ms, 2),
+            'queries': recorder.count,
+            'duplicate_queries': sum(count - 1 for _, count in duplicates),
+        }
+        request_logger.info(json.dumps(entry))
+
+        if total_ms >= self.config['SLOW_REQUEST_MS']:
+            slow_logger.warning(json.dumps({
+                'event': 'slow_request',
+                **entry,
+                'top_duplicates': [
+                    {'sql': sql, 'count': count}
+                    for sql, count in duplicates[:self.config['DUPLICATE_REPORT_LIMIT']]
+                ],
+            }))
+        for query in recorder.slow_queries():
+            slow_logger.warning(json.dumps({
+                'event': 'slow_query',
+                'path': request.path,
+                'view': entry['view'],
+                'duration_ms': round(query['duration_ms'], 2),
+                'sql': query['sql'],
+            }))
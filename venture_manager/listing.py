@@ -0,0 +1,224 @@
+"""
+Server-side listing for the manager list views.
+
+A ListQuery takes a base queryset and the request, applies whitelisted
+filters and sort keys from the query string, and returns one keyset page
+(no OFFSET, no COUNT). Views render the page as usual, or return JSON with
+?format=json.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core import signing
+from django.http import JsonResponse
+from django.db.models import Q
+
+CURSOR_SALT = 'venture_manager.listing'
+
+
+class ListFilter:
+    """
+    A query-string filter: ?<param>=<value> becomes .filter(<lookup>=<value>).
+    Values outside `choices` are ignored, as are '' and 'all'.
+    """
+
+    def __init__(self, lookup, choices=None, cast=None):
+        self.lookup = lookup
+        self.choices = {str(value) for value, _ in choices} if choices else None
+        self.cast = cast
+
+    def apply(self, queryset, raw):
+        if raw in (None, '', 'all'):
+            return queryset, None
+        if self.choices is not None and raw not in self.choices:
+            return queryset, None
+        try:
+            value = self.cast(raw) if self.cast else raw
+        except (TypeError, ValueError):
+            return queryset, None
+        return queryset.filter(**{self.lookup: value}), raw
+
+
+BOOLEAN_CHOICES = [('true', 'Yes'), ('false', 'No')]
+
+
+def boolean_filter(lookup):
+    return ListFilter(lookup, choices=BOOLEAN_CHOICES, cast=lambda value: value == 'true')
+
+
+def id_filter(lookup):
+    return ListFilter(lookup, cast=int)
+
+
+class KeysetPage:
+    """One page of a ListQuery; iterable like a Paginator page"""
+
+    def __init__(self, object_list, list_query, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.list_query = list_query
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_query(self):
+        return self.list_query.querystring(after=self.next_cursor)
+
+    @property
+    def previous_query(self):
+        return self.list_query.querystring(before=self.previous_cursor)
+
+
+def _cursor_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class ListQuery:
+    """
+    sort_keys maps public sort names to model fields, e.g. {'created': 'created_at'}.
+    Sort fields must be non-nullable and have a (field, id) index; the primary
+    key breaks ties.
+    ?sort=-created sorts descending. filters maps query params to ListFilter.
+    """
+    DEFAULT_PAGE_SIZE = 25
+    MAX_PAGE_SIZE = 100
+
+    def __init__(self, request, queryset, sort_keys, default_sort, filters=None, page_size=None):
+        self.request = request
+        self.queryset = queryset
+        self.sort_keys = sort_keys
+        self.filters = filters or {}
+        self.page_size = self._page_size(page_size or self.DEFAULT_PAGE_SIZE)
+
+        sort = request.GET.get('sort', default_sort)
+        if sort.lstrip('-') not in sort_keys:
+            sort = default_sort
+        self.sort = sort
+        self.descending = sort.startswith('-')
+        self.sort_field = sort_keys[sort.lstrip('-')]
+
+        self.active_filters = {}
+        for param, list_filter in self.filters.items():
+            self.queryset, applied = list_filter.apply(self.queryset, request.GET.get(param))
+            if applied is not None:
+                self.active_filters[param] = applied
+
+    def _page_size(self, default):
+        try:
+            size = int(self.request.GET.get('page_size', default))
+        except (TypeError, ValueError):
+            size = default
+        return max(1, min(size, self.MAX_PAGE_SIZE))
+
+    @property
+    def filtered(self):
+        """Filtered (not yet ordered or paged) queryset - use for counts and aggregates"""
+        return self.queryset
+
+    def _decode(self, cursor):
+        """(value, pk) of a cursor made for the current sort, else None"""
+        try:
+            sort, value, pk = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            return None
+        # A cursor from another sort holds a value of another field
+        if sort != self.sort:
+            return None
+        return value, pk
+
+    def _encode(self, obj):
+        value = _cursor_value(getattr(obj, self.sort_field))
+        return signing.dumps([self.sort, value, obj.pk], salt=CURSOR_SALT)
+
+    def _seek(self, queryset, cursor, forward):
+        value, pk = cursor
+        # Moving forward through a descending sort means smaller values
+        lookup = 'lt' if self.descending == forward else 'gt'
+        return queryset.filter(
+            Q(**{f'{self.sort_field}__{lookup}': value}) |
+            Q(**{self.sort_field: value, f'pk__{lookup}': pk})
+        )
+
+    def _ordering(self, forward):
+        descending = self.descending == forward
+        prefix = '-' if descending else ''
+        return [f'{prefix}{self.sort_field}', f'{prefix}pk']
+
+    def page(self):
+        after = self._decode(self.request.GET.get('after'))
+        before = None if after else self._decode(self.request.GET.get('before'))
+        forward = before is None
+
+        queryset = self.queryset
+        if after:
+            queryset = self._seek(queryset, after, forward=True)
+        elif before:
+            queryset = self._seek(queryset, before, forward=False)
+
+        rows = list(queryset.order_by(*self._ordering(forward))[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if not forward:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if (forward and has_more) or before:
+                next_cursor = self._encode(rows[-1])
+            if after or (before and has_more):
+                previous_cursor = self._encode(rows[0])
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+    def querystring(self, **cursor):
+        params = self.request.GET.copy()
+        for key in ('after', 'before', 'format'):
+            params.pop(key, None)
+        for key, value in cursor.items():
+            if value:
+                params[key] = value
+        return params.urlencode()
+
+    def wants_json(self):
+        return self.request.GET.get('format') == 'json'
+
+    def json_response(self, page, serialize, **extra):
+        return JsonResponse({
+            'results': [serialize(obj) for obj in page],
+            'next': page.next_cursor,
+            'previous': page.previous_cursor,
+            'sort': self.sort,
+            'filters': self.active_filters,
+            **extra,
+        })
+
+    def context(self):
+        """Template context describing the current sort and filters"""
+        return {
+            'sort': self.sort,
+            'sort_keys': list(self.sort_keys),
+            'active_filters': self.active_filters,
+        }
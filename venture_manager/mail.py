@@ -0,0 +1,290 @@
+"""
+Pooled, batched outgoing mail.
+
+send_mail() opens a new SMTP connection - TCP plus a TLS handshake and login -
+for every message. The MailDispatcher here keeps open connections in a small
+pool and hands each batch of up to BATCH_SIZE messages to one connection's
+send_messages(). A connection is recycled once it has carried BATCH_SIZE
+messages (servers cap messages per session) or sat idle longer than
+IDLE_SECONDS. Threads sending at the same time each take their own connection,
+so one slow server does not hold up every request.
+
+send() delivers the given messages before returning. queue() collects messages
+(an onboarding wave, say) and flush() sends everything queued, in batches; the
+queue flushes itself whenever a full batch is waiting.
+
+A transient failure (a dropped connection, a 4xx reply) is retried with
+exponential backoff on a fresh connection, starting from the message that
+failed, so nothing already delivered is sent twice. Permanent failures (5xx,
+refused recipients) drop that message and raise at once.
+
+render_message() builds an email from templates/emails/<name>.txt (and
+<name>.html when present).
+
+    messages = [render_message('password_reset', {'user': user, ...}, subject, [user.email])]
+    mail.send(messages)
+
+Settings live in settings.MAIL_DISPATCH.
+"""
+import logging
+import smtplib
+import socket
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.signals import setting_changed
+from django.template import TemplateDoesNotExist, loader
+
+logger = logging.getLogger('venture_manager.mail')
+
+DEFAULTS = {
+    'BATCH_SIZE': 50,
+    'MAX_RETRIES': 3,
+    'RETRY_DELAY': 0.5,
+    'IDLE_SECONDS': 60,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'MAIL_DISPATCH', {}))
+    return config
+
+
+def is_transient(exc):
+    """Worth retrying on a fresh connection: network trouble and 4xx replies"""
+    if isinstance(exc, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return isinstance(exc, (ConnectionError, socket.timeout, TimeoutError))
+
+
+class _Batch(list):
+    """Messages for one send_messages() call; `done` counts those the backend got past"""
+
+    done = 0
+
+    def __iter__(self):
+        for index, message in enumerate(super().__iter__()):
+            self.done = index
+            yield message
+        self.done = len(self)
+
+
+class _PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class MailDispatcher:
+    """
+    A pool of reusable backend connections, shared by the threads of a process.
+    `backend` and `connection_options` are passed to get_connection().
+    """
+
+    def __init__(self, backend=None, config=None, **connection_options):
+        self.backend = backend
+        self.connection_options = connection_options
+        self.config = config or get_config()
+        # Guards the queue and the idle pool only; never held while talking to the server
+        self._lock = threading.Lock()
+        self._queue = deque()
+        self._idle = []
+        # Connections opened so far; lets tests check reuse
+        self.connections_opened = 0
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                pooled = self._idle.pop()
+                if time.monotonic() - pooled.last_used <= self.config['IDLE_SECONDS']:
+                    return pooled
+                self._close(pooled)
+            self.connections_opened += 1
+        connection = get_connection(self.backend, fail_silently=False, **self.connection_options)
+        try:
+            connection.open()
+        except Exception:
+            self._close(_PooledConnection(connection))
+            raise
+        return _PooledConnection(connection)
+
+    def _checkin(self, pooled):
+        pooled.last_used = time.monotonic()
+        if pooled.sent >= self.config['BATCH_SIZE']:
+            self._close(pooled)
+            return
+        with self._lock:
+            self._idle.append(pooled)
+
+    @staticmethod
+    def _close(pooled):
+        try:
+            pooled.connection.close()
+        except Exception:
+            # The server may already have dropped it
+            pass
+
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._close(pooled)
+
+    def _send_batch(self, messages):
+        """
+        Send `messages` through pooled connections' send_messages(), retrying
+        transient failures - including failing to connect - from the first
+        undelivered message. Returns the number sent. A failure raises with
+        `.unsent` set to the messages not delivered: from the failing one on
+        when retries ran out, after it when the failure was permanent.
+        """
+        sent = 0
+        attempt = 0
+        pending = list(messages)
+        while pending:
+            pooled = None
+            batch = _Batch()
+            try:
+                pooled = self._checkout()
+                batch.extend(pending[:self.config['BATCH_SIZE'] - pooled.sent])
+                sent += pooled.connection.send_messages(batch) or 0
+            except Exception as exc:
+                if pooled is not None:
+                    self._close(pooled)
+                if not is_transient(exc):
+                    exc.unsent = pending[batch.done + 1:]
+                    raise
+                # Delivered messages are not sent again
+                pending = pending[batch.done:]
+                if attempt == self.config['MAX_RETRIES']:
+                    exc.unsent = pending
+                    raise
+                delay = self.config['RETRY_DELAY'] * 2 ** attempt
+                attempt += 1
+                logger.warning('Transient mail failure (%s); retry %s in %.1fs', exc, attempt, delay)
+                time.sleep(delay)
+                continue
+            pooled.sent += len(batch)
+            self._checkin(pooled)
+            pending = pending[len(batch):]
+        return sent
+
+    def _deliver(self, messages, fail_silently):
+        sent = 0
+        pending = list(messages)
+        while pending:
+            try:
+                sent += self._send_batch(pending)
+                pending = []
+            except Exception as exc:
+                if not fail_silently:
+                    raise
+                pending = getattr(exc, 'unsent', [])
+                if is_transient(exc):
+                    # Retries ran out; the rest would fail the same way
+                    logger.exception('Could not send mail; %s messages not sent', len(pending))
+                    break
+                logger.exception('Could not send mail')
+        return sent
+
+    def send(self, messages, fail_silently=False):
+        """Send `messages` now, in batches; returns the number sent"""
+        return self._deliver(messages, fail_silently)
+
+    def queue(self, messages):
+        """Add `messages` to the queue; sends a batch whenever a full one is waiting"""
+        with self._lock:
+            self._queue.extend(messages)
+            full = len(self._queue) >= self.config['BATCH_SIZE']
+        if full:
+            self.flush(full_batches_only=True)
+
+    def flush(self, fail_silently=False, full_batches_only=False):
+        """Send the queued messages in batches; returns the number sent"""
+        sent = 0
+        size = self.config['BATCH_SIZE']
+        while True:
+            with self._lock:
+                if not self._queue or (full_batches_only and len(self._queue) < size):
+                    return sent
+                batch = [self._queue.popleft() for _ in range(min(size, len(self._queue)))]
+            try:
+                sent += self._deliver(batch, fail_silently=False)
+            except Exception as exc:
+                # Whatever was not delivered stays queued for the next flush
+                with self._lock:
+                    self._queue.extendleft(reversed(getattr(exc, 'unsent', [])))
+                if not fail_silently:
+                    raise
+                logger.exception('Could not send mail')
+                if is_transient(exc):
+                    return sent
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = MailDispatcher()
+        return _dispatcher
+
+
+def _reset_dispatcher(setting, **kwargs):
+    global _dispatcher
+    if setting.startswith('EMAIL_') or setting == 'MAIL_DISPATCH':
+        with _dispatcher_lock:
+            if _dispatcher is not None:
+                _dispatcher.close()
+            _dispatcher = None
+
+
+setting_changed.connect(_reset_dispatcher)
+
+
+def send(messages, fail_silently=False):
+    """Send a list of EmailMessages through the process-wide dispatcher"""
+    return get_dispatcher().send(messages, fail_silently=fail_silently)
+
+
+def queue(messages):
+    """Queue EmailMessages on the process-wide dispatcher; flush() sends the rest"""
+    get_dispatcher().queue(messages)
+
+
+def flush(fail_silently=False):
+    return get_dispatcher().flush(fail_silently=fail_silently)
+
+
+def _template(name, required=True):
+    try:
+        return loader.get_template(name)
+    except TemplateDoesNotExist:
+        if required:
+            raise
+        return None
+
+
+def render_message(name, context, subject, to, from_email=None):
+    """EmailMultiAlternatives from emails/<name>.txt, plus emails/<name>.html if it exists"""
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=_template(f'emails/{name}.txt').render(context),
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=to,
+    )
+    html = _template(f'emails/{name}.html', required=False)
+    if html is not None:
+        message.attach_alternative(html.render(context), 'text/html')
+    return message
@@ -0,0 +1,237 @@
+"""
+Fixed-size image renditions of uploaded avatars and logos.
+
+When a model in RENDITION_FIELDS is saved with a new upload in one of its
+image fields, every size in SIZES is generated as WebP and JPEG once the
+transaction commits, on a small thread pool so the upload request does not
+wait for it. Renditions are stored next to the original:
+
+    startups/logos/acme.png -> startups/logos/acme.png.sm.webp, startups/logos/acme.png.sm.jpg
+
+Their names are derived from the original's, so templates find them without
+a query; until they exist the original is used. Storages never reuse the name
+of an existing file, so a new upload gets new rendition names, and the
+rendition view serves them with a far-future, immutable Cache-Control.
+
+    {% load renditions %}
+    {% rendition startup.logo 'sm' alt=startup.name width=32 height=32 %}
+
+`manage.py generate_renditions` fills in renditions for earlier uploads.
+Settings live in settings.IMAGE_RENDITIONS.
+"""
+import io
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from PIL import Image, ImageOps
+
+logger = logging.getLogger('venture_manager.renditions')
+
+DEFAULTS = {
+    # Longest side in pixels; about twice the largest size each is shown at
+    'SIZES': {'xs': 64, 'sm': 160, 'md': 480},
+    'QUALITY': 80,
+    # False generates them in the committing thread (tests, management commands)
+    'ASYNC': True,
+    'WORKERS': 2,
+    'MAX_AGE': 365 * 24 * 3600,
+}
+
+# (model, image field, crop to a square): avatars are cropped, logos are not
+RENDITION_FIELDS = [
+    ('accounts.CustomUser', 'avatar', True),
+    ('startups.Startup', 'logo', False),
+]
+
+# extension: (Pillow format, content type, save options)
+FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'method': 4}),
+    'jpg': ('JPEG', 'image/jpeg', {'optimize': True, 'progressive': True}),
+}
+
+_NAME = re.compile(r'(?P<original>[\w./-]+)\.(?P<size>\w+)\.(?P<ext>webp|jpg)')
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'IMAGE_RENDITIONS', {}))
+    return config
+
+
+def rendition_name(name, size, ext):
+    # The whole original name, so acme.png and acme.jpg do not share renditions
+    return f'{name}.{size}.{ext}'
+
+
+def _ready_key(name):
+    return f'rendition-ready:{name}'
+
+
+def is_ready(fieldfile):
+    """Whether every rendition of the file exists; remembered in the cache"""
+    ready = cache.get(_ready_key(fieldfile.name))
+    if ready is None:
+        # The last one written
+        size = list(get_config()['SIZES'])[-1]
+        ready = fieldfile.storage.exists(rendition_name(fieldfile.name, size, 'jpg'))
+        cache.set(_ready_key(fieldfile.name), ready, None if ready else 60)
+    return ready
+
+
+def rendition_url(fieldfile, size, ext='jpg'):
+    """URL of one rendition of `fieldfile`, or of the original while they are being made"""
+    if not fieldfile:
+        return ''
+    if size not in get_config()['SIZES'] or not is_ready(fieldfile):
+        return fieldfile.url
+    return reverse('rendition', args=[rendition_name(fieldfile.name, size, ext)])
+
+
+def _encode(image, ext, quality):
+    image_format, _, options = FORMATS[ext]
+    if ext == 'jpg' and image.mode != 'RGB':
+        # JPEG has no alpha: flatten onto white
+        background = Image.new('RGB', image.size, 'white')
+        image = image.convert('RGBA')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, quality=quality, **options)
+    return buffer.getvalue()
+
+
+def generate(name, crop=False, storage=default_storage):
+    """Write every size and format of the image stored as `name`, replacing older ones"""
+    config = get_config()
+    with storage.open(name, 'rb') as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+
+    for size, pixels in config['SIZES'].items():
+        if crop:
+            side = min(pixels, *image.size)
+            resized = ImageOps.fit(image, (side, side), Image.Resampling.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail((pixels, pixels), Image.Resampling.LANCZOS)
+        for ext in FORMATS:
+            target = rendition_name(name, size, ext)
+            if storage.exists(target):
+                storage.delete(target)
+            storage.save(target, ContentFile(_encode(resized, ext, config['QUALITY'])))
+    cache.set(_ready_key(name), True, None)
+
+
+def _generate_logged(name, crop, storage):
+    try:
+        generate(name, crop, storage)
+    except Exception:
+        logger.exception("Could not generate renditions of %s", name)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_config()['WORKERS'], thread_name_prefix='renditions',
+            )
+        return _executor
+
+
+def schedule(name, crop=False, storage=default_storage):
+    """Generate the renditions of `name` once the current transaction commits"""
+    def start():
+        if get_config()['ASYNC']:
+            _get_executor().submit(_generate_logged, name, crop, storage)
+        else:
+            _generate_logged(name, crop, storage)
+    transaction.on_commit(start)
+
+
+def _note_uploads(sender, instance, fields, raw=False, **kwargs):
+    # Before the fields' own pre_save(), which stores the upload and marks it committed
+    if raw:
+        return
+    instance._new_uploads = [
+        (field, crop) for field, crop in fields
+        if getattr(instance, field) and not getattr(instance, field)._committed
+    ]
+
+
+def _schedule_uploads(sender, instance, **kwargs):
+    for field, crop in getattr(instance, '_new_uploads', ()):
+        fieldfile = getattr(instance, field)
+        schedule(fieldfile.name, crop, fieldfile.storage)
+    instance._new_uploads = []
+
+
+def connect_renditions():
+    """Generate renditions for every new upload to RENDITION_FIELDS"""
+    by_model = {}
+    for label, field, crop in RENDITION_FIELDS:
+        by_model.setdefault(label, []).append((field, crop))
+    for label, fields in by_model.items():
+        model = apps.get_model(label)
+        pre_save.connect(
+            partial(_note_uploads, fields=fields), sender=model, weak=False,
+            dispatch_uid=f'venture_manager.renditions:pre:{label}',
+        )
+        post_save.connect(
+            _schedule_uploads, sender=model, weak=False,
+            dispatch_uid=f'venture_manager.renditions:post:{label}',
+        )
+
+
+def _rendition_storages():
+    """(upload_to prefix, storage) of every field in RENDITION_FIELDS"""
+    storages = []
+    for label, field, _ in RENDITION_FIELDS:
+        field = apps.get_model(label)._meta.get_field(field)
+        if isinstance(field.upload_to, str):
+            storages.append((field.upload_to.rstrip('/') + '/', field.storage))
+    return storages
+
+
+def serve(request, name):
+    """
+    A stored rendition, cacheable for MAX_AGE. Only names under the upload
+    directory of a field in RENDITION_FIELDS, and only renditions of an
+    original that exists there, are served; anything else is a 404.
+    """
+    match = _NAME.fullmatch(name)
+    if (
+        match is None or match['size'] not in get_config()['SIZES']
+        or name.startswith('/') or '..' in name.split('/')
+    ):
+        raise Http404
+    storage = next(
+        (storage for prefix, storage in _rendition_storages() if name.startswith(prefix)), None,
+    )
+    if storage is None or not storage.exists(match['original']):
+        raise Http404
+    try:
+        file = storage.open(name, 'rb')
+    except FileNotFoundError:
+        raise Http404
+    _, content_type, _ = FORMATS[match['ext']]
+    response = FileResponse(file, content_type=content_type)
+    response['Cache-Control'] = f"public, max-age={get_config()['MAX_AGE']}, immutable"
+    return response
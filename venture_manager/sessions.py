@@ -0,0 +1,67 @@
+"""
+Cached, database-backed sessions that skip redundant writes.
+
+With SESSION_SAVE_EVERY_REQUEST the middleware saves the session on every
+response - including the notification poll - only to push expire_date
+forward. This engine reads through the cache like Django's cached_db, but
+save() writes the django_session row (and the cache) only when:
+
+- the session data changed, or
+- the last write is more than SESSION_WRITE_GRACE_SECONDS old, so the
+  stored expiry needs refreshing.
+
+The cost is that the stored expiry can lag the cookie's by up to the grace
+window, so an idle session may end up to that much earlier than
+SESSION_COOKIE_AGE.
+
+settings.CACHE_BACKEND is the per-process local-memory cache under DEBUG and
+the database cache otherwise; check --deploy (check_shared_cache) rejects
+locmem, since a process could then serve a session it cached before another
+process changed it.
+
+Expired rows are removed by `manage.py purge_sessions`.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.utils import timezone
+
+from .housekeeping import delete_in_batches
+
+# Session data key holding the time of the last write, in epoch seconds
+WRITTEN_AT_KEY = '_session_written_at'
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = 'venture_manager.sessions'
+
+    def write_due(self, must_create=False):
+        if must_create or self.modified or self.session_key is None:
+            return True
+        written_at = self._get_session().get(WRITTEN_AT_KEY)
+        if written_at is None:
+            return True
+        return time.time() - written_at >= settings.SESSION_WRITE_GRACE_SECONDS
+
+    def _stamp(self):
+        # Direct assignment, so the stamp itself does not mark the session modified
+        self._session[WRITTEN_AT_KEY] = time.time()
+
+    def save(self, must_create=False):
+        if not self.write_due(must_create):
+            return
+        self._stamp()
+        super().save(must_create)
+
+    async def asave(self, must_create=False):
+        if not self.write_due(must_create):
+            return
+        self._stamp()
+        await super().asave(must_create)
+
+    @classmethod
+    def clear_expired(cls, batch_size=1000):
+        """Delete expired rows in primary-key batches; returns the number deleted"""
+        expired = cls.get_model_class().objects.filter(expire_date__lt=timezone.now())
+        return delete_in_batches(expired, batch_size=batch_size)
@@ -35,20 +35,59 @@ DEFAULT_FROM_EMAIL = config(
     "DEFAULT_FROM_EMAIL",
     default=f"VentureNest <{EMAIL_HOST_USER}>"
 )
+EMAIL_TIMEOUT = config("DJANGO_EMAIL_TIMEOUT", cast=int, default=10)
+
+# venture_manager/mail.py: messages per send_messages() batch and per pooled SMTP
+# connection before it is recycled, retries (with exponential backoff from
+# RETRY_DELAY seconds) for transient failures, and how long an idle connection is kept
+MAIL_DISPATCH = {
+    'BATCH_SIZE': config("MAIL_BATCH_SIZE", cast=int, default=50),
+    'MAX_RETRIES': config("MAIL_MAX_RETRIES", cast=int, default=3),
+    'RETRY_DELAY': config("MAIL_RETRY_DELAY", cast=float, default=0.5),
+    'IDLE_SECONDS': config("MAIL_IDLE_SECONDS", cast=int, default=60),
+}
 
 
 # ==========================
 # 🍪 Session Settings
 # ==========================
+# Reads come from the cache; the row is only rewritten when data changes or the
+# last write is older than SESSION_WRITE_GRACE_SECONDS (see venture_manager/sessions.py)
 SESSION_ENGINE = config(
     "SESSION_ENGINE",
-    default="django.contrib.sessions.backends.db"
+    default="venture_manager.sessions"
 )
+SESSION_WRITE_GRACE_SECONDS = config("SESSION_WRITE_GRACE_SECONDS", cast=int, default=300)
 SESSION_COOKIE_NAME = "sessionid"
 SESSION_COOKIE_AGE = config("SESSION_COOKIE_AGE", cast=int, default=3600)  # 1hr in seconds
 SESSION_SAVE_EVERY_REQUEST = config("SESSION_SAVE_EVERY_REQUEST", cast=bool, default=True)
 SESSION_EXPIRE_AT_BROWSER_CLOSE = config("SESSION_EXPIRE_AT_BROWSER_CLOSE", cast=bool, default=True)
 
+# ==========================
+# 🗄️ Cache
+# ==========================
+# locmem: per process, no server - development and tests (the default with DEBUG).
+# file: shared by processes on one host. database (the default without DEBUG):
+# shared by every worker, run `manage.py createcachetable` once.
+# redis: shared across hosts (needs redis-py).
+# Model versions, rate limits and cached sessions must reach every worker, so
+# `manage.py check --deploy` fails on a per-process backend.
+CACHE_BACKEND = config("CACHE_BACKEND", default="locmem" if DEBUG else "database")
+CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "venture-nest"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / ".cache")),
+    "database": ("django.core.cache.backends.db.DatabaseCache", "venturenest_cache"),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/1"),
+}
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND][0],
+        "LOCATION": config("CACHE_LOCATION", default=CACHE_BACKENDS[CACHE_BACKEND][1]),
+        "TIMEOUT": config("CACHE_TIMEOUT", cast=int, default=300),
+        "KEY_PREFIX": config("CACHE_KEY_PREFIX", default="venturenest"),
+    }
+}
+
 # ==========================
 # ⏳ Token Expiry Times
 # ==========================
@@ -59,6 +98,48 @@ PASSWORD_RESET_TOKEN_EXPIRY_HOURS = config("PASSWORD_RESET_TOKEN_EXPIRY_HOURS",
 OTP_EXPIRY_DELTA = timedelta(minutes=OTP_EXPIRY_MINUTES)
 PASSWORD_RESET_TOKEN_EXPIRY_DELTA = timedelta(hours=PASSWORD_RESET_TOKEN_EXPIRY_HOURS)
 
+# `manage.py purge_auth_records` keeps password reset attempts (an audit trail) this long
+PASSWORD_RESET_ATTEMPT_RETENTION_DAYS = config("PASSWORD_RESET_ATTEMPT_RETENTION_DAYS", cast=int, default=90)
+
+# Cache-backed rate limits (accounts/ratelimit.py): `limit` hits per sliding `window`
+# seconds, an optional `lockout` once the limit is reached and an optional minimum
+# `interval` between hits. Keys are per account unless the name ends in _ip.
+RATE_LIMITS = {
+    "login": {"limit": 5, "window": 300, "lockout": 300},
+    "login_ip": {"limit": 20, "window": 300, "lockout": 300},
+    "verification_resend": {"limit": 3, "window": 3600, "lockout": 3600, "interval": 60},
+    "password_reset": {"limit": 3, "window": 1800},
+    "password_reset_ip": {"limit": 10, "window": 1800},
+}
+# Only behind a proxy that overwrites X-Forwarded-For; otherwise clients can pick their IP
+RATE_LIMIT_TRUST_X_FORWARDED_FOR = config("RATE_LIMIT_TRUST_X_FORWARDED_FOR", cast=bool, default=False)
+
+# Rows fetched per database round trip by the streaming CSV/NDJSON exports (venture_manager/exporting.py)
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", cast=int, default=2000)
+
+# Report files (reports/rendering.py): table rows per rendered chunk and how long
+# rendered sections stay cached (keys change with the templates' source).
+# PDF output needs WeasyPrint installed; without it reports are written as HTML.
+REPORT_RENDERING = {
+    'ROWS_PER_CHUNK': config("REPORT_ROWS_PER_CHUNK", cast=int, default=500),
+    'CACHE_TIMEOUT': config("REPORT_SECTION_CACHE_TIMEOUT", cast=int, default=7 * 24 * 3600),
+}
+
+# Per-user template fragments ({% cachedfragment %}, venture_manager/caching.py):
+# the dashboard cards and lists, reused until their models change or TIMEOUT passes
+FRAGMENT_CACHE = {
+    'ENABLED': config("FRAGMENT_CACHE_ENABLED", cast=bool, default=True),
+    'TIMEOUT': config("FRAGMENT_CACHE_TIMEOUT", cast=int, default=300),
+}
+
+# Benchmark budgets for `manage.py run_benchmarks` (dashboard/benchmarks.py):
+# extra queries allowed per view, and allowed time / peak memory ratios over the baseline
+BENCHMARK_BUDGET = {
+    'queries': config("BENCHMARK_QUERY_BUDGET", cast=int, default=0),
+    'time_ms': config("BENCHMARK_TIME_BUDGET", cast=float, default=2.0),
+    'peak_kb': config("BENCHMARK_MEMORY_BUDGET", cast=float, default=1.5),
+}
+
 
 
 
@@ -88,7 +169,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the middleware stack
+    'venture_manager.instrumentation.RequestInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Collected static files, answered before sessions and auth run (off with DEBUG)
+    'venture_manager.staticfiles.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -103,19 +188,31 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR/'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # Compiled once per process; inline <style>/<script> blocks that
+            # collectstatic extracted become links to their hashed files
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'venture_manager.staticfiles.FilesystemLoader',
+                    'venture_manager.staticfiles.AppDirectoriesLoader',
+                ]),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'venture_manager.wsgi.application'
 
+# Served by an ASGI server (e.g. `uvicorn venture_manager.asgi:application`),
+# the async communications JSON endpoints wait on the database without
+# holding a worker thread
+ASGI_APPLICATION = 'venture_manager.asgi.application'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -165,11 +262,41 @@ USE_TZ = True
 # Static files
 STATIC_URL = "/static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    'venture_manager.staticfiles.InlineAssetFinder',
+]
+
+# Hashed names and .gz/.br variants, written by `manage.py collectstatic`
+# (venture_manager/staticfiles.py)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'venture_manager.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+
+STATIC_PIPELINE = {
+    'MIN_INLINE_BYTES': 512,
+    'EXCLUDE': ('emails/', 'reports/render/'),
+    'COMPRESS_MIN_BYTES': 256,
+    'UNHASHED_MAX_AGE': 60,
+}
 
 # Media files
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Avatar and logo renditions (venture_manager/renditions.py): longest side per
+# size, WebP/JPEG quality, and the thread pool that generates them after upload
+IMAGE_RENDITIONS = {
+    'SIZES': {'xs': 64, 'sm': 160, 'md': 480},
+    'QUALITY': config("IMAGE_RENDITION_QUALITY", cast=int, default=80),
+    'ASYNC': config("IMAGE_RENDITIONS_ASYNC", cast=bool, default=True),
+    'WORKERS': config("IMAGE_RENDITION_WORKERS", cast=int, default=2),
+    'MAX_AGE': 365 * 24 * 3600,
+}
+
 # Custom User Model
 AUTH_USER_MODEL = "accounts.CustomUser"
 
@@ -197,4 +324,70 @@ MESSAGE_TAGS = {
     messages.SUCCESS: 'success',
     messages.WARNING: 'warning',
     messages.ERROR: 'danger',  
-}
\ No newline at end of file
+}
+
+
+# ----------------------------
+# 📈 Request instrumentation & logging
+# ----------------------------
+REQUEST_INSTRUMENTATION = {
+    'ENABLED': config("REQUEST_INSTRUMENTATION_ENABLED", cast=bool, default=True),
+    'SERVER_TIMING': config("REQUEST_SERVER_TIMING", cast=bool, default=True),
+    'SLOW_REQUEST_MS': config("SLOW_REQUEST_MS", cast=int, default=500),
+    'SLOW_QUERY_MS': config("SLOW_QUERY_MS", cast=int, default=100),
+    'DUPLICATE_REPORT_LIMIT': 5,
+}
+
+# N+1 detection: records where each query came from (slower), so development/test only.
+# NPLUSONE_RAISE=True turns every N+1 into an exception, failing the test that hit it.
+NPLUSONE_DETECTION = {
+    'ENABLED': config("NPLUSONE_DETECTION", cast=bool, default=DEBUG),
+    'THRESHOLD': config("NPLUSONE_THRESHOLD", cast=int, default=5),
+    'RAISE': config("NPLUSONE_RAISE", cast=bool, default=False),
+}
+
+SLOW_LOG_FILE = config("SLOW_LOG_FILE", default=str(BASE_DIR / "slow_requests.log"))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'structured': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'structured',
+        },
+        'slow_file': {
+            'class': 'logging.FileHandler',
+            'filename': SLOW_LOG_FILE,
+            'formatter': 'structured',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'venture_manager.requests': {
+            'handlers': ['console'],
+            'level': config("REQUEST_LOG_LEVEL", default="WARNING"),
+            'propagate': False,
+        },
+        'venture_manager.slow': {
+            'handlers': ['slow_file', 'console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'venture_manager.nplusone': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'venture_manager.mail': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
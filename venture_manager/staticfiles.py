@@ -0,0 +1,323 @@
+"""
+Hashed, precompressed static files.
+
+`manage.py collectstatic` is the build step:
+
+1. InlineAssetFinder extracts the large inline <style> and <script> blocks of
+   the templates into files named after their content, inline/<sha256>.css
+   and .js, so collectstatic picks them up like any other static file;
+2. CompressedManifestStaticFilesStorage gives every collected file a
+   content-hashed name (ManifestStaticFilesStorage) and writes .gz and, when
+   the brotli package is installed, .br variants next to each text file.
+
+At run time the template loaders replace each extracted block with a <link>
+or <script src> to its hashed file, and StaticFilesMiddleware serves
+STATIC_ROOT: the smallest variant the client accepts, with Vary:
+Accept-Encoding, and an immutable one-year Cache-Control on hashed names.
+Browsers then fetch a page's CSS and JS once, not on every page load.
+
+Until collectstatic has written a manifest (development, tests) static()
+returns plain names and templates keep their inline blocks. Blocks that
+contain template syntax or are shorter than MIN_INLINE_BYTES stay inline, as
+do templates under EXCLUDE (emails and report files must be self-contained).
+
+Settings live in settings.STATIC_PIPELINE.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.finders import BaseFinder
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, HttpResponseNotModified
+from django.template.loaders import app_directories, filesystem
+from django.template.utils import get_app_template_dirs
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULTS = {
+    # Where InlineAssetFinder writes the extracted blocks; BASE_DIR/.cache/static when None
+    'BUILD_DIR': None,
+    'MIN_INLINE_BYTES': 512,
+    # Template name prefixes whose blocks always stay inline
+    'EXCLUDE': ('emails/', 'reports/render/'),
+    'COMPRESS_MIN_BYTES': 256,
+    'COMPRESS_EXTENSIONS': ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map', '.xml'),
+    # Cache-Control max-age of files without a hash in their name
+    'UNHASHED_MAX_AGE': 60,
+}
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+# Exactly <style> or <script>, no attributes: a script with src= is already a file
+_INLINE = re.compile(r'<(style|script)>(.*?)</\1>', re.S)
+_EXTENSIONS = {'style': 'css', 'script': 'js'}
+
+# Content-Encoding: suffix, best first
+_ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'STATIC_PIPELINE', {}))
+    if config['BUILD_DIR'] is None:
+        config['BUILD_DIR'] = Path(settings.BASE_DIR) / '.cache' / 'static'
+    return config
+
+
+def inline_assets(source):
+    """(match, static name, content) of each block of a template that can move to a file"""
+    config = get_config()
+    for match in _INLINE.finditer(source):
+        kind, content = match.groups()
+        if len(content.encode('utf-8')) < config['MIN_INLINE_BYTES']:
+            continue
+        if '{{' in content or '{%' in content or '{#' in content:
+            continue
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+        yield match, f'inline/{digest}.{_EXTENSIONS[kind]}', content
+
+
+def _excluded(template_name):
+    return template_name is not None and template_name.startswith(tuple(get_config()['EXCLUDE']))
+
+
+def _built_url(name):
+    """URL of a collected static file, or None before collectstatic has run"""
+    hashed_files = getattr(staticfiles_storage, 'hashed_files', None)
+    if not hashed_files or staticfiles_storage.hash_key(name) not in hashed_files:
+        return None
+    return staticfiles_storage.url(name)
+
+
+def link_inline_assets(source, template_name=None):
+    """The template source with each collected inline block replaced by a reference to its file"""
+    if _excluded(template_name):
+        return source
+    replacements = []
+    for match, name, _ in inline_assets(source):
+        url = _built_url(name)
+        if url is None:
+            continue
+        tag = (
+            f'<link rel="stylesheet" href="{url}">' if match.group(1) == 'style'
+            else f'<script src="{url}"></script>'
+        )
+        replacements.append((match.span(), tag))
+    for (start, end), tag in reversed(replacements):
+        source = source[:start] + tag + source[end:]
+    return source
+
+
+class InlineAssetsMixin:
+    def get_contents(self, origin):
+        return link_inline_assets(super().get_contents(origin), origin.template_name)
+
+
+class FilesystemLoader(InlineAssetsMixin, filesystem.Loader):
+    pass
+
+
+class AppDirectoriesLoader(InlineAssetsMixin, app_directories.Loader):
+    pass
+
+
+def template_files():
+    """(template name, path) of every .html template of the project and the apps"""
+    from django.template import engines
+
+    dirs = []
+    for engine in engines.all():
+        dirs.extend(getattr(engine, 'engine', engine).dirs)
+    dirs.extend(get_app_template_dirs('templates'))
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith('.html'):
+                    path = os.path.join(root, filename)
+                    yield Path(os.path.relpath(path, directory)).as_posix(), path
+
+
+def build_inline_assets(build_dir=None):
+    """Write every inline block the loaders would replace into build_dir; returns the names written"""
+    storage = FileSystemStorage(location=build_dir or get_config()['BUILD_DIR'])
+    names = set()
+    for template_name, path in template_files():
+        if _excluded(template_name):
+            continue
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        for _, name, content in inline_assets(source):
+            if name not in names and not storage.exists(name):
+                storage.save(name, ContentFile(content.encode('utf-8')))
+            names.add(name)
+    # Blocks of earlier builds that no template has any more
+    if storage.exists('inline'):
+        for filename in storage.listdir('inline')[1]:
+            if f'inline/{filename}' not in names:
+                storage.delete(f'inline/{filename}')
+    return names
+
+
+class InlineAssetFinder(BaseFinder):
+    """The extracted inline blocks of the templates, as static files under inline/"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=get_config()['BUILD_DIR'])
+
+    def find(self, path, find_all=False, **kwargs):
+        if path.startswith('inline/') and self.storage.exists(path):
+            match = self.storage.path(path)
+            return [match] if find_all else match
+        return [] if find_all else None
+
+    def list(self, ignore_patterns):
+        # Listing happens in collectstatic, so every build starts from the current templates
+        for name in sorted(build_inline_assets(self.storage.location)):
+            yield name, self.storage
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def stored_name(self, name):
+        # No manifest until collectstatic runs: use plain names, like StaticFilesStorage
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(paths) | set(self.hashed_files.values())):
+            for variant in self.compress(name):
+                yield name, variant, True
+
+    def compress(self, name):
+        """Write the .gz (and .br) variants of `name` that are smaller than it; returns their names"""
+        config = get_config()
+        if not name.endswith(tuple(config['COMPRESS_EXTENSIONS'])) or not self.exists(name):
+            return []
+        with self.open(name) as f:
+            data = f.read()
+        if len(data) < config['COMPRESS_MIN_BYTES']:
+            return []
+
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data)
+        written = []
+        for suffix, compressed in variants.items():
+            if len(compressed) >= len(data):
+                continue
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            self.save(target, ContentFile(compressed))
+            written.append(target)
+        return written
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q=') and q[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """
+    Serve collected files from STATIC_ROOT before the rest of the stack runs:
+    precompressed when the client accepts it, immutable when the name is hashed.
+    Not used with DEBUG on, where runserver serves the source files.
+    """
+    # Under ASGI a sync-only middleware would push every request, async views
+    # included, onto a worker thread
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if settings.DEBUG or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.root = Path(settings.STATIC_ROOT).resolve()
+        self.prefix = settings.STATIC_URL if settings.STATIC_URL.startswith('/') else '/' + settings.STATIC_URL
+        self.hashed_names = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.static_response(request)
+        if response is not None:
+            return response
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        # A stat() and an open() of a local file: cheaper inline than on a thread
+        response = self.static_response(request)
+        if response is not None:
+            return response
+        return await self.get_response(request)
+
+    def static_response(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info.startswith(self.prefix):
+            return self.serve(request, request.path_info[len(self.prefix):])
+        return None
+
+    def _file(self, name):
+        path = (self.root / name).resolve()
+        if not path.is_relative_to(self.root) or not path.is_file():
+            return None
+        return path
+
+    def serve(self, request, name):
+        name = posixpath.normpath(name).lstrip('/')
+        path = self._file(name)
+        if path is None:
+            return None
+        stat = path.stat()
+        if name not in self.hashed_names and not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime,
+        ):
+            return HttpResponseNotModified()
+
+        content_type, _ = mimetypes.guess_type(name)
+        encoding = None
+        accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        for candidate, suffix in _ENCODINGS:
+            variant = self._file(name + suffix) if candidate in accepted else None
+            if variant is not None:
+                path, encoding = variant, candidate
+                break
+
+        response = FileResponse(path.open('rb'), content_type=content_type or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if name.endswith(tuple(get_config()['COMPRESS_EXTENSIONS'])):
+            response['Vary'] = 'Accept-Encoding'
+        if name in self.hashed_names:
+            response['Cache-Control'] = IMMUTABLE
+        else:
+            response['Cache-Control'] = f"public, max-age={get_config()['UNHASHED_MAX_AGE']}"
+            response['Last-Modified'] = http_date(stat.st_mtime)
+        return response
@@ -5,6 +5,7 @@ from accounts.views import profile_view
 from django.conf import settings
 from django.conf.urls.static import static
 from . import views
+from .renditions import serve as serve_rendition
 
 
 urlpatterns = [
@@ -23,6 +24,8 @@ urlpatterns = [
     path("investments/", include("investments.urls")),
     path("funding/", include("funding.urls")),
     path("dashboard/", include("dashboard.urls")),
+    # Avatar and logo renditions, with far-future cache headers
+    path("renditions/<path:name>", serve_rendition, name="rendition"),
 ]
 
 if settings.DEBUG: